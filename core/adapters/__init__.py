@@ -8,6 +8,7 @@ from core.adapters.base import (
     BaseGameManager,
     MessageType,
     ParsedMessage,
+    UNKNOWN_MESSAGE,
 )
 from core.adapters.registry import GameAdapterRegistry, register_default_adapters
 
@@ -19,6 +20,7 @@ __all__ = [
     "BaseGameManager",
     "MessageType",
     "ParsedMessage",
+    "UNKNOWN_MESSAGE",
     "GameAdapterRegistry",
     "register_default_adapters",
 ]
@@ -1,9 +1,10 @@
 """Abstract base classes for game adapters."""
 
 from abc import ABC, abstractmethod
-from dataclasses import dataclass, field
+from dataclasses import dataclass
 from enum import Enum
-from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, AsyncIterator, Callable, Dict, List, Mapping, NamedTuple, Optional
 
 
 class ConnectionType(Enum):
@@ -29,15 +30,22 @@ class MessageType(Enum):
     UNKNOWN = "unknown"
 
 
-@dataclass
-class ParsedMessage:
-    """Normalized parsed message structure."""
+# Shared by every message parsed without data; read-only so no consumer can leak state into it
+EMPTY_DATA: Mapping[str, Any] = MappingProxyType({})
+
+
+class ParsedMessage(NamedTuple):
+    """Normalized parsed message structure. Immutable, and shared where possible."""
     message_type: MessageType
     raw_message: str
-    data: Dict[str, Any] = field(default_factory=dict)
+    data: Mapping[str, Any] = EMPTY_DATA
     timestamp: Optional[float] = None
 
 
+# Returned for every line no pattern recognizes, so unparsed lines allocate nothing
+UNKNOWN_MESSAGE = ParsedMessage(MessageType.UNKNOWN, "")
+
+
 @dataclass
 class GameAdapterConfig:
     """Configuration for game adapter initialization."""
@@ -48,6 +56,22 @@ class GameAdapterConfig:
     binary_path: Optional[str] = None
     startup_args: Optional[List[str]] = None
     poll_interval: float = 5.0
+    poll_min_interval: float = 0.5  # adaptive polling: fastest rate, around expected transitions
+    poll_max_interval: float = 30.0  # adaptive polling: slowest rate, after backing off
+    game_state_command: Optional[str] = None  # RCON command polled with status whose reply names the game state
+    exec_prefix: Optional[List[str]] = None  # e.g. run inside a network namespace
+    max_clients: int = 4
+    homepath: Optional[str] = None
+    server_config: Optional[str] = None
+    cpu_affinity: Optional[List[int]] = None  # cores the server process is pinned to
+    gsi_port: Optional[int] = None  # Dota 2 Game State Integration endpoint; None polls status over RCON
+    gsi_host: str = "127.0.0.1"
+    gsi_token: Optional[str] = None
+    log_port: Optional[int] = None  # UDP port for Source remote logging (logaddress_add); None disables
+    log_host: Optional[str] = None  # interface the receiver binds; defaults to our address on the RCON connection
+    log_allowed_hosts: Optional[List[str]] = None  # log senders accepted; defaults to the RCON server's address
+    log_address: Optional[str] = None  # "ip:port" the server sends to; defaults to our RCON address
+    log_secret: Optional[str] = None
 
 
 class GameAdapter(ABC):
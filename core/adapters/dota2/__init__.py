@@ -1,6 +1,10 @@
 """Dota 2 game adapter implementation using Source RCON."""
 
 from core.adapters.dota2.rcon_client import SourceRCONClient, RCONError
+from core.adapters.dota2.gsi_listener import GSIListener, GSIStateTracker
+from core.adapters.dota2.log_receiver import SourceLogReceiver
+from core.adapters.dota2.status_snapshot import PlayerRecord, StatusSnapshotEngine
+from core.adapters.dota2.fleet import FleetResult, RCONFleet
 from core.adapters.dota2.adapter import Dota2GameAdapter
 from core.adapters.dota2.message_processor import Dota2MessageProcessor
 from core.adapters.dota2.game_manager import Dota2GameManager
@@ -8,6 +12,13 @@ from core.adapters.dota2.game_manager import Dota2GameManager
 __all__ = [
     "SourceRCONClient",
     "RCONError",
+    "GSIListener",
+    "GSIStateTracker",
+    "SourceLogReceiver",
+    "PlayerRecord",
+    "StatusSnapshotEngine",
+    "RCONFleet",
+    "FleetResult",
     "Dota2GameAdapter",
     "Dota2MessageProcessor",
     "Dota2GameManager",
@@ -2,9 +2,13 @@
 
 import asyncio
 import logging
-from typing import AsyncIterator, Optional
+import time
+from typing import Any, AsyncIterator, Callable, Dict, Optional, Tuple
 
-from core.adapters.base import ConnectionType, GameAdapter, GameAdapterConfig
+from core.adapters.base import ConnectionType, GameAdapter, GameAdapterConfig, ParsedMessage
+from core.adapters.dota2.gsi_listener import GSIListener
+from core.adapters.dota2.log_receiver import SourceLogReceiver
+from core.adapters.dota2.poll_scheduler import PollScheduler, parse_game_state, status_fingerprint
 from core.adapters.dota2.rcon_client import SourceRCONClient, RCONError
 
 
@@ -21,6 +25,11 @@ class Dota2GameAdapter(GameAdapter):
     - Commands are request/response (not fire-and-forget)
     - No continuous output stream - requires polling for status
     - Password-based authentication required
+
+    With `gsi_port` set, game state comes from Game State Integration pushes
+    instead of status polling, and RCON is only used to send commands. With
+    `log_port` set, the server's console log is streamed over UDP as well,
+    adding connect/disconnect lines that status polling never shows.
     """
 
     def __init__(self, config: GameAdapterConfig):
@@ -32,8 +41,29 @@ class Dota2GameAdapter(GameAdapter):
             timeout=10.0,
         )
         self._polling = False
-        self._poll_interval = config.poll_interval or 5.0
+        self.poll_scheduler = PollScheduler(
+            base_interval=config.poll_interval or 5.0,
+            min_interval=config.poll_min_interval,
+            max_interval=config.poll_max_interval,
+        )
+        # Where the poll loop reads the game state, e.g. Dota2MessageProcessor.get_current_game_state
+        self._game_state_source: Optional[Callable[[], Optional[str]]] = None
+        # `status` carries no game state, so polling asks for it with this command
+        self._game_state_command = config.game_state_command
+        self._polled_game_state: Optional[str] = None
+        # (monotonic time, response) of the newest `status` reply, whoever asked for it
+        self._status_cache: Optional[Tuple[float, str]] = None
+        self._last_yielded_status_at = 0.0
         self._shutdown_requested = False
+        self.gsi: Optional[GSIListener] = None
+        if config.gsi_port is not None:
+            self.gsi = GSIListener(config.gsi_host, config.gsi_port, config.gsi_token)
+        self.log_receiver: Optional[SourceLogReceiver] = None
+        self._log_address: Optional[str] = None
+        if config.log_port is not None:
+            # Bound and restricted to the server's address once RCON is connected
+            self.log_receiver = SourceLogReceiver(config.log_host or "0.0.0.0", config.log_port, config.log_secret,
+                                                  allowed_hosts=config.log_allowed_hosts)
         self.logger = logging.getLogger(__name__)
 
     @property
@@ -57,15 +87,35 @@ class Dota2GameAdapter(GameAdapter):
             )
             await self.rcon.connect()
             self.logger.info("Successfully connected to Dota 2 server")
+            if self.gsi and not self.gsi.is_running:
+                await self.gsi.start()
+            if self.log_receiver and not self.log_receiver.is_running:
+                # Only the server may inject log lines, received on the interface facing it
+                if not self.config.log_host:
+                    self.log_receiver.host = self.rcon.local_host
+                if not self.config.log_allowed_hosts:
+                    self.log_receiver.allowed_hosts = {self.rcon.remote_host}
+                await self.log_receiver.start()
+                self._log_address = self.config.log_address or f"{self.rcon.local_host}:{self.log_receiver.port}"
+                await self.log_receiver.register(self.rcon, self._log_address)
             return True
         except RCONError as e:
             self.logger.error(f"Failed to connect to Dota 2 server: {e}")
             return False
+        except OSError as e:
+            self.logger.error(f"Failed to start push listeners for the Dota 2 server: {e}")
+            return False
 
     async def disconnect(self) -> None:
         """Disconnect from Dota 2 server."""
         self._polling = False
         self._shutdown_requested = True
+        if self.gsi:
+            await self.gsi.stop()
+        if self.log_receiver:
+            if self._log_address and self.rcon.is_authenticated:
+                await self.log_receiver.unregister(self.rcon, self._log_address)
+            await self.log_receiver.stop()
         await self.rcon.disconnect()
         self.logger.info("Disconnected from Dota 2 server")
 
@@ -84,6 +134,8 @@ class Dota2GameAdapter(GameAdapter):
         """
         try:
             response = await self.rcon.execute(command)
+            if command.strip() == "status" and response:
+                self._status_cache = (time.monotonic(), response)
             return response
         except RCONError as e:
             self.logger.error(f"RCON command failed: {e}")
@@ -111,16 +163,42 @@ class Dota2GameAdapter(GameAdapter):
 
         Unlike subprocess-based adapters which read from stderr,
         Dota 2 requires polling. This yields status responses
-        which can be parsed for game state changes.
+        which can be parsed for game state changes. The delay between
+        polls comes from PollScheduler, and a poll is skipped when a
+        fresher `status` reply was already fetched through send_command.
+        Each poll also sends the configured game state command and yields
+        a "Game state changed to ..." line when its reply names a new state.
+
+        With GSI enabled, yields a "Game state changed to ..." line for each
+        pushed state change instead; Dota2MessageProcessor parses both. With
+        remote logging enabled, yields the server's log lines as they arrive.
         """
+        if self.gsi or self.log_receiver:
+            async for line in self._read_pushed():
+                yield line
+            return
+
         self._polling = True
 
         while self._polling and self.is_connected and not self._shutdown_requested:
             try:
-                # Poll status command
-                status = await self.rcon.get_status()
-                if status:
+                status, fetched_at, skipped = await self._next_status()
+                if not skipped:
+                    state = await self._poll_game_state()
+                    if state and state != self._polled_game_state:
+                        self._polled_game_state = state
+                        yield f"Game state changed to DOTA_GAMERULES_STATE_{state}"
+                if status and fetched_at > self._last_yielded_status_at:
+                    self._last_yielded_status_at = fetched_at
                     yield f"STATUS_POLL:{status}"
+                    # The consumer has parsed the status by now, so the state is current
+                    if self.poll_scheduler.record_poll(status_fingerprint(status), self._current_game_state(),
+                                                       skipped=skipped):
+                        self.logger.info(
+                            f"Status change detected within "
+                            f"{self.poll_scheduler.last_detection_latency_ms or 0:.0f}ms, "
+                            f"polling every {self.poll_scheduler.next_interval():.2f}s"
+                        )
 
             except RCONError as e:
                 self.logger.error(f"Status poll failed: {e}")
@@ -131,7 +209,97 @@ class Dota2GameAdapter(GameAdapter):
                     self.logger.error("Reconnection failed, stopping polling")
                     break
 
-            await asyncio.sleep(self._poll_interval)
+            await asyncio.sleep(self.poll_scheduler.next_interval())
+
+    async def _next_status(self) -> Tuple[Optional[str], float, bool]:
+        """A `status` reply no older than the poll interval: cached if one exists, else fetched."""
+        now = time.monotonic()
+        if self._status_cache and now - self._status_cache[0] < self.poll_scheduler.next_interval():
+            fetched_at, status = self._status_cache
+            if fetched_at > self._last_yielded_status_at:
+                return status, fetched_at, True
+        status = await self.rcon.get_status()
+        fetched_at = time.monotonic()
+        if status:
+            self._status_cache = (fetched_at, status)
+        return status, fetched_at, False
+
+    def track_game_state(self, source: Callable[[], Optional[str]]) -> None:
+        """Let the poll scheduler follow the game state, e.g. Dota2MessageProcessor.get_current_game_state."""
+        self._game_state_source = source
+
+    async def _poll_game_state(self) -> Optional[str]:
+        """Ask the server for its game state; stops asking if the reply never names one."""
+        if not self._game_state_command:
+            return None
+        state = parse_game_state(await self.rcon.execute(self._game_state_command))
+        if state is None:
+            self.logger.warning(
+                f"'{self._game_state_command}' did not report a game state, polling status only; "
+                f"the poll interval will not follow game phases"
+            )
+            self._game_state_command = None
+        return state
+
+    def _current_game_state(self) -> Optional[str]:
+        if self._polled_game_state:
+            return self._polled_game_state
+        return self._game_state_source() if self._game_state_source else None
+
+    def get_poll_stats(self) -> Dict[str, Any]:
+        """Effective poll rate, current interval and transition-detection latency."""
+        return self.poll_scheduler.get_stats()
+
+    async def _read_pushed(self) -> AsyncIterator[str]:
+        sources = []
+        if self.gsi:
+            sources.append(message.raw_message async for message in self.read_events())
+        if self.log_receiver:
+            sources.append(self._log_lines())
+        if len(sources) == 1:
+            async for line in sources[0]:
+                yield line
+            return
+
+        merged: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+
+        async def pump(source):
+            try:
+                async for line in source:
+                    await merged.put(line)
+            finally:
+                await merged.put(None)
+
+        tasks = [asyncio.create_task(pump(source)) for source in sources]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                line = await merged.get()
+                if line is None:
+                    remaining -= 1
+                else:
+                    yield line
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _log_lines(self) -> AsyncIterator[str]:
+        async for line in self.log_receiver.lines():
+            if self._shutdown_requested:
+                break
+            # GSI already reports state changes, with more detail
+            if self.gsi and line.startswith("Game state changed to"):
+                continue
+            yield line
+
+    async def read_events(self) -> AsyncIterator[ParsedMessage]:
+        """Game events from GSI as they are pushed, already parsed."""
+        if not self.gsi:
+            raise RuntimeError("GSI is not enabled for this adapter (set gsi_port)")
+        async for message in self.gsi.events():
+            if self._shutdown_requested:
+                break
+            yield message
 
     def start_server(self) -> bool:
         """
@@ -169,6 +337,10 @@ class Dota2GameAdapter(GameAdapter):
         """Request graceful shutdown."""
         self._shutdown_requested = True
         self._polling = False
+        if self.gsi:
+            self.gsi.request_stop()
+        if self.log_receiver:
+            self.log_receiver.request_stop()
 
     def is_shutdown_requested(self) -> bool:
         """Check if shutdown has been requested."""
@@ -0,0 +1,155 @@
+"""RCON sessions to a fleet of Dota 2 servers, with concurrent broadcast."""
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional
+
+from core.adapters.dota2.rcon_client import RCONError, SourceRCONClient
+
+
+@dataclass
+class FleetServer:
+    name: str
+    host: str
+    port: int
+    password: str
+
+
+@dataclass
+class FleetResult:
+    server: str
+    ok: bool
+    response: Optional[str] = None
+    error: Optional[str] = None
+    elapsed_ms: float = 0.0
+
+
+def parse_fleet_spec(spec: str, default_password: str = "", default_port: int = 27015) -> List[FleetServer]:
+    """
+    Parse "host[:port],password@host[:port],..." into servers.
+
+    Servers are named by host:port; entries without a password use
+    `default_password`.
+    """
+    servers = []
+    for entry in spec.split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        password, sep, address = entry.rpartition("@")
+        if not sep:
+            password = default_password
+        host, _, port = address.partition(":")
+        port = int(port) if port else default_port
+        servers.append(FleetServer(f"{host}:{port}", host, port, password))
+    return servers
+
+
+class RCONFleet:
+    """
+    One RCON session per server, driven concurrently.
+
+    broadcast() sends a command to every server at once and gives each one
+    `deadline` seconds, including a reconnect if its session had dropped.
+    A server that misses the deadline or errors gets a failed FleetResult;
+    it never holds up the others, so a batch takes at most about one
+    deadline however many servers there are.
+    """
+
+    def __init__(self, servers: Iterable[FleetServer], deadline: float = 5.0, response_timeout: float = 0.5):
+        self.deadline = deadline
+        self.servers: Dict[str, FleetServer] = {server.name: server for server in servers}
+        # Responses end after `response_timeout` of silence (see SourceRCONClient), so keep it below the deadline
+        self.clients: Dict[str, SourceRCONClient] = {
+            name: SourceRCONClient(server.host, server.port, server.password, timeout=deadline,
+                                   response_timeout=min(response_timeout, deadline / 2))
+            for name, server in self.servers.items()
+        }
+        self.failures: Dict[str, int] = {name: 0 for name in self.servers}
+        self.logger = logging.getLogger(__name__)
+
+    def _select(self, names: Optional[Iterable[str]]) -> List[str]:
+        if names is None:
+            return list(self.clients)
+        unknown = [name for name in names if name not in self.clients]
+        if unknown:
+            raise KeyError(f"Unknown fleet servers: {', '.join(unknown)}")
+        return list(names)
+
+    async def connect(self, names: Optional[Iterable[str]] = None,
+                      deadline: Optional[float] = None) -> List[FleetResult]:
+        """Connect and authenticate to every (or the named) server concurrently."""
+        return await self._fan_out(self._select(names), None, deadline or self.deadline)
+
+    async def broadcast(self, command: str, names: Optional[Iterable[str]] = None,
+                        deadline: Optional[float] = None) -> List[FleetResult]:
+        """Run `command` on every (or the named) server concurrently, in fleet order."""
+        targets = self._select(names)
+        started = time.perf_counter()
+        results = await self._fan_out(targets, command, deadline or self.deadline)
+        ok = sum(result.ok for result in results)
+        self.logger.info(
+            f"Fleet '{command}': {ok}/{len(results)} ok in {(time.perf_counter() - started) * 1000:.0f}ms"
+        )
+        return results
+
+    async def _fan_out(self, targets: List[str], command: Optional[str], deadline: float) -> List[FleetResult]:
+        return list(await asyncio.gather(*(self._run_one(name, command, deadline) for name in targets)))
+
+    async def _run_one(self, name: str, command: Optional[str], deadline: float) -> FleetResult:
+        client = self.clients[name]
+        started = time.perf_counter()
+        try:
+            response = await asyncio.wait_for(self._execute(client, command), timeout=deadline)
+        except asyncio.TimeoutError:
+            # Late replies would confuse the next command; start that one on a fresh session
+            await client.disconnect()
+            return self._failed(name, f"no response within {deadline:.1f}s", started)
+        except (RCONError, OSError) as e:
+            # A dropped session reconnects on the next command
+            await client.disconnect()
+            return self._failed(name, str(e) or type(e).__name__, started)
+
+        self.failures[name] = 0
+        return FleetResult(name, True, response, elapsed_ms=(time.perf_counter() - started) * 1000)
+
+    @staticmethod
+    async def _execute(client: SourceRCONClient, command: Optional[str]) -> Optional[str]:
+        if not client.is_authenticated:
+            await client.connect()
+        if command is None:
+            return None
+        return await client.execute(command)
+
+    def _failed(self, name: str, error: str, started: float) -> FleetResult:
+        self.failures[name] += 1
+        self.logger.warning(f"Fleet server {name} failed ({self.failures[name]} in a row): {error}")
+        return FleetResult(name, False, error=error, elapsed_ms=(time.perf_counter() - started) * 1000)
+
+    async def close(self) -> None:
+        await asyncio.gather(*(client.disconnect() for client in self.clients.values()))
+
+    async def __aenter__(self) -> "RCONFleet":
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        await self.close()
+
+    def get_status(self) -> List[Dict[str, Any]]:
+        return [
+            {"server": name, "connected": client.is_authenticated, "consecutive_failures": self.failures[name]}
+            for name, client in self.clients.items()
+        ]
+
+
+def summarize_results(results: List[FleetResult]) -> Dict[str, Any]:
+    """Counts, failed servers and the slowest reply of one broadcast."""
+    ok = [result for result in results if result.ok]
+    return {
+        "servers": len(results),
+        "ok": len(ok),
+        "failed": [result.server for result in results if not result.ok],
+        "slowest_ms": round(max((result.elapsed_ms for result in ok), default=0.0), 1),
+    }
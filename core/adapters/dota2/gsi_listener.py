@@ -0,0 +1,261 @@
+"""
+Dota 2 Game State Integration (GSI) receiver.
+
+With a `gamestate_integration_<name>.cfg` in the game's
+`game/dota/cfg/gamestate_integration/` directory, Dota 2 POSTs a JSON
+snapshot of the match to an HTTP endpoint whenever something changes:
+
+    "astrid"
+    {
+        "uri"        "http://127.0.0.1:3000/"
+        "timeout"    "5.0"
+        "buffer"     "0.1"
+        "throttle"   "0.1"
+        "heartbeat"  "30.0"
+        "data"       { "provider" "1"  "map" "1" }
+        "auth"       { "token" "<DOTA2_GSI_TOKEN>" }
+    }
+
+GSIListener serves that endpoint on the adapter's event loop and
+GSIStateTracker turns changes of map.game_state into ParsedMessages as they
+happen, instead of inferring them from periodic RCON `status` polls.
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from core.adapters.base import MessageType, ParsedMessage
+
+WARMUP_STATES = {
+    "DOTA_GAMERULES_STATE_HERO_SELECTION": "HERO_SELECTION",
+    "DOTA_GAMERULES_STATE_STRATEGY_TIME": "STRATEGY_TIME",
+    "DOTA_GAMERULES_STATE_PRE_GAME": "PRE_GAME",
+}
+GAME_START_STATE = "DOTA_GAMERULES_STATE_GAME_IN_PROGRESS"
+GAME_END_STATE = "DOTA_GAMERULES_STATE_POST_GAME"
+SHUTDOWN_STATE = "DOTA_GAMERULES_STATE_DISCONNECT"
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+
+class GSIStateTracker:
+    """
+    Diffs successive GSI payloads into game events.
+
+    Only transitions produce messages, so heartbeats and repeated payloads
+    are free. raw_message uses the same "Game state changed to ..." wording
+    as the server console, which Dota2MessageProcessor also understands.
+    """
+
+    def __init__(self):
+        self.game_state: Optional[str] = None
+        self.match_id: Optional[str] = None
+        self.logger = logging.getLogger(__name__)
+
+    def update(self, payload: Dict[str, Any]) -> List[ParsedMessage]:
+        game_map = payload.get("map") or {}
+        state = game_map.get("game_state")
+        timestamp = (payload.get("provider") or {}).get("timestamp")
+        match_id = game_map.get("matchid")
+
+        if match_id and match_id != self.match_id:
+            # A new match starts from scratch even if the state name repeats
+            self.match_id = match_id
+            self.game_state = None
+
+        if not state or state == self.game_state:
+            return []
+
+        previous, self.game_state = self.game_state, state
+        self.logger.info("GSI game state %s -> %s", previous, state)
+        raw = f"Game state changed to {state}"
+        data = {"previous_state": previous, "state": state, "match_id": match_id,
+                "clock_time": game_map.get("clock_time")}
+
+        if state in WARMUP_STATES:
+            data.update(event="warmup_started", phase=WARMUP_STATES[state])
+            return [ParsedMessage(MessageType.WARMUP_START, raw, data, timestamp)]
+        if state == GAME_START_STATE:
+            data.update(event="game_started")
+            return [ParsedMessage(MessageType.GAME_START, raw, data, timestamp)]
+        if state == GAME_END_STATE:
+            data.update(event="game_ended", winner=game_map.get("win_team"))
+            return [ParsedMessage(MessageType.GAME_END, raw, data, timestamp)]
+        if state == SHUTDOWN_STATE:
+            data.update(event="server_shutdown")
+            return [ParsedMessage(MessageType.SERVER_SHUTDOWN, raw, data, timestamp)]
+        return []
+
+
+class GSIListener:
+    """
+    Minimal HTTP/1.1 endpoint for GSI POSTs, built on asyncio.start_server.
+
+    Payloads whose auth token doesn't match are rejected with 401. Accepted
+    payloads are diffed by a GSIStateTracker and the resulting messages are
+    queued for events(). The game keeps its connection open between posts,
+    so each connection serves requests until the client closes it.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 3000, auth_token: Optional[str] = None,
+                 queue_size: int = 256):
+        self.host = host
+        self.port = port
+        self.auth_token = auth_token
+        self.tracker = GSIStateTracker()
+        self.logger = logging.getLogger(__name__)
+
+        self.payloads_received = 0
+        self.last_payload: Optional[Dict[str, Any]] = None
+        self._events: "asyncio.Queue[Optional[ParsedMessage]]" = asyncio.Queue(maxsize=queue_size)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._server is not None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        # Port 0 picks a free port; report the real one
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.logger.info(f"Listening for Dota 2 GSI on http://{self.host}:{self.port}/")
+
+    async def stop(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        self._end_events()
+
+    def request_stop(self) -> None:
+        """End events() from any thread; the server itself closes in stop()."""
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._end_events)
+
+    def _end_events(self) -> None:
+        if self._events.full():
+            self._events.get_nowait()
+        self._events.put_nowait(None)
+
+    async def events(self) -> AsyncIterator[ParsedMessage]:
+        """Game events in arrival order until stop()."""
+        while True:
+            message = await self._events.get()
+            if message is None:
+                return
+            yield message
+
+    def handle_payload(self, payload: Dict[str, Any]) -> List[ParsedMessage]:
+        """Diff one payload and queue the events it produces."""
+        self.payloads_received += 1
+        self.last_payload = payload
+        messages = self.tracker.update(payload)
+        for message in messages:
+            if self._events.full():
+                self.logger.warning("GSI event queue full, dropping oldest event")
+                self._events.get_nowait()
+            self._events.put_nowait(message)
+        return messages
+
+    def _authorized(self, payload: Dict[str, Any]) -> bool:
+        if not self.auth_token:
+            return True
+        return (payload.get("auth") or {}).get("token") == self.auth_token
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, headers, body = request
+                status = self._handle_request(method, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status}\r\nContent-Length: 0\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode()
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            self.logger.debug("GSI connection dropped: %s", e)
+        finally:
+            writer.close()
+
+    def _handle_request(self, method: str, body: bytes) -> str:
+        if method != "POST":
+            return "405 Method Not Allowed"
+        try:
+            payload = json.loads(body)
+        except ValueError:
+            self.logger.warning("Ignoring GSI request with invalid JSON")
+            return "400 Bad Request"
+        if not isinstance(payload, dict) or not self._authorized(payload):
+            self.logger.warning("Rejected GSI payload with a missing or wrong auth token")
+            return "401 Unauthorized"
+        self.handle_payload(payload)
+        return "200 OK"
+
+    @staticmethod
+    async def _read_request(reader: asyncio.StreamReader) -> Optional[Tuple[str, Dict[str, str], bytes]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as e:
+            if not e.partial:
+                return None  # clean close between requests
+            raise
+        if len(head) > MAX_HEADER_BYTES:
+            raise ValueError("request header too large")
+
+        request_line, *header_lines = head.decode("latin-1").split("\r\n")
+        method = request_line.split(" ", 1)[0].upper()
+        headers = {}
+        for line in header_lines:
+            name, sep, value = line.partition(":")
+            if sep:
+                headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get("content-length", 0))
+        if length > MAX_BODY_BYTES:
+            raise ValueError(f"request body too large ({length} bytes)")
+        body = await reader.readexactly(length) if length else b""
+        return method, headers, body
+
+
+async def post_payload(host: str, port: int, payload: Dict[str, Any],
+                       connection: Optional[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = None) -> int:
+    """POST one payload the way the game does; returns the HTTP status code."""
+    reader, writer = connection or await asyncio.open_connection(host, port)
+    body = json.dumps(payload).encode()
+    writer.write(
+        f"POST / HTTP/1.1\r\nHost: {host}:{port}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    head = await reader.readuntil(b"\r\n\r\n")
+    if connection is None:
+        writer.close()
+    return int(head.split(b" ", 2)[1])
+
+
+async def replay_payloads(host: str, port: int, payloads: List[Dict[str, Any]], interval: float = 0.0) -> List[int]:
+    """
+    Stand-in for the game client: POST recorded payloads over one
+    keep-alive connection, `interval` seconds apart.
+    """
+    connection = await asyncio.open_connection(host, port)
+    statuses = []
+    try:
+        for payload in payloads:
+            statuses.append(await post_payload(host, port, payload, connection))
+            if interval:
+                await asyncio.sleep(interval)
+    finally:
+        connection[1].close()
+    return statuses
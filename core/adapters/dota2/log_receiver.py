@@ -0,0 +1,195 @@
+"""
+Source engine remote log receiver (logaddress_add).
+
+After `logaddress_add <ip:port>` and `log on`, a Source server sends every
+console log line as one UDP datagram:
+
+    \\xff\\xff\\xff\\xff R L 10/19/2026 - 12:34:56: <line>\\n\\x00
+
+or, with sv_logsecret set, `S<secret>` in place of `R`. This gives the
+adapter connect/disconnect and game state lines as they are logged, which
+status polling never shows.
+"""
+
+import asyncio
+import logging
+import socket
+from typing import AsyncIterator, List, NamedTuple, Optional
+
+OOB_HEADER = b"\xff\xff\xff\xff"
+PLAIN_LOG = ord("R")
+SECRET_LOG = ord("S")
+
+
+class LogLine(NamedTuple):
+    timestamp: str  # "10/19/2026 - 12:34:56", as sent by the server
+    text: str
+
+
+def parse_log_packet(data: bytes, secret: Optional[str] = None) -> Optional[LogLine]:
+    """Parse one remote log datagram; None if malformed or the secret doesn't match."""
+    if len(data) < 6 or not data.startswith(OOB_HEADER):
+        return None
+
+    kind = data[4]
+    if kind == PLAIN_LOG:
+        if secret:
+            return None
+        body = data[5:]
+    elif kind == SECRET_LOG:
+        marker = data.find(b"L ", 5)
+        if marker < 0 or data[5:marker].decode("latin-1") != (secret or ""):
+            return None
+        body = data[marker:]
+    else:
+        return None
+
+    if not body.startswith(b"L "):
+        return None
+    line = body[2:].rstrip(b"\x00\r\n").decode("utf-8", errors="replace")
+    # "MM/DD/YYYY - HH:MM:SS: text"
+    timestamp, sep, text = line.partition(": ")
+    if not sep:
+        return None
+    return LogLine(timestamp, text)
+
+
+class _LogProtocol(asyncio.DatagramProtocol):
+    def __init__(self, receiver: "SourceLogReceiver"):
+        self.receiver = receiver
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.receiver._packet_received(data, addr)
+
+
+class SourceLogReceiver:
+    """
+    Receives remote log datagrams and hands them out in batches.
+
+    datagram_received only appends the raw packet. The first packet of a
+    burst schedules a drain `batch_window` seconds later, which parses
+    everything that arrived in between, so a burst of log lines costs a
+    single wakeup of the consumer. (The event loop delivers one datagram per
+    iteration, so draining on the next iteration would never batch.) Packets
+    from addresses other than `allowed_hosts` (when given) are ignored.
+    """
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 27500, secret: Optional[str] = None,
+                 allowed_hosts: Optional[List[str]] = None, batch_window: float = 0.005,
+                 queue_size: int = 1024):
+        self.host = host
+        self.port = port
+        self.secret = secret
+        self.allowed_hosts = set(allowed_hosts) if allowed_hosts else None
+        self.batch_window = batch_window
+        self.logger = logging.getLogger(__name__)
+
+        self.packets_received = 0
+        self.packets_rejected = 0
+        self.batches_dropped = 0
+        self._pending: List[bytes] = []
+        self._drain_scheduled = False
+        self._batches: "asyncio.Queue[Optional[List[LogLine]]]" = asyncio.Queue(maxsize=queue_size)
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def is_running(self) -> bool:
+        return self._transport is not None
+
+    async def start(self) -> None:
+        self._loop = asyncio.get_running_loop()
+        self._transport, _ = await self._loop.create_datagram_endpoint(
+            lambda: _LogProtocol(self), local_addr=(self.host, self.port)
+        )
+        self.port = self._transport.get_extra_info("sockname")[1]
+        self.logger.info(f"Listening for remote log lines on udp://{self.host}:{self.port}")
+
+    async def stop(self) -> None:
+        if self._transport:
+            self._transport.close()
+            self._transport = None
+        self._drain()
+        self._put(None)
+
+    def request_stop(self) -> None:
+        """End batches() from any thread."""
+        if self._loop and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._put, None)
+
+    async def register(self, rcon, address: str) -> bool:
+        """Ask the server to send its log to `address` ("ip:port") and turn logging on."""
+        try:
+            await rcon.execute(f"logaddress_add {address}")
+            await rcon.execute("log on")
+        except Exception as e:
+            self.logger.error(f"Failed to register log address {address}: {e}")
+            return False
+        self.logger.info(f"Server log streaming to {address}")
+        return True
+
+    async def unregister(self, rcon, address: str) -> None:
+        try:
+            await rcon.execute(f"logaddress_del {address}")
+        except Exception as e:
+            self.logger.debug(f"Failed to remove log address {address}: {e}")
+
+    async def batches(self) -> AsyncIterator[List[LogLine]]:
+        """Lists of log lines in arrival order until stop()."""
+        while True:
+            batch = await self._batches.get()
+            if batch is None:
+                return
+            yield batch
+
+    async def lines(self) -> AsyncIterator[str]:
+        """Log line text one at a time, for the adapter's read_messages()."""
+        async for batch in self.batches():
+            for line in batch:
+                yield line.text
+
+    def _packet_received(self, data: bytes, addr) -> None:
+        if self.allowed_hosts is not None and addr[0] not in self.allowed_hosts:
+            self.packets_rejected += 1
+            return
+        self._pending.append(data)
+        if not self._drain_scheduled:
+            self._drain_scheduled = True
+            self._loop.call_later(self.batch_window, self._drain)
+
+    def _drain(self) -> None:
+        self._drain_scheduled = False
+        if not self._pending:
+            return
+        packets, self._pending = self._pending, []
+        self.packets_received += len(packets)
+
+        batch = []
+        for data in packets:
+            line = parse_log_packet(data, self.secret)
+            if line is None:
+                self.packets_rejected += 1
+            else:
+                batch.append(line)
+        if batch:
+            self._put(batch)
+
+    def _put(self, batch: Optional[List[LogLine]]) -> None:
+        if self._batches.full():
+            self._batches.get_nowait()
+            self.batches_dropped += 1
+            self.logger.warning("Remote log queue full, dropping oldest batch")
+        self._batches.put_nowait(batch)
+
+
+def format_log_packet(text: str, timestamp: str = "10/19/2026 - 12:00:00", secret: Optional[str] = None) -> bytes:
+    """Build a datagram the way a Source server sends one log line."""
+    prefix = b"S" + secret.encode("latin-1") if secret else b"R"
+    return OOB_HEADER + prefix + f"L {timestamp}: {text}\n".encode() + b"\x00"
+
+
+def send_log_lines(host: str, port: int, lines: List[str], secret: Optional[str] = None) -> None:
+    """Stand-in for the game server: send each line as a remote log datagram."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        for text in lines:
+            sock.sendto(format_log_packet(text, secret=secret), (host, port))
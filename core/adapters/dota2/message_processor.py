@@ -4,7 +4,8 @@ import logging
 import re
 from typing import Callable, Dict, List, Optional
 
-from core.adapters.base import BaseMessageProcessor, MessageType, ParsedMessage
+from core.adapters.base import UNKNOWN_MESSAGE, BaseMessageProcessor, MessageType, ParsedMessage
+from core.adapters.dota2.status_snapshot import PLAYER_JOINED, PLAYER_LEFT, StatusSnapshotEngine
 
 
 class Dota2MessageProcessor(BaseMessageProcessor):
@@ -56,13 +57,14 @@ class Dota2MessageProcessor(BaseMessageProcessor):
             ),
             # Server shutdown
             MessageType.SERVER_SHUTDOWN: re.compile(
-                r"^(Server\s+shutting\s+down|DOTA_GAMERULES_STATE_DISCONNECT)$"
+                r"^(Server\s+shutting\s+down|(Game\s+state\s+changed\s+to\s+)?DOTA_GAMERULES_STATE_DISCONNECT)$"
             ),
         }
 
         # Track current game state
         self._current_game_state: Optional[str] = None
         self._last_player_count: int = 0
+        self.status_engine = StatusSnapshotEngine()
 
     def get_supported_message_types(self) -> List[MessageType]:
         """Return list of message types this processor can detect."""
@@ -81,7 +83,7 @@ class Dota2MessageProcessor(BaseMessageProcessor):
         raw_message = raw_message.strip()
 
         if not raw_message:
-            return ParsedMessage(MessageType.UNKNOWN, raw_message)
+            return UNKNOWN_MESSAGE
 
         # Handle status poll responses
         if raw_message.startswith("STATUS_POLL:"):
@@ -96,7 +98,7 @@ class Dota2MessageProcessor(BaseMessageProcessor):
             if match:
                 return self._create_parsed_message(msg_type, raw_message, match)
 
-        return ParsedMessage(MessageType.UNKNOWN, raw_message)
+        return UNKNOWN_MESSAGE
 
     def _create_parsed_message(
         self, msg_type: MessageType, raw_message: str, match: re.Match
@@ -150,48 +152,31 @@ class Dota2MessageProcessor(BaseMessageProcessor):
         - map: Current map
         - players: X humans, Y bots (Z/MAX)
         - Player table with: userid name steamid connected ping loss state rate
+
+        The snapshot engine keeps the previous poll, so `changes` lists the
+        players who joined, left, or changed ping or state since then.
         """
+        snapshot, changes, unchanged = self.status_engine.update(status_output)
         data: Dict = {
-            "raw_status": status_output,
-            "players": [],
+            "hostname": snapshot.hostname,
+            "map": snapshot.map,
+            "human_count": snapshot.human_count,
+            "bot_count": snapshot.bot_count,
+            "player_count": snapshot.player_count,
+            "max_players": snapshot.max_players,
+            "players": list(snapshot.players.values()),
+            "changes": changes,
+            "unchanged": unchanged,
         }
 
-        lines = status_output.strip().split("\n")
-        in_player_section = False
-
-        for line in lines:
-            line = line.strip()
-
-            # Parse server info lines
-            if line.startswith("hostname:"):
-                data["hostname"] = line.split(":", 1)[1].strip()
-            elif line.startswith("map"):
-                # Format: map     : mapname at: x y z
-                parts = line.split(":")
-                if len(parts) >= 2:
-                    data["map"] = parts[1].strip().split()[0]
-            elif line.startswith("players"):
-                # Format: players : X humans, Y bots (Z/MAX)
-                match = re.search(r"(\d+)\s+humans?,\s*(\d+)\s+bots?\s*\((\d+)/(\d+)\)", line)
-                if match:
-                    data["human_count"] = int(match.group(1))
-                    data["bot_count"] = int(match.group(2))
-                    data["player_count"] = int(match.group(3))
-                    data["max_players"] = int(match.group(4))
-
-            # Detect player table header
-            elif "userid" in line and "name" in line:
-                in_player_section = True
-                continue
-
-            # Parse player lines
-            elif in_player_section and line and not line.startswith("#"):
-                player = self._parse_player_line(line)
-                if player:
-                    data["players"].append(player)
+        for change in changes:
+            if change.kind == PLAYER_JOINED:
+                self.logger.info(f"Player joined: {change.player.name} ({change.player.steamid})")
+            elif change.kind == PLAYER_LEFT:
+                self.logger.info(f"Player left: {change.player.name} ({change.player.steamid})")
 
         # Detect state changes based on player count
-        current_count = len(data.get("players", []))
+        current_count = len(snapshot.players)
         if current_count != self._last_player_count:
             data["player_count_changed"] = True
             data["previous_count"] = self._last_player_count
@@ -203,58 +188,6 @@ class Dota2MessageProcessor(BaseMessageProcessor):
             data,
         )
 
-    def _parse_player_line(self, line: str) -> Optional[Dict]:
-        """
-        Parse a player line from status output.
-
-        Expected format:
-        # userid name steamid connected ping loss state rate
-        """
-        try:
-            # Remove leading # if present
-            if line.startswith("#"):
-                line = line[1:].strip()
-
-            parts = line.split()
-            if len(parts) < 4:
-                return None
-
-            # Try to parse as player data
-            player = {
-                "userid": parts[0],
-                "name": parts[1],
-            }
-
-            # Parse additional fields if present
-            if len(parts) >= 3:
-                player["steamid"] = parts[2]
-            if len(parts) >= 4:
-                player["connected"] = parts[3]
-            if len(parts) >= 5:
-                try:
-                    player["ping"] = int(parts[4])
-                except ValueError:
-                    player["ping"] = 0
-            if len(parts) >= 6:
-                player["loss"] = parts[5]
-            if len(parts) >= 7:
-                player["state"] = parts[6]
-            if len(parts) >= 8:
-                try:
-                    player["rate"] = int(parts[7])
-                except ValueError:
-                    player["rate"] = 0
-
-            # Determine if bot
-            steamid = player.get("steamid", "")
-            player["is_bot"] = "BOT" in steamid.upper() or steamid == "0"
-
-            return player
-
-        except Exception as e:
-            self.logger.debug(f"Failed to parse player line '{line}': {e}")
-            return None
-
     def get_current_game_state(self) -> Optional[str]:
         """Get the current tracked game state."""
         return self._current_game_state
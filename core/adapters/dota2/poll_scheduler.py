@@ -0,0 +1,142 @@
+"""Adaptive status poll interval for the Dota 2 adapter."""
+
+import logging
+import re
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+# Phases that end on a countdown: the next transition is due soon, so these
+# poll at min_interval and never back off past the base interval
+TRANSITION_STATES = {
+    "HERO_SELECTION",
+    "STRATEGY_TIME",
+    "PRE_GAME",
+    "POST_GAME",
+}
+
+GAME_STATE_PATTERN = re.compile(r"DOTA_GAMERULES_STATE_([A-Z_]+)")
+
+
+def parse_game_state(response: Optional[str]) -> Optional[str]:
+    """The game state named in an RCON reply, without the DOTA_GAMERULES_STATE_ prefix."""
+    match = GAME_STATE_PATTERN.search(response or "")
+    return match.group(1) if match else None
+
+
+def status_fingerprint(status: str) -> str:
+    """
+    The parts of `status` output that mark a real change: server info lines
+    and each player's userid, name and steamid. Ping, loss and connected time
+    change on every poll and are left out.
+    """
+    parts = []
+    in_player_section = False
+    for line in status.splitlines():
+        line = line.strip()
+        if line.startswith(("hostname", "map", "players")):
+            parts.append(line)
+        elif "userid" in line and "name" in line:
+            in_player_section = True
+        elif in_player_section and line:
+            parts.append(" ".join(line.lstrip("#").split()[:3]))
+    return "\n".join(parts)
+
+
+class PollScheduler:
+    """
+    Chooses the delay before the next status poll.
+
+    After a poll that changed something (game state or status fingerprint)
+    the interval drops to the floor for the current state: min_interval
+    around expected transitions, base_interval otherwise. Each poll that
+    changes nothing multiplies the interval by `backoff`, up to
+    base_interval in transition states and max_interval elsewhere.
+
+    Detection latency is the gap between the poll that saw a change and the
+    one before it, i.e. the longest the change can have gone unnoticed.
+    """
+
+    def __init__(self, base_interval: float = 5.0, min_interval: float = 0.5, max_interval: float = 30.0,
+                 backoff: float = 1.5, window: float = 60.0):
+        self.base_interval = base_interval
+        self.min_interval = min(min_interval, base_interval)
+        self.max_interval = max(max_interval, base_interval)
+        self.backoff = backoff
+        self.window = window
+        self.logger = logging.getLogger(__name__)
+
+        self.interval = base_interval
+        self.state: Optional[str] = None
+        self.polls = 0
+        self.skipped = 0
+        self.changes = 0
+        self.last_detection_latency_ms: Optional[float] = None
+        self._detection_latency_total_ms = 0.0
+        self._fingerprint: Optional[str] = None
+        self._last_poll: Optional[float] = None
+        self._recent_polls: Deque[float] = deque()
+
+    def next_interval(self) -> float:
+        return self.interval
+
+    def _bounds(self, state: Optional[str]):
+        if state in TRANSITION_STATES:
+            return self.min_interval, self.base_interval
+        return self.base_interval, self.max_interval
+
+    def record_poll(self, fingerprint: str, state: Optional[str], now: Optional[float] = None,
+                    skipped: bool = False) -> bool:
+        """
+        Account for one status response and pick the next interval.
+
+        `skipped` marks a response reused from the cache instead of a new
+        RCON request. Returns True if something changed.
+        """
+        now = time.monotonic() if now is None else now
+        if skipped:
+            self.skipped += 1
+        else:
+            self.polls += 1
+            self._recent_polls.append(now)
+            while self._recent_polls and now - self._recent_polls[0] > self.window:
+                self._recent_polls.popleft()
+
+        changed = self._fingerprint is not None and (fingerprint != self._fingerprint or state != self.state)
+        floor, ceiling = self._bounds(state)
+        if changed:
+            self.changes += 1
+            if self._last_poll is not None:
+                self.last_detection_latency_ms = (now - self._last_poll) * 1000
+                self._detection_latency_total_ms += self.last_detection_latency_ms
+            self.interval = floor
+            self.logger.debug("Status changed (state %s), polling every %.2fs", state, self.interval)
+        else:
+            self.interval = max(floor, min(self.interval * self.backoff, ceiling))
+
+        self._fingerprint = fingerprint
+        self.state = state
+        self._last_poll = now
+        return changed
+
+    def poll_rate(self, now: Optional[float] = None) -> float:
+        """RCON status requests per second over the last `window` seconds."""
+        now = time.monotonic() if now is None else now
+        recent = [t for t in self._recent_polls if now - t <= self.window]
+        if len(recent) < 2:
+            return 0.0
+        return (len(recent) - 1) / max(recent[-1] - recent[0], 1e-9)
+
+    def get_stats(self) -> Dict[str, Any]:
+        mean_latency = self._detection_latency_total_ms / self.changes if self.changes else None
+        return {
+            "state": self.state,
+            "interval_s": round(self.interval, 3),
+            "poll_rate_hz": round(self.poll_rate(), 3),
+            "polls": self.polls,
+            "skipped": self.skipped,
+            "changes": self.changes,
+            "last_detection_latency_ms": None if self.last_detection_latency_ms is None
+            else round(self.last_detection_latency_ms, 1),
+            "mean_detection_latency_ms": None if mean_latency is None else round(mean_latency, 1),
+        }
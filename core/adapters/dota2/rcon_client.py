@@ -10,10 +10,11 @@ https://developer.valvesoftware.com/wiki/Source_RCON_Protocol
 
 import asyncio
 import logging
-import struct
 from enum import IntEnum
 from typing import Optional, Tuple
 
+from core.adapters.dota2.rcon_codec import RCONPacket, RCONPacketParser, RCONProtocolError, encode_packet
+
 
 class RCONPacketType(IntEnum):
     """RCON packet types as defined by the Source RCON protocol."""
@@ -38,6 +39,43 @@ class RCONConnectionError(RCONError):
     pass
 
 
+class _RCONProtocol(asyncio.Protocol):
+    """Feeds received chunks to the packet parser and queues complete packets."""
+
+    def __init__(self):
+        self.parser = RCONPacketParser()
+        self.packets: "asyncio.Queue[Optional[RCONPacket]]" = asyncio.Queue()
+        self.transport: Optional[asyncio.Transport] = None
+        self.chunks_received = 0
+        self._error: Optional[RCONError] = None
+
+    def connection_made(self, transport: asyncio.Transport) -> None:
+        self.transport = transport
+
+    def data_received(self, data: bytes) -> None:
+        self.chunks_received += 1
+        try:
+            for packet in self.parser.feed(data):
+                self.packets.put_nowait(packet)
+        except RCONProtocolError as e:
+            self._error = RCONConnectionError(f"Protocol error: {e}")
+            self.transport.close()
+
+    def connection_lost(self, exc: Optional[Exception]) -> None:
+        if self._error is None:
+            self._error = RCONConnectionError(f"Connection lost: {exc}" if exc else "Connection closed by server")
+        # Wakes a pending next_packet()
+        self.packets.put_nowait(None)
+
+    async def next_packet(self) -> RCONPacket:
+        packet = await self.packets.get()
+        if packet is None:
+            # Leave the marker for any later reader
+            self.packets.put_nowait(None)
+            raise self._error
+        return packet
+
+
 class SourceRCONClient:
     """
     Async Source RCON protocol client.
@@ -52,6 +90,10 @@ class SourceRCONClient:
     - Body (variable) - null-terminated ASCII string
     - Empty string (1 byte) - null terminator
 
+    The wire format lives in rcon_codec; this class drives it from an
+    asyncio.Protocol, so a multi-packet response arriving in one TCP read
+    is parsed in one pass instead of two reads per packet.
+
     Example usage:
         async with SourceRCONClient("localhost", 27015, "password") as rcon:
             response = await rcon.execute("status")
@@ -64,23 +106,42 @@ class SourceRCONClient:
         port: int = 27015,
         password: str = "",
         timeout: float = 10.0,
+        response_timeout: float = 2.0,
     ):
         self.host = host
         self.port = port
         self.password = password
         self.timeout = timeout
+        # A response is complete once no packet has arrived for this long
+        self.response_timeout = response_timeout
 
-        self._reader: Optional[asyncio.StreamReader] = None
-        self._writer: Optional[asyncio.StreamWriter] = None
+        self._transport: Optional[asyncio.Transport] = None
+        self._protocol: Optional[_RCONProtocol] = None
         self._request_id = 0
         self._authenticated = False
         self._lock = asyncio.Lock()
         self.logger = logging.getLogger(__name__)
+        # Per-packet chatter, sampled at DEBUG (see LOG_SAMPLE_RATES)
+        self.packet_logger = logging.getLogger(f"{__name__}.packets")
 
     @property
     def is_connected(self) -> bool:
         """Check if connected to server."""
-        return self._writer is not None and not self._writer.is_closing()
+        return self._transport is not None and not self._transport.is_closing()
+
+    @property
+    def local_host(self) -> Optional[str]:
+        """Our address on the RCON connection, as the server sees it on a LAN."""
+        if not self.is_connected:
+            return None
+        return self._transport.get_extra_info("sockname")[0]
+
+    @property
+    def remote_host(self) -> Optional[str]:
+        """The server's resolved address on the RCON connection."""
+        if not self.is_connected:
+            return None
+        return self._transport.get_extra_info("peername")[0]
 
     @property
     def is_authenticated(self) -> bool:
@@ -110,8 +171,9 @@ class SourceRCONClient:
         try:
             self.logger.info(f"Connecting to RCON server at {self.host}:{self.port}")
 
-            self._reader, self._writer = await asyncio.wait_for(
-                asyncio.open_connection(self.host, self.port),
+            loop = asyncio.get_running_loop()
+            self._transport, self._protocol = await asyncio.wait_for(
+                loop.create_connection(_RCONProtocol, self.host, self.port),
                 timeout=self.timeout,
             )
 
@@ -195,7 +257,7 @@ class SourceRCONClient:
         async with self._lock:
             request_id = self._get_next_id()
 
-            self.logger.info(f"Executing RCON command: {command} (request_id={request_id})")
+            self.logger.debug("Executing RCON command: %s (request_id=%d)", command, request_id)
 
             await self._send_packet(
                 request_id, RCONPacketType.SERVERDATA_EXECCOMMAND, command
@@ -209,41 +271,39 @@ class SourceRCONClient:
             while True:
                 try:
                     resp_id, resp_type, body = await asyncio.wait_for(
-                        self._receive_packet(), timeout=2.0  # Short timeout per packet
+                        self._receive_packet(), timeout=self.response_timeout
                     )
                     packets_received += 1
 
-                    self.logger.info(
-                        f"Received packet #{packets_received}: id={resp_id}, type={resp_type}, "
-                        f"body_len={len(body)}, body_preview={body[:50] if body else '(empty)'}..."
+                    self.packet_logger.debug(
+                        "Received packet #%d: id=%d, type=%d, body_len=%d",
+                        packets_received, resp_id, resp_type, len(body),
                     )
 
                     if resp_id == request_id:
                         response_parts.append(body)
-                        self.logger.info(f"Matched request_id, added to response parts")
                     else:
-                        self.logger.info(f"ID mismatch: got {resp_id}, expected {request_id}")
+                        self.packet_logger.debug("ID mismatch: got %d, expected %d", resp_id, request_id)
 
                 except asyncio.TimeoutError:
-                    self.logger.info(f"Read timeout after {packets_received} packets, returning collected data")
+                    self.packet_logger.debug("Read timeout after %d packets, returning collected data", packets_received)
                     break
 
             response = "".join(response_parts)
-            self.logger.info(f"RCON response ({len(response)} chars): {response[:200]}...")
+            self.logger.debug("RCON response (%d chars): %.200s", len(response), response)
             return response
 
     async def disconnect(self) -> None:
         """Close RCON connection."""
-        if self._writer:
+        if self._transport:
             self.logger.info("Disconnecting from RCON server")
             try:
-                self._writer.close()
-                await self._writer.wait_closed()
+                self._transport.close()
             except Exception as e:
                 self.logger.debug(f"Error during disconnect: {e}")
 
-        self._reader = None
-        self._writer = None
+        self._transport = None
+        self._protocol = None
         self._authenticated = False
 
     def _get_next_id(self) -> int:
@@ -254,23 +314,10 @@ class SourceRCONClient:
     async def _send_packet(
         self, request_id: int, packet_type: int, body: str
     ) -> None:
-        """
-        Encode and send RCON packet.
-
-        Packet format:
-        - Size (4 bytes) = len(body) + 10 (for id, type, and 2 null terminators)
-        - ID (4 bytes)
-        - Type (4 bytes)
-        - Body (variable, null-terminated)
-        - Empty string (1 byte null)
-        """
-        body_bytes = body.encode("utf-8") + b"\x00\x00"
-        size = 4 + 4 + len(body_bytes)  # id + type + body with nulls
-
-        packet = struct.pack("<iii", size, request_id, packet_type) + body_bytes
-
-        self._writer.write(packet)
-        await self._writer.drain()
+        """Encode and send RCON packet (see rcon_codec for the format)."""
+        if not self.is_connected:
+            raise RCONConnectionError("Not connected")
+        self._transport.write(encode_packet(request_id, packet_type, body))
 
     async def _receive_packet(self) -> Tuple[int, int, str]:
         """
@@ -279,20 +326,9 @@ class SourceRCONClient:
         Returns:
             Tuple of (request_id, packet_type, body).
         """
-        # Read packet size
-        size_data = await self._reader.readexactly(4)
-        size = struct.unpack("<i", size_data)[0]
-
-        # Read packet body
-        body_data = await self._reader.readexactly(size)
-
-        # Unpack ID and type
-        request_id, packet_type = struct.unpack("<ii", body_data[:8])
-
-        # Extract body (strip null terminators)
-        body = body_data[8:-2].decode("utf-8", errors="replace")
-
-        return request_id, packet_type, body
+        if self._protocol is None:
+            raise RCONConnectionError("Not connected")
+        return await self._protocol.next_packet()
 
     async def get_status(self) -> str:
         """Get server status."""
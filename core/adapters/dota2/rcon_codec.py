@@ -0,0 +1,91 @@
+"""
+Sans-IO Source RCON wire format.
+
+Encodes requests and turns an arbitrary stream of received byte chunks into
+complete packets, without doing any I/O itself. SourceRCONClient drives it
+from an asyncio.Protocol; tests and benchmarks can feed it bytes directly.
+
+Packet layout (all little endian):
+- Size (4 bytes) - size of the rest of the packet (id + type + body + 2 nulls)
+- ID (4 bytes)
+- Type (4 bytes)
+- Body (null-terminated string) and one more empty-string null
+"""
+
+import struct
+from typing import List, NamedTuple
+
+HEADER = struct.Struct("<iii")  # size, id, type
+SIZE = struct.Struct("<i")
+ID_AND_TYPE = struct.Struct("<ii")
+
+# id + type + two null terminators
+MIN_PACKET_SIZE = 10
+# Servers split responses into 4096-byte bodies; anything far beyond that is a desync
+MAX_PACKET_SIZE = 64 * 1024
+
+
+class RCONPacket(NamedTuple):
+    request_id: int
+    packet_type: int
+    body: str
+
+
+class RCONProtocolError(Exception):
+    """The byte stream doesn't look like RCON packets."""
+    pass
+
+
+def encode_packet(request_id: int, packet_type: int, body: str) -> bytes:
+    """Build one packet in a single buffer, header packed in place."""
+    body_bytes = body.encode("utf-8")
+    packet = bytearray(HEADER.size + len(body_bytes) + 2)
+    HEADER.pack_into(packet, 0, len(body_bytes) + MIN_PACKET_SIZE, request_id, packet_type)
+    packet[HEADER.size:HEADER.size + len(body_bytes)] = body_bytes
+    return bytes(packet)
+
+
+class RCONPacketParser:
+    """
+    Incremental packet parser.
+
+    feed() appends a received chunk to an internal bytearray and returns
+    every packet that is now complete; a partial packet stays buffered for
+    the next chunk. Fields are read with precompiled structs straight from
+    the buffer and bodies are decoded from memoryview slices, so the only
+    copy of a body is its decoded string.
+    """
+
+    def __init__(self):
+        self._buffer = bytearray()
+        self.packets_parsed = 0
+
+    @property
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    def feed(self, data: bytes) -> List[RCONPacket]:
+        buffer = self._buffer
+        buffer += data
+        available = len(buffer)
+        packets = []
+        offset = 0
+
+        with memoryview(buffer) as view:
+            while available - offset >= SIZE.size:
+                (size,) = SIZE.unpack_from(buffer, offset)
+                if size < MIN_PACKET_SIZE or size > MAX_PACKET_SIZE:
+                    raise RCONProtocolError(f"invalid packet size {size} at offset {offset}")
+                end = offset + SIZE.size + size
+                if end > available:
+                    break
+                request_id, packet_type = ID_AND_TYPE.unpack_from(buffer, offset + SIZE.size)
+                body = str(view[offset + HEADER.size:end - 2], "utf-8", "replace")
+                packets.append(RCONPacket(request_id, packet_type, body))
+                offset = end
+
+        if offset:
+            # The view is released, so the buffer can be resized again
+            del buffer[:offset]
+            self.packets_parsed += len(packets)
+        return packets
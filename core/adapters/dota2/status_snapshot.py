@@ -0,0 +1,171 @@
+"""Incremental parsing of Dota 2 `status` output into compact player records."""
+
+import re
+import sys
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+PLAYER_JOINED = "join"
+PLAYER_LEFT = "leave"
+PING_CHANGED = "ping"
+STATE_CHANGED = "state"
+
+# "# userid name uniqueid connected ping loss state rate"; names may be quoted
+PLAYER_LINE = re.compile(r'^#?\s*(\d+)\s+(?:"(.*?)"|(\S+))\s+(\S+)\s*(.*)$')
+PLAYERS_LINE = re.compile(r"(\d+)\s+humans?,\s*(\d+)\s+bots?\s*\((\d+)/(\d+)[^)]*\)")
+
+PlayerKey = Tuple[str, str]  # (userid, steamid): a reconnect gets a new userid
+
+
+class PlayerRecord:
+    """One row of the status player table. Repeated strings are interned."""
+
+    __slots__ = ("userid", "name", "steamid", "connected", "ping", "loss", "state", "rate", "is_bot")
+
+    def __init__(self, userid: str, name: str, steamid: str, connected: Optional[str] = None, ping: int = 0,
+                 loss: Optional[str] = None, state: Optional[str] = None, rate: int = 0):
+        self.userid = userid
+        self.name = sys.intern(name)
+        self.steamid = sys.intern(steamid)
+        self.connected = connected
+        self.ping = ping
+        self.loss = loss
+        self.state = sys.intern(state) if state else None
+        self.rate = rate
+        self.is_bot = "BOT" in steamid.upper() or steamid == "0"
+
+    @property
+    def key(self) -> PlayerKey:
+        return self.userid, self.steamid
+
+    def to_dict(self) -> Dict:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+    def __repr__(self) -> str:
+        return f"PlayerRecord({self.userid}, {self.name!r}, {self.steamid}, ping={self.ping}, state={self.state})"
+
+
+class StatusSnapshot:
+    __slots__ = ("hostname", "map", "human_count", "bot_count", "player_count", "max_players", "players")
+
+    def __init__(self):
+        self.hostname: Optional[str] = None
+        self.map: Optional[str] = None
+        self.human_count: Optional[int] = None
+        self.bot_count: Optional[int] = None
+        self.player_count: Optional[int] = None
+        self.max_players: Optional[int] = None
+        self.players: Dict[PlayerKey, PlayerRecord] = {}
+
+
+class StatusChange(NamedTuple):
+    kind: str  # PLAYER_JOINED, PLAYER_LEFT, PING_CHANGED or STATE_CHANGED
+    player: PlayerRecord
+    previous: Optional[PlayerRecord] = None
+
+
+def _to_int(value: str) -> int:
+    try:
+        return int(value)
+    except ValueError:
+        return 0
+
+
+def parse_player_line(line: str) -> Optional[PlayerRecord]:
+    match = PLAYER_LINE.match(line)
+    if not match:
+        return None
+    userid, quoted_name, name, steamid, rest = match.groups()
+    fields = rest.split()
+    if len(fields) == 1:
+        # Bots only have a state: '# 5 "Bot" BOT active'
+        fields = [None, None, None, fields[0]]
+    # connected ping loss state rate, as far as the line goes
+    fields += [None] * (5 - len(fields))
+    connected, ping, loss, state, rate = fields[:5]
+    return PlayerRecord(
+        userid,
+        quoted_name if quoted_name is not None else name,
+        steamid,
+        connected,
+        _to_int(ping) if ping else 0,
+        loss,
+        state,
+        _to_int(rate) if rate else 0,
+    )
+
+
+def parse_status(status: str) -> StatusSnapshot:
+    snapshot = StatusSnapshot()
+    in_player_section = False
+    for line in status.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        if in_player_section:
+            player = parse_player_line(line)
+            if player:
+                snapshot.players[player.key] = player
+        elif line.startswith("hostname"):
+            snapshot.hostname = line.split(":", 1)[1].strip()
+        elif line.startswith("map"):
+            parts = line.split(":")
+            if len(parts) >= 2 and parts[1].strip():
+                snapshot.map = parts[1].strip().split()[0]
+        elif line.startswith("players"):
+            match = PLAYERS_LINE.search(line)
+            if match:
+                (snapshot.human_count, snapshot.bot_count,
+                 snapshot.player_count, snapshot.max_players) = map(int, match.groups())
+        elif "userid" in line and "name" in line:
+            in_player_section = True
+    return snapshot
+
+
+class StatusSnapshotEngine:
+    """
+    Keeps the last parsed status and reports what changed in the next one.
+
+    A response byte-identical to the previous one is not parsed again. A
+    ping change is reported once a player's ping is `ping_threshold` ms or
+    more away from the last reported value, so slow drift is caught too.
+    """
+
+    def __init__(self, ping_threshold: int = 10):
+        self.ping_threshold = ping_threshold
+        self.snapshot = StatusSnapshot()
+        self.updates = 0
+        self.unchanged = 0
+        self._last_text: Optional[str] = None
+        self._reported_ping: Dict[PlayerKey, int] = {}
+
+    def update(self, status: str) -> Tuple[StatusSnapshot, List[StatusChange], bool]:
+        """Returns (snapshot, changes, unchanged), where `unchanged` means the text was identical."""
+        self.updates += 1
+        if status == self._last_text:
+            self.unchanged += 1
+            return self.snapshot, [], True
+
+        snapshot = parse_status(status)
+        changes = self.diff(self.snapshot.players, snapshot.players)
+        self.snapshot = snapshot
+        self._last_text = status
+        return snapshot, changes, False
+
+    def diff(self, before: Dict[PlayerKey, PlayerRecord], after: Dict[PlayerKey, PlayerRecord]) -> List[StatusChange]:
+        changes = []
+        for key, player in after.items():
+            previous = before.get(key)
+            if previous is None:
+                changes.append(StatusChange(PLAYER_JOINED, player))
+                self._reported_ping[key] = player.ping
+                continue
+            if player.state != previous.state:
+                changes.append(StatusChange(STATE_CHANGED, player, previous))
+            if abs(player.ping - self._reported_ping.get(key, previous.ping)) >= self.ping_threshold:
+                changes.append(StatusChange(PING_CHANGED, player, previous))
+                self._reported_ping[key] = player.ping
+        for key, previous in before.items():
+            if key not in after:
+                changes.append(StatusChange(PLAYER_LEFT, previous))
+                self._reported_ping.pop(key, None)
+        return changes
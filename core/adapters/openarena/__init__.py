@@ -3,5 +3,6 @@
 from core.adapters.openarena.adapter import OAGameAdapter
 from core.adapters.openarena.message_processor import OAMessageProcessor
 from core.adapters.openarena.game_manager import OAGameManager
+from core.adapters.openarena.query_client import Q3QueryClient, ServerInfo, ServerStatus
 
-__all__ = ["OAGameAdapter", "OAMessageProcessor", "OAGameManager"]
+__all__ = ["OAGameAdapter", "OAMessageProcessor", "OAGameManager", "Q3QueryClient", "ServerInfo", "ServerStatus"]
@@ -1,11 +1,10 @@
-"""OpenArena game adapter using subprocess/stdin communication."""
+"""OpenArena game adapter using asyncio subprocess stdin/stderr streams."""
 
 import asyncio
 import logging
-import subprocess
-import threading
-from subprocess import PIPE, Popen
-from typing import AsyncIterator, Optional
+import os
+from asyncio.subprocess import DEVNULL, PIPE, Process
+from typing import AsyncIterator, List, Optional
 
 from core.adapters.base import ConnectionType, GameAdapter, GameAdapterConfig
 import core.utils.settings as settings
@@ -16,13 +15,18 @@ class OAGameAdapter(GameAdapter):
     OpenArena game adapter using subprocess/stdin communication.
 
     This adapter manages the oa_ded (OpenArena dedicated server) process,
-    sending commands via stdin and reading responses from stderr.
+    sending commands via stdin and reading responses from stderr. The process
+    is spawned with asyncio.create_subprocess_exec, so reading never blocks
+    the event loop and all consumers can share a single loop.
     """
 
+    # Console lines longer than this are dropped instead of stalling the reader
+    STREAM_LIMIT = 1024 * 1024
+
     def __init__(self, config: GameAdapterConfig):
         self.config = config
-        self._process: Optional[Popen] = None
-        self._shutdown_event = threading.Event()
+        self._process: Optional[Process] = None
+        self._shutdown_requested = False
         self.logger = logging.getLogger(__name__)
 
     @property
@@ -31,70 +35,100 @@ class OAGameAdapter(GameAdapter):
 
     @property
     def is_connected(self) -> bool:
-        return self._process is not None and self._process.poll() is None
+        return self._process is not None and self._process.returncode is None
+
+    @property
+    def pid(self) -> Optional[int]:
+        return self._process.pid if self._process else None
 
     async def connect(self) -> bool:
         """For subprocess, 'connect' means starting the server."""
-        return self.start_server()
+        self.logger.info("Starting OpenArena server process")
+        self._shutdown_requested = False
 
-    async def disconnect(self) -> None:
-        """Stop the server process."""
-        self.stop_server()
+        try:
+            self._process = await asyncio.create_subprocess_exec(
+                *self.build_server_args(),
+                stdin=PIPE,
+                stdout=DEVNULL,
+                stderr=PIPE,
+                limit=self.STREAM_LIMIT,
+                preexec_fn=self._pin_to_cores if self.config.cpu_affinity else None,
+            )
+            self.logger.info(f"OpenArena server started with PID {self._process.pid}")
+            return True
+        except Exception as e:
+            self.logger.error(f"Failed to start OpenArena server: {e}")
+            return False
+
+    def _pin_to_cores(self) -> None:
+        """Runs in the child before exec, so oa_ded (and any wrapper) inherits the mask."""
+        os.sched_setaffinity(0, self.config.cpu_affinity)
+
+    async def disconnect(self, timeout: float = 5.0) -> None:
+        """Stop the server process, killing it if it has not exited after `timeout` seconds."""
+        self._shutdown_requested = True
+
+        if not self.is_connected:
+            return
+
+        self.logger.info("Terminating OpenArena server process")
+        self._process.terminate()
+        try:
+            await asyncio.wait_for(self._process.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            self._process.kill()
+            await self._process.wait()
+        self.logger.info("OpenArena server stopped")
 
     async def send_command(self, command: str) -> Optional[str]:
         """
         Send command via stdin. Returns None (responses come via stderr).
         """
-        if self._process and self._process.poll() is None:
+        if self.send_command_sync(command):
             try:
-                self.logger.debug(f"CMD_SEND: {command}")
-                self._process.stdin.write(f"{command}\r\n".encode())
-                self._process.stdin.flush()
-                return None
-            except (BrokenPipeError, OSError) as e:
+                await self._process.stdin.drain()
+            except (BrokenPipeError, ConnectionResetError) as e:
                 self.logger.error(f"Failed to send command: {e}")
         return None
 
-    def send_command_sync(self, command: str) -> None:
-        """Synchronous command sending for callback compatibility."""
-        if self._process and self._process.poll() is None:
+    def send_command_sync(self, command: str) -> bool:
+        """
+        Queue a command on stdin without waiting.
+
+        StreamWriter.write never blocks, so this is safe to call from handlers
+        running on the event loop. Must be called from the loop's thread.
+        """
+        if self.is_connected:
             try:
-                self.logger.debug(f"CMD_SEND: {command}")
+                self.logger.debug("CMD_SEND: %s", command)
                 self._process.stdin.write(f"{command}\r\n".encode())
-                self._process.stdin.flush()
-            except (BrokenPipeError, OSError) as e:
+                return True
+            except (BrokenPipeError, ConnectionResetError, RuntimeError) as e:
                 self.logger.error(f"Failed to send command: {e}")
+        return False
 
     async def read_messages(self) -> AsyncIterator[str]:
-        """Yield messages from stderr."""
-        while not self._shutdown_event.is_set() and self.is_connected:
+        """Yield messages from stderr until EOF or shutdown."""
+        while not self._shutdown_requested and self._process:
             try:
-                line = self._process.stderr.readline().decode(
-                    "utf-8", errors="replace"
-                ).rstrip()
-                if line:
-                    yield line
-            except (OSError, ValueError):
+                raw = await self._process.stderr.readline()
+            except ValueError:
+                self.logger.warning("Discarded oversized server output line")
+                continue
+            except (OSError, asyncio.IncompleteReadError):
                 break
-            await asyncio.sleep(0.01)
 
-    def read_message_sync(self) -> str:
-        """Synchronous message reading for the main loop."""
-        try:
-            return (
-                self._process.stderr.readline()
-                .decode("utf-8", errors="replace")
-                .rstrip()
-            )
-        except (OSError, ValueError) as e:
-            self.logger.error(f"Failed to read from server: {e}")
-            return ""
+            if not raw:
+                self.logger.info("Server stderr closed")
+                break
 
-    def start_server(self) -> bool:
-        """Start the OpenArena dedicated server process."""
-        self.logger.info("Starting OpenArena server process")
+            line = raw.decode("utf-8", errors="replace").rstrip()
+            if line:
+                yield line
 
-        # Build server arguments
+    def build_server_args(self) -> List[str]:
+        """Build the oa_ded command line."""
         binary_path = self.config.binary_path or "oa_ded"
         port = self.config.port or 27960
 
@@ -106,10 +140,14 @@ class OAGameAdapter(GameAdapter):
             "+set", "com_protocol", "71",
             "+set", "sv_pure", "0",
             "+set", "sv_master1", "dpmaster.deathmask.net",
-            "+set", "sv_maxclients", "4",
+            "+set", "sv_maxclients", str(self.config.max_clients),
             "+set", "cl_motd", "Welcome To ASTRID lab",
         ]
 
+        if self.config.homepath:
+            # fs_homepath takes an absolute path; com_homepath is only a directory name under $HOME
+            server_args.extend(["+set", "fs_homepath", os.path.abspath(self.config.homepath)])
+
         # Add startup config from settings
         startup_config = {
             "timelimit": str(settings.timelimit),
@@ -121,40 +159,38 @@ class OAGameAdapter(GameAdapter):
         for key, value in startup_config.items():
             server_args.extend(["+set", key, value])
 
-        server_args.extend(["+exec", "t_server.cfg"])
+        server_args.extend(["+exec", self.config.server_config or "t_server.cfg"])
+
+        if self.config.exec_prefix:
+            server_args = list(self.config.exec_prefix) + server_args
+
+        return server_args
+
+    def start_server(self) -> bool:
+        """
+        Schedule the server start on the running event loop.
 
+        Prefer `await connect()`, which reports whether the spawn succeeded.
+        """
         try:
-            self._process = Popen(
-                server_args,
-                stdout=PIPE,
-                stdin=PIPE,
-                stderr=PIPE,
-                universal_newlines=False,
-            )
-            self.logger.info(f"OpenArena server started with PID {self._process.pid}")
+            asyncio.get_running_loop().create_task(self.connect())
             return True
-        except Exception as e:
-            self.logger.error(f"Failed to start OpenArena server: {e}")
+        except RuntimeError:
+            self.logger.error("start_server requires a running event loop; use connect()")
             return False
 
     def stop_server(self) -> None:
-        """Stop/terminate the game server."""
-        self._shutdown_event.set()
+        """Request shutdown and terminate the process without waiting."""
+        self._shutdown_requested = True
 
-        if self._process and self._process.poll() is None:
+        if self.is_connected:
             self.logger.info("Terminating OpenArena server process")
             self._process.terminate()
-            try:
-                self._process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self._process.kill()
-                self._process.wait()
-            self.logger.info("OpenArena server stopped")
 
     def request_shutdown(self) -> None:
         """Request graceful shutdown."""
-        self._shutdown_event.set()
+        self._shutdown_requested = True
 
     def is_shutdown_requested(self) -> bool:
         """Check if shutdown has been requested."""
-        return self._shutdown_event.is_set()
+        return self._shutdown_requested
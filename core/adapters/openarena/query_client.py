@@ -0,0 +1,251 @@
+"""
+Quake 3 connectionless query client.
+
+oa_ded answers out-of-band `getstatus` and `getinfo` packets on its net_port:
+
+    request:  \\xff\\xff\\xff\\xffgetstatus <challenge>
+    response: \\xff\\xff\\xff\\xffstatusResponse\\n\\\\key\\\\value...\\n<score> <ping> "<name>"\\n...
+
+    request:  \\xff\\xff\\xff\\xffgetinfo <challenge>
+    response: \\xff\\xff\\xff\\xffinfoResponse\\n\\\\key\\\\value...
+
+Queries go over UDP and never touch the console, so they work as a readiness
+probe, health check and roster source while the stderr stream carries game
+output. One socket serves any number of concurrent queries to any number of
+servers; responses are matched by source address, response type and the
+echoed challenge.
+"""
+
+import asyncio
+import itertools
+import logging
+import socket
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Tuple
+
+OOB_HEADER = b"\xff\xff\xff\xff"
+STATUS_RESPONSE = b"statusResponse"
+INFO_RESPONSE = b"infoResponse"
+
+Address = Tuple[str, int]
+
+
+@dataclass
+class PlayerInfo:
+    """One line of a statusResponse player list."""
+    score: int
+    ping: int
+    name: str
+
+    @property
+    def is_bot(self) -> bool:
+        # Bots always report a ping of 0
+        return self.ping == 0
+
+
+@dataclass
+class ServerStatus:
+    """Parsed statusResponse: server cvars and player list."""
+    address: Address
+    cvars: Dict[str, str]
+    players: List[PlayerInfo] = field(default_factory=list)
+    rtt_ms: float = 0.0
+
+    @property
+    def map_name(self) -> str:
+        return self.cvars.get("mapname", "")
+
+    @property
+    def max_clients(self) -> int:
+        return int(self.cvars.get("sv_maxclients", 0) or 0)
+
+    @property
+    def human_count(self) -> int:
+        return sum(1 for player in self.players if not player.is_bot)
+
+
+@dataclass
+class ServerInfo:
+    """Parsed infoResponse."""
+    address: Address
+    info: Dict[str, str]
+    rtt_ms: float = 0.0
+
+    @property
+    def map_name(self) -> str:
+        return self.info.get("mapname", "")
+
+    @property
+    def clients(self) -> int:
+        return int(self.info.get("clients", 0) or 0)
+
+    @property
+    def max_clients(self) -> int:
+        return int(self.info.get("sv_maxclients", 0) or 0)
+
+
+def parse_infostring(text: str) -> Dict[str, str]:
+    """Parse a `\\key\\value\\key\\value` info string."""
+    parts = text.split("\\")
+    if parts and parts[0] == "":
+        parts = parts[1:]
+    return dict(zip(parts[0::2], parts[1::2]))
+
+
+def parse_player_line(line: str) -> Optional[PlayerInfo]:
+    """Parse a `<score> <ping> "<name>"` player line."""
+    try:
+        score, ping, name = line.split(" ", 2)
+        return PlayerInfo(score=int(score), ping=int(ping), name=name.strip().strip('"'))
+    except ValueError:
+        return None
+
+
+def parse_status_response(body: str) -> Tuple[Dict[str, str], List[PlayerInfo]]:
+    """Parse the text following `statusResponse\\n` into cvars and players."""
+    lines = body.split("\n")
+    cvars = parse_infostring(lines[0]) if lines else {}
+    players = [player for player in map(parse_player_line, lines[1:]) if player]
+    return cvars, players
+
+
+class _QueryProtocol(asyncio.DatagramProtocol):
+    def __init__(self, client: "Q3QueryClient"):
+        self.client = client
+
+    def datagram_received(self, data: bytes, addr) -> None:
+        self.client._on_datagram(data, (addr[0], addr[1]))
+
+    def error_received(self, exc: Exception) -> None:
+        # ICMP port unreachable etc.; the pending query simply times out
+        self.client.logger.debug(f"Query socket error: {exc}")
+
+
+class Q3QueryClient:
+    """Asyncio client for the Quake 3 getstatus/getinfo protocol."""
+
+    def __init__(self, timeout: float = 1.0, retries: int = 1):
+        self.timeout = timeout
+        self.retries = retries
+        self.logger = logging.getLogger(__name__)
+
+        self._transport: Optional[asyncio.DatagramTransport] = None
+        self._pending: Dict[Tuple[Address, bytes], Dict[str, asyncio.Future]] = {}
+        self._challenges = itertools.count(1)
+
+    async def open(self) -> None:
+        if self._transport is not None:
+            return
+        loop = asyncio.get_running_loop()
+        self._transport, _ = await loop.create_datagram_endpoint(
+            lambda: _QueryProtocol(self), local_addr=("0.0.0.0", 0), family=socket.AF_INET
+        )
+
+    def close(self) -> None:
+        if self._transport is not None:
+            self._transport.close()
+            self._transport = None
+        for waiters in self._pending.values():
+            for future in waiters.values():
+                if not future.done():
+                    future.cancel()
+        self._pending.clear()
+
+    async def __aenter__(self) -> "Q3QueryClient":
+        await self.open()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    async def get_status(self, host: str, port: int,
+                         timeout: Optional[float] = None) -> Optional[ServerStatus]:
+        """Query cvars and the player list; None if the server did not answer."""
+        result = await self._query(host, port, b"getstatus", STATUS_RESPONSE, timeout)
+        if result is None:
+            return None
+        address, body, rtt_ms = result
+        cvars, players = parse_status_response(body)
+        return ServerStatus(address=address, cvars=cvars, players=players, rtt_ms=rtt_ms)
+
+    async def get_info(self, host: str, port: int,
+                       timeout: Optional[float] = None) -> Optional[ServerInfo]:
+        """Query the short server info; None if the server did not answer."""
+        result = await self._query(host, port, b"getinfo", INFO_RESPONSE, timeout)
+        if result is None:
+            return None
+        address, body, rtt_ms = result
+        return ServerInfo(address=address, info=parse_infostring(body.split("\n", 1)[0]), rtt_ms=rtt_ms)
+
+    async def is_alive(self, host: str, port: int, timeout: Optional[float] = None) -> bool:
+        """Readiness/liveness check: the server answers getinfo."""
+        return await self.get_info(host, port, timeout) is not None
+
+    async def status_many(self, addresses: Iterable[Address],
+                          timeout: Optional[float] = None) -> Dict[Address, Optional[ServerStatus]]:
+        """Query many servers concurrently over the same socket."""
+        addresses = list(addresses)
+        results = await asyncio.gather(*(self.get_status(host, port, timeout) for host, port in addresses))
+        return dict(zip(addresses, results))
+
+    async def info_many(self, addresses: Iterable[Address],
+                        timeout: Optional[float] = None) -> Dict[Address, Optional[ServerInfo]]:
+        addresses = list(addresses)
+        results = await asyncio.gather(*(self.get_info(host, port, timeout) for host, port in addresses))
+        return dict(zip(addresses, results))
+
+    async def _query(self, host: str, port: int, command: bytes, response_type: bytes,
+                     timeout: Optional[float]) -> Optional[Tuple[Address, str, float]]:
+        await self.open()
+        loop = asyncio.get_running_loop()
+        address = (await self._resolve(host), port)
+        challenge = str(next(self._challenges))
+        key = (address, response_type)
+        timeout = timeout if timeout is not None else self.timeout
+
+        for _ in range(self.retries + 1):
+            future = loop.create_future()
+            self._pending.setdefault(key, {})[challenge] = future
+            started = time.perf_counter()
+            self._transport.sendto(OOB_HEADER + command + b" " + challenge.encode(), address)
+            try:
+                body = await asyncio.wait_for(future, timeout)
+                return address, body, (time.perf_counter() - started) * 1000
+            except asyncio.TimeoutError:
+                continue
+            finally:
+                waiters = self._pending.get(key)
+                if waiters is not None:
+                    waiters.pop(challenge, None)
+                    if not waiters:
+                        del self._pending[key]
+
+        self.logger.debug(f"No {response_type.decode()} from {address[0]}:{address[1]}")
+        return None
+
+    @staticmethod
+    async def _resolve(host: str) -> str:
+        try:
+            socket.inet_aton(host)
+            return host
+        except OSError:
+            infos = await asyncio.get_running_loop().getaddrinfo(
+                host, None, family=socket.AF_INET, type=socket.SOCK_DGRAM
+            )
+            return infos[0][4][0]
+
+    def _on_datagram(self, data: bytes, address: Address) -> None:
+        if not data.startswith(OOB_HEADER):
+            return
+
+        header, _, body = data[len(OOB_HEADER):].partition(b"\n")
+        waiters = self._pending.get((address, header.strip()))
+        if not waiters:
+            return
+
+        text = body.decode("utf-8", errors="replace")
+        challenge = parse_infostring(text.split("\n", 1)[0]).get("challenge")
+        future = waiters.get(challenge) if challenge in waiters else next(iter(waiters.values()))
+        if not future.done():
+            future.set_result(text)
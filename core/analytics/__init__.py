@@ -0,0 +1,23 @@
+"""Offline analysis of experiment results."""
+
+from core.analytics.summary import (
+    AnalyticsUnavailable,
+    ResultArrays,
+    analyze_results,
+    format_summary,
+    load_result_arrays,
+    summarize,
+    summary_table_rows,
+    SUMMARY_COLUMNS,
+)
+
+__all__ = [
+    "AnalyticsUnavailable",
+    "ResultArrays",
+    "analyze_results",
+    "format_summary",
+    "load_result_arrays",
+    "summarize",
+    "summary_table_rows",
+    "SUMMARY_COLUMNS",
+]
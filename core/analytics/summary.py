@@ -0,0 +1,236 @@
+"""
+Experiment summaries over the per-round results files.
+
+All results for an experiment are loaded into flat NumPy arrays (one element
+per human client per round) and every summary is computed with grouped
+bincount reductions, so evaluating hundreds of sessions costs a handful of
+array passes rather than Python loops over rows. NumPy is optional for the
+rest of the project; only this module needs it.
+"""
+
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from tabulate import tabulate
+
+from core.server.results_store import find_results_files, read_results_file
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# Two-sided 95% Student t critical values by degrees of freedom
+T_CRITICAL_95 = {
+    1: 12.706, 2: 4.303, 3: 3.182, 4: 2.776, 5: 2.571, 6: 2.447, 7: 2.365,
+    8: 2.306, 9: 2.262, 10: 2.228, 12: 2.179, 15: 2.131, 20: 2.086, 25: 2.060,
+    30: 2.042, 40: 2.021, 60: 2.000, 120: 1.980, 1000: 1.962,
+}
+
+
+class AnalyticsUnavailable(RuntimeError):
+    """NumPy is not installed."""
+    pass
+
+
+@dataclass
+class ResultArrays:
+    """Human client-round observations as parallel arrays."""
+    session: "np.ndarray"   # index of the results file
+    round: "np.ndarray"
+    player: "np.ndarray"    # index into `players`
+    latency: "np.ndarray"
+    score: "np.ndarray"
+    kills: "np.ndarray"
+    deaths: "np.ndarray"
+    observed_ping: "np.ndarray"
+    players: List[str]
+    sessions: List[str]
+
+    def __len__(self) -> int:
+        return len(self.round)
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise AnalyticsUnavailable("Experiment analytics require numpy (pip install numpy)")
+
+
+def _floats(values: List[Any]) -> "np.ndarray":
+    # None becomes NaN, so missing values drop out of every reduction
+    return np.array(values, dtype=np.float64)
+
+
+def load_result_arrays(directory: str) -> ResultArrays:
+    """Load every results file under `directory` (human rows only)."""
+    _require_numpy()
+
+    parts = []
+    sessions = []
+    for path in find_results_files(directory):
+        columns = read_results_file(path)
+        if columns and columns["round"]:
+            parts.append((len(sessions), columns))
+            sessions.append(path)
+
+    def concat(name: str) -> "np.ndarray":
+        if not parts:
+            return np.empty(0)
+        return np.concatenate([_floats(columns[name]) for _, columns in parts])
+
+    session = np.concatenate([np.full(len(c["round"]), i) for i, c in parts]) if parts else np.empty(0, dtype=int)
+    is_bot = concat("is_bot")
+    # Players are identified by address within a session; names can change mid-experiment
+    keys = np.array(
+        [f"{i}:{ip}" for i, columns in parts for ip in columns["ip"]], dtype=object
+    ) if parts else np.empty(0, dtype=object)
+
+    human = is_bot == 0
+    players, player = np.unique(keys[human].astype(str), return_inverse=True)
+
+    return ResultArrays(
+        session=session[human],
+        round=concat("round")[human],
+        player=player,
+        latency=concat("latency_ms")[human],
+        score=concat("score")[human],
+        kills=concat("kills")[human],
+        deaths=concat("deaths")[human],
+        observed_ping=concat("observed_ping_ms")[human],
+        players=list(players),
+        sessions=sessions,
+    )
+
+
+def _t95(dof: "np.ndarray") -> "np.ndarray":
+    table_dof = np.array(list(T_CRITICAL_95), dtype=np.float64)
+    table_t = np.array(list(T_CRITICAL_95.values()))
+    return np.interp(dof, table_dof, table_t)
+
+
+def grouped_stats(groups: "np.ndarray", values: "np.ndarray", group_count: int) -> Dict[str, "np.ndarray"]:
+    """Count, mean and 95% CI half-width of `values` per group, ignoring NaNs."""
+    valid = ~np.isnan(values)
+    g = groups[valid]
+    v = values[valid]
+
+    n = np.bincount(g, minlength=group_count).astype(np.float64)
+    total = np.bincount(g, weights=v, minlength=group_count)
+    total_sq = np.bincount(g, weights=v * v, minlength=group_count)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        mean = total / n
+        variance = np.maximum(total_sq - n * mean * mean, 0.0) / (n - 1)
+        ci = np.where(n > 1, _t95(np.maximum(n - 1, 1)) * np.sqrt(variance / n), np.nan)
+
+    return {"n": n, "mean": mean, "ci95": ci}
+
+
+def summarize(arrays: ResultArrays) -> Dict[str, Any]:
+    """
+    Standard per-latency summaries.
+
+    Besides raw score and kills, each observation is normalised by that
+    player's mean over all of their rounds, which removes skill differences
+    between players: 1.0 means "as good as this player usually is".
+    """
+    _require_numpy()
+    started = time.perf_counter()
+
+    has_latency = ~np.isnan(arrays.latency)
+    latency_levels, latency_group = np.unique(arrays.latency[has_latency], return_inverse=True)
+    player = arrays.player[has_latency]
+    level_count = len(latency_levels)
+
+    def per_player_normalised(values: "np.ndarray") -> "np.ndarray":
+        player_mean = grouped_stats(player, values, len(arrays.players))["mean"]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            return np.where(player_mean[player] != 0, values / player_mean[player], np.nan)
+
+    score = arrays.score[has_latency]
+    kills = arrays.kills[has_latency]
+    deaths = arrays.deaths[has_latency]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        kd = kills / np.maximum(deaths, 1)
+
+    stats = {
+        "score": grouped_stats(latency_group, score, level_count),
+        "kills": grouped_stats(latency_group, kills, level_count),
+        "kd": grouped_stats(latency_group, kd, level_count),
+        "norm_score": grouped_stats(latency_group, per_player_normalised(score), level_count),
+        "norm_kills": grouped_stats(latency_group, per_player_normalised(kills), level_count),
+        "observed_ping": grouped_stats(latency_group, arrays.observed_ping[has_latency], level_count),
+    }
+
+    by_latency = []
+    for i, latency in enumerate(latency_levels):
+        row = {"latency_ms": int(latency), "n": int(stats["score"]["n"][i])}
+        for name, values in stats.items():
+            row[f"{name}_mean"] = _clean(values["mean"][i])
+            row[f"{name}_ci95"] = _clean(values["ci95"][i])
+        by_latency.append(row)
+
+    return {
+        "rows": len(arrays),
+        "sessions": len(arrays.sessions),
+        "players": len(arrays.players),
+        "rounds": np.unique(np.stack([arrays.session, np.nan_to_num(arrays.round)]), axis=1).shape[1],
+        "by_latency": by_latency,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+
+
+def _clean(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 3)
+
+
+def analyze_results(directory: str) -> Dict[str, Any]:
+    """Load and summarise every results file under `directory`."""
+    started = time.perf_counter()
+    summary = summarize(load_result_arrays(directory))
+    summary["total_ms"] = round((time.perf_counter() - started) * 1000, 2)
+    return summary
+
+
+SUMMARY_COLUMNS = [
+    ("Latency", "latency_ms", None),
+    ("N", "n", None),
+    ("Score", "score_mean", "score_ci95"),
+    ("Kills", "kills_mean", "kills_ci95"),
+    ("K/D", "kd_mean", "kd_ci95"),
+    ("Norm score", "norm_score_mean", "norm_score_ci95"),
+    ("Norm kills", "norm_kills_mean", "norm_kills_ci95"),
+    ("Ping", "observed_ping_mean", None),
+]
+
+
+def summary_table_rows(summary: Dict[str, Any]) -> List[List[str]]:
+    """Rows of formatted cells ("mean ± ci") in SUMMARY_COLUMNS order."""
+    rows = []
+    for row in summary["by_latency"]:
+        cells = []
+        for _, mean_key, ci_key in SUMMARY_COLUMNS:
+            mean = row.get(mean_key)
+            ci = row.get(ci_key) if ci_key else None
+            if mean is None:
+                cells.append("-")
+            elif ci is None:
+                cells.append(f"{mean:g}")
+            else:
+                cells.append(f"{mean:.2f} ± {ci:.2f}")
+        rows.append(cells)
+    return rows
+
+
+def format_summary(summary: Dict[str, Any]) -> str:
+    header = (
+        f"{summary['sessions']} sessions, {summary['rounds']} rounds, {summary['players']} players, "
+        f"{summary['rows']} observations (summarised in {summary['elapsed_ms']}ms)"
+    )
+    table = tabulate(
+        summary_table_rows(summary),
+        headers=[title for title, _, _ in SUMMARY_COLUMNS],
+        tablefmt="grid",
+    )
+    return f"{header}\n{table}"
@@ -0,0 +1,111 @@
+import logging
+import time
+from array import array
+from typing import Dict, List, Optional
+
+from core.messaging.events import ClientLeft, RoundStarted
+from core.messaging.message_processor import MessageType
+
+# meansOfDeath_t from the OpenArena game code (bg_public.h)
+MOD_NAMES = [
+    "UNKNOWN", "SHOTGUN", "GAUNTLET", "MACHINEGUN", "GRENADE", "GRENADE_SPLASH",
+    "ROCKET", "ROCKET_SPLASH", "PLASMA", "PLASMA_SPLASH", "RAILGUN", "LIGHTNING",
+    "BFG", "BFG_SPLASH", "WATER", "SLIME", "LAVA", "CRUSH", "TELEFRAG", "FALLING",
+    "SUICIDE", "TARGET_LASER", "TRIGGER_HURT", "NAIL", "CHAINGUN", "PROXIMITY_MINE",
+    "KAMIKAZE", "JUICED", "GRAPPLE",
+]
+MOD_COUNT = 32  # room for mods newer game code may add
+
+MAX_CLIENTS = 64
+ENTITYNUM_WORLD = 1022
+
+
+class CombatStatsAggregator:
+    """
+    Streaming per-slot kill/death/weapon counters for the current round.
+
+    Counters live in flat unsigned arrays indexed by client slot (weapons by
+    slot * MOD_COUNT + mod), so recording a kill is a few integer increments
+    with no per-event allocation. Deaths caused by the world or by the victim
+    count as suicides, not as a kill for anyone.
+    """
+
+    def __init__(self, max_clients: int = MAX_CLIENTS):
+        self.max_clients = max_clients
+        self.logger = logging.getLogger(__name__)
+
+        self.kills = array("I", bytes(4 * max_clients))
+        self.deaths = array("I", bytes(4 * max_clients))
+        self.suicides = array("I", bytes(4 * max_clients))
+        self.weapon_kills = array("I", bytes(4 * max_clients * MOD_COUNT))
+        self.total_kills = 0
+        self.round_started = time.monotonic()
+
+    def register_handlers(self, event_bus) -> None:
+        event_bus.subscribe(MessageType.PLAYER_KILL, self._on_player_kill)
+        event_bus.subscribe(ClientLeft, lambda event: self.reset_slot(event.client_id),
+                            name="CombatStatsAggregator.reset_slot")
+        event_bus.subscribe(RoundStarted, lambda event: self.reset(), name="CombatStatsAggregator.reset")
+
+    def _on_player_kill(self, msg) -> None:
+        data = msg.data
+        self.record_kill(data["killer"], data["victim"], data["mod"])
+
+    def record_kill(self, killer: int, victim: int, mod: int) -> None:
+        if not 0 <= victim < self.max_clients:
+            return
+        self.deaths[victim] += 1
+
+        if killer == victim or not 0 <= killer < self.max_clients:
+            # killer is ENTITYNUM_WORLD for falling, lava, trigger_hurt...
+            self.suicides[victim] += 1
+            return
+
+        self.kills[killer] += 1
+        self.weapon_kills[killer * MOD_COUNT + (mod if 0 <= mod < MOD_COUNT else 0)] += 1
+        self.total_kills += 1
+
+    def reset_slot(self, slot: int) -> None:
+        """Clear a slot when a different client takes it over."""
+        if not 0 <= slot < self.max_clients:
+            return
+        self.kills[slot] = self.deaths[slot] = self.suicides[slot] = 0
+        base = slot * MOD_COUNT
+        self.weapon_kills[base:base + MOD_COUNT] = array("I", bytes(4 * MOD_COUNT))
+
+    def reset(self) -> None:
+        """Start counting a new round."""
+        for counters in (self.kills, self.deaths, self.suicides, self.weapon_kills):
+            counters[:] = array("I", bytes(4 * len(counters)))
+        self.total_kills = 0
+        self.round_started = time.monotonic()
+
+    def slot_stats(self, slot: int) -> Dict[str, object]:
+        base = slot * MOD_COUNT
+        weapons = {
+            (MOD_NAMES[mod] if mod < len(MOD_NAMES) else f"MOD_{mod}"): count
+            for mod, count in enumerate(self.weapon_kills[base:base + MOD_COUNT])
+            if count
+        }
+        return {
+            "kills": self.kills[slot],
+            "deaths": self.deaths[slot],
+            "suicides": self.suicides[slot],
+            "weapons": weapons,
+        }
+
+    def snapshot(self, slots: Optional[List[int]] = None) -> Dict[str, object]:
+        """Round totals and per-slot counters for the given (or all active) slots."""
+        if slots is None:
+            slots = [slot for slot in range(self.max_clients) if self.kills[slot] or self.deaths[slot]]
+        duration = time.monotonic() - self.round_started
+        clients = {}
+        for slot in slots:
+            stats = self.slot_stats(slot)
+            stats["kills_per_minute"] = round(stats["kills"] * 60 / duration, 2) if duration > 0 else 0.0
+            clients[slot] = stats
+        return {
+            "duration_s": round(duration, 1),
+            "total_kills": self.total_kills,
+            "clients": clients,
+        }
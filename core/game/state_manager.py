@@ -1,8 +1,10 @@
 import logging
+import time
 from enum import Enum
-from typing import Callable
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
 
 import core.utils.settings as settings
+from core.messaging.message_processor import MessageType
 
 
 class GameState(Enum):
@@ -11,98 +13,176 @@ class GameState(Enum):
     RUNNING = 3
 
 
+class GameEvent(Enum):
+    """What the server output says just happened."""
+    WARMUP = "warmup"
+    GAME_INITIALIZATION = "game_initialization"
+    MATCH_START = "match_start"  # ShutdownGame ending the warmup
+    MATCH_END = "match_end"  # ShutdownGame ending a match
+
+
+# (state, event) -> (next state, actions). Pairs not listed are illegal: the state is left alone.
+TRANSITIONS: Dict[Tuple[GameState, GameEvent], Tuple[GameState, Tuple[str, ...]]] = {
+    (GameState.WAITING, GameEvent.WARMUP): (GameState.WARMUP, ()),
+    (GameState.WARMUP, GameEvent.WARMUP): (GameState.WARMUP, ()),  # warmup restarted
+    (GameState.RUNNING, GameEvent.WARMUP): (GameState.WARMUP, ()),  # match restarted with warmup
+    (GameState.WAITING, GameEvent.GAME_INITIALIZATION): (GameState.RUNNING, ()),
+    (GameState.WARMUP, GameEvent.GAME_INITIALIZATION): (GameState.RUNNING, ()),
+    (GameState.RUNNING, GameEvent.GAME_INITIALIZATION): (GameState.RUNNING, ()),
+    # Every ShutdownGame reloads the map; wait for its Game Initialization
+    (GameState.WARMUP, GameEvent.MATCH_START): (GameState.WAITING, ("start_match_recording", "apply_latency")),
+    (GameState.RUNNING, GameEvent.MATCH_END): (GameState.WAITING, ("complete_round",)),
+}
+
+
+class StateTransition(NamedTuple):
+    """One accepted transition, as passed to transition hooks."""
+    event: GameEvent
+    from_state: GameState
+    to_state: GameState
+    round: int
+    timestamp: float  # time.time() of the transition
+    dwell: float  # seconds spent in from_state
+
+
 class GameStateManager:
-    """Reactive game state tracking and match progression."""
+    """
+    Reactive game state tracking and match progression.
+
+    State changes only happen through dispatch(), which looks up (state,
+    event) in TRANSITIONS. Every accepted transition is timestamped and
+    passed to the transition hooks; the built-in one adds up the time spent
+    in each state per round (get_round_dwell).
+    """
 
     def __init__(self, send_command_callback: Callable[[str], None]):
-        self.current_state = GameState.WAITING
+        self._state = GameState.WAITING
+        self._state_entered = time.monotonic()
         self.round_count: int = 1  # Should start from round 1
         self.warmup_round_count: int = 0
         self.max_rounds: int = len(settings.latencies) * settings.repeats
         self.send_command = send_command_callback
         self.logger = logging.getLogger(__name__)
 
+        self.last_transition: Optional[StateTransition] = None
+        self.rejected_transitions: int = 0
+        self._transition_hooks: List[Callable[[StateTransition], None]] = []
+        # Seconds per state in the current round, and per finished round
+        self._round_dwell: Dict[GameState, float] = dict.fromkeys(GameState, 0.0)
+        self.round_dwell_times: Dict[int, Dict[str, float]] = {}
+        self.add_transition_hook(self._record_dwell)
+
         self.logger.info(
             f"GameStateManager initialized: latencies={settings.latencies}, repeats={settings.repeats}, max_rounds={self.max_rounds}"
         )
 
-    def handle_warmup_detected(self) -> dict:
-        """React to server warmup message - purely reactive state tracking."""
-        result = {
-            "state_changed": False,
-            "actions": [],
+    @property
+    def current_state(self) -> GameState:
+        return self._state
+
+    def register_handlers(self, event_bus) -> None:
+        """Follow warmup and game initialization straight from parsed server output."""
+        event_bus.subscribe(MessageType.GAME_INITIALIZATION, lambda msg: self.handle_game_initialization_detected(),
+                            name="GameStateManager.game_initialization")
+        event_bus.subscribe(MessageType.WARMUP_STATE, lambda msg: self.handle_warmup_detected(),
+                            name="GameStateManager.warmup")
+
+    def add_transition_hook(self, hook: Callable[[StateTransition], None]) -> None:
+        """Call `hook` after every accepted transition, in registration order."""
+        self._transition_hooks.append(hook)
+
+    def dispatch(self, event: GameEvent) -> Optional[Tuple[str, ...]]:
+        """
+        Apply `event` to the current state.
+
+        Returns the transition's actions, or None if the transition is
+        illegal, in which case the state is unchanged.
+        """
+        entry = TRANSITIONS.get((self._state, event))
+        if entry is None:
+            self.rejected_transitions += 1
+            self.logger.warning(f"Rejected {event.name} in state {self._state.name}")
+            return None
+
+        next_state, actions = entry
+        now = time.monotonic()
+        transition = StateTransition(event, self._state, next_state, self.round_count, time.time(),
+                                     now - self._state_entered)
+        self._state = next_state
+        self._state_entered = now
+        self.last_transition = transition
+        self.logger.info(f"State tracked: {transition.from_state.name} -> {next_state.name} on {event.name}")
+
+        for hook in self._transition_hooks:
+            try:
+                hook(transition)
+            except Exception as e:
+                self.logger.error(f"Error in state transition hook: {e}", exc_info=True)
+        return actions
+
+    def reset(self, state: GameState = GameState.WAITING) -> None:
+        """Put the machine in `state` outside the table, e.g. for a fresh server process."""
+        self._state = state
+        self._state_entered = time.monotonic()
+
+    def _record_dwell(self, transition: StateTransition) -> None:
+        self._round_dwell[transition.from_state] += transition.dwell
+
+    def get_round_dwell(self, round_number: Optional[int] = None) -> Dict[str, float]:
+        """Seconds spent waiting, in warmup and running in a round; the current one counts up to now."""
+        if round_number is not None and round_number != self.round_count:
+            return dict(self.round_dwell_times.get(round_number, {}))
+        dwell = dict(self._round_dwell)
+        dwell[self._state] += time.monotonic() - self._state_entered
+        return {state.name.lower(): round(seconds, 3) for state, seconds in dwell.items()}
+
+    def _close_round(self) -> None:
+        self.round_dwell_times[self.round_count] = self.get_round_dwell()
+        self._round_dwell = dict.fromkeys(GameState, 0.0)
+        # Time already spent in the current state belongs to the next round
+        self._state_entered = time.monotonic()
+
+    def _handle(self, event: GameEvent) -> dict:
+        previous = self._state
+        actions = self.dispatch(event)
+        return {
+            "state_changed": self._state != previous,
+            "actions": list(actions or ()),
         }
 
-        if self.current_state == GameState.WAITING:
-            self.current_state = GameState.WARMUP
-            result["state_changed"] = True
-            self.logger.info("State tracked: WAITING -> WARMUP")
-        elif self.current_state == GameState.WARMUP:
-            self.logger.info("Warmup restarted")
-        elif self.current_state == GameState.RUNNING:
-            self.current_state = GameState.WARMUP
-            result["state_changed"] = True
-            self.logger.info(
-                "State tracked: RUNNING -> WARMUP (match restarted with warmup)"
-            )
-        else:
-            self.logger.warning(f"Unexpected warmup from state {self.current_state}")
-
-        return result
+    def handle_warmup_detected(self) -> dict:
+        """React to server warmup message - purely reactive state tracking."""
+        return self._handle(GameEvent.WARMUP)
 
     def handle_game_initialization_detected(self) -> dict:
         """React to game initialization - set state to RUNNING."""
-        result = {
-            "state_changed": False,
-            "actions": [],
-        }
-
-        self.current_state = GameState.RUNNING
-
-        result["state_changed"] = True
-
-        return result
+        return self._handle(GameEvent.GAME_INITIALIZATION)
 
     def handle_match_start_detected(self) -> dict:
-        """React to server match start - purely reactive state tracking."""
-        result = {
-            "state_changed": False,
-            "actions": [],
-        }
-
-        if self.current_state == GameState.WARMUP:
-            self.current_state = GameState.RUNNING
-            result["state_changed"] = True
-            result["actions"].extend(["start_match_recording", "apply_latency"])
-            self.logger.info(
-                f"State tracked: WARMUP -> RUNNING (starting round {self.round_count + 1})"
-            )
-        else:
-            self.logger.warning(
-                f"Unexpected match start from state {self.current_state}"
-            )
-
-        return result
+        """React to the ShutdownGame that ends the warmup."""
+        return self._handle(GameEvent.MATCH_START)
 
     def handle_match_shutdown_detected(self) -> dict:
-        """React to server shutdown the game match - acknowledge shutdown only."""
+        """React to the ShutdownGame that ends a match; completes the round."""
         result = {
             "round_completed": False,
             "experiment_finished": False,
             "actions": [],
         }
 
-        if self.current_state == GameState.RUNNING:
+        actions = self.dispatch(GameEvent.MATCH_END)
+        if actions and "complete_round" in actions:
+            self._close_round()
             self.round_count += 1
 
-            if self.round_count >= self.max_rounds:
+            if self.is_experiment_finished():
                 result["experiment_finished"] = True
                 self.logger.info(
                     f"Experiment completed after {self.round_count} rounds (max: {self.max_rounds})"
                 )
             else:
                 result["round_completed"] = True
-                result["actions"].extend(["rotate_latency"])
+                result["actions"].append("rotate_latency")
                 self.logger.info(
                     f"Round {self.round_count} completed, preparing round {self.round_count + 1} (max: {self.max_rounds})"
                 )
@@ -123,12 +203,25 @@ class GameStateManager:
             "state": self.current_state.name,
         }
 
+    def to_snapshot(self) -> dict:
+        """Compact, JSON-serialisable progression state."""
+        return {
+            "state": self.current_state.name,
+            "round_count": self.round_count,
+            "warmup_round_count": self.warmup_round_count,
+            "max_rounds": self.max_rounds,
+        }
+
+    def restore(self, snapshot: dict) -> None:
+        """Restore progression state written by to_snapshot()."""
+        self.reset(GameState[snapshot.get("state", self._state.name)])
+        self.round_count = snapshot.get("round_count", self.round_count)
+        self.warmup_round_count = snapshot.get("warmup_round_count", self.warmup_round_count)
+        self.max_rounds = snapshot.get("max_rounds", self.max_rounds)
+
     def is_experiment_finished(self) -> bool:
-        """Check if the experiment sequence is complete."""
-        return (
-            self.current_state == GameState.RUNNING
-            and self.round_count >= self.max_rounds
-        )
+        """Check if the experiment sequence is complete (every round has been played)."""
+        return self.round_count >= self.max_rounds
 
     def get_obs_status(self, obs_manager, client_manager) -> dict:
         """Get OBS connection status for all human clients."""
@@ -0,0 +1,217 @@
+import asyncio
+import inspect
+import logging
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+from core.messaging.message_processor import ParsedMessage
+
+# Subscribe with this key to receive every published event
+ANY_EVENT = "*"
+
+
+class Subscription:
+    """A synchronous subscriber, called inline by publish()."""
+
+    def __init__(self, key, handler: Callable[[Any], Any], name: str):
+        self.key = key
+        self.handler = handler
+        self.name = name
+        self.delivered = 0
+        self.errors = 0
+        self.max_handler_ms = 0.0
+
+    def deliver(self, event) -> None:
+        started = time.perf_counter()
+        try:
+            self.handler(event)
+        except Exception as e:
+            self.errors += 1
+            logging.getLogger(__name__).error(f"Subscriber {self.name} failed on {type(event).__name__}: {e}",
+                                              exc_info=True)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        if elapsed_ms > self.max_handler_ms:
+            self.max_handler_ms = elapsed_ms
+        self.delivered += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "mode": "sync",
+            "delivered": self.delivered,
+            "errors": self.errors,
+            "max_handler_ms": round(self.max_handler_ms, 3),
+        }
+
+    def close(self) -> None:
+        pass
+
+
+class AsyncSubscription(Subscription):
+    """
+    A subscriber fed through a queue and drained by its own task.
+
+    publish() only enqueues, so a slow handler can fall behind but never
+    blocks the publisher. The queue is unbounded and every event is
+    delivered, unless the subscriber opts into `drop_oldest`: then the queue
+    holds `maxsize` events and the oldest is dropped when it is full. Lag is
+    the time an event waited in the queue.
+    """
+
+    def __init__(self, key, handler: Callable[[Any], Any], name: str, maxsize: int = 0,
+                 drop_oldest: bool = False):
+        super().__init__(key, handler, name)
+        if maxsize and not drop_oldest:
+            # publish() cannot wait for room, so a bound means dropping events
+            raise ValueError(f"Subscriber {name}: a bounded queue needs drop_oldest=True")
+        if drop_oldest and maxsize <= 0:
+            raise ValueError(f"Subscriber {name}: drop_oldest needs a maxsize")
+        self.queue: "asyncio.Queue[tuple]" = asyncio.Queue(maxsize=maxsize)
+        self.dropped = 0
+        self.last_lag_ms = 0.0
+        self.max_lag_ms = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._closed = False
+        self._is_coroutine = inspect.iscoroutinefunction(handler)
+
+    def deliver(self, event) -> None:
+        if self._closed:
+            return
+        if self._task is None:
+            try:
+                self._task = asyncio.get_running_loop().create_task(self._consume(), name=f"bus-{self.name}")
+            except RuntimeError:
+                # No loop yet; events queue up until one is running
+                pass
+
+        if self.queue.full():
+            self.queue.get_nowait()
+            self.dropped += 1
+        self.queue.put_nowait((time.monotonic(), event))
+
+    async def _consume(self) -> None:
+        while True:
+            enqueued, event = await self.queue.get()
+            lag_ms = (time.monotonic() - enqueued) * 1000
+            self.last_lag_ms = lag_ms
+            if lag_ms > self.max_lag_ms:
+                self.max_lag_ms = lag_ms
+
+            started = time.perf_counter()
+            try:
+                result = self.handler(event)
+                if self._is_coroutine:
+                    await result
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                logging.getLogger(__name__).error(
+                    f"Subscriber {self.name} failed on {type(event).__name__}: {e}", exc_info=True
+                )
+            self.max_handler_ms = max(self.max_handler_ms, (time.perf_counter() - started) * 1000)
+            self.delivered += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = super().get_stats()
+        stats.update(
+            mode="async",
+            queued=self.queue.qsize(),
+            dropped=self.dropped,
+            last_lag_ms=round(self.last_lag_ms, 3),
+            max_lag_ms=round(self.max_lag_ms, 3),
+        )
+        return stats
+
+    def close(self) -> None:
+        self._closed = True
+        if self._task:
+            self._task.cancel()
+            self._task = None
+
+
+class EventBus:
+    """
+    In-process publish/subscribe between the server's components.
+
+    Events are keyed by type: a ParsedMessage by its MessageType, any other
+    event (see core.messaging.events) by its class. Synchronous subscribers
+    run inline in subscription order, which keeps state updates ordered with
+    parsing; they must be quick. Anything that does I/O or may be slow
+    subscribes asynchronously and gets its own queue.
+    """
+
+    def __init__(self):
+        self.logger = logging.getLogger(__name__)
+        self._subscribers: Dict[Any, List[Subscription]] = {}
+        self.published = 0
+
+    @staticmethod
+    def event_key(event) -> Any:
+        if isinstance(event, ParsedMessage):
+            return event.message_type
+        return type(event)
+
+    def subscribe(self, key, handler: Callable[[Any], Any], name: Optional[str] = None) -> Subscription:
+        """Call `handler(event)` inline for every event with this key (or tuple of keys)."""
+        return self._add(Subscription(key, handler, name or _handler_name(handler)))
+
+    def subscribe_async(self, key, handler: Callable[[Any], Any], name: Optional[str] = None,
+                        maxsize: int = 0, drop_oldest: bool = False) -> AsyncSubscription:
+        """
+        Deliver events with this key (or tuple of keys) to `handler`, sync or
+        async, from a queue-draining task. One subscription keeps the order of
+        all its event types. Every event is delivered unless `drop_oldest` is
+        set, which caps the queue at `maxsize` for subscribers that only care
+        about recent events.
+        """
+        return self._add(AsyncSubscription(key, handler, name or _handler_name(handler), maxsize, drop_oldest))
+
+    def _add(self, subscription: Subscription) -> Subscription:
+        for key in _keys(subscription.key):
+            self._subscribers.setdefault(key, []).append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        for key in _keys(subscription.key):
+            subscribers = self._subscribers.get(key, [])
+            if subscription in subscribers:
+                subscribers.remove(subscription)
+        subscription.close()
+
+    def publish(self, event) -> None:
+        """Deliver `event` to its subscribers; never waits on async ones."""
+        self.published += 1
+        for subscription in self._subscribers.get(self.event_key(event), ()):
+            subscription.deliver(event)
+        for subscription in self._subscribers.get(ANY_EVENT, ()):
+            subscription.deliver(event)
+
+    def has_subscribers(self, key) -> bool:
+        return bool(self._subscribers.get(key) or self._subscribers.get(ANY_EVENT))
+
+    def get_stats(self) -> List[Dict[str, Any]]:
+        """Per-subscriber delivery counts, errors and (for async ones) queue lag."""
+        return [subscription.get_stats() for subscription in self._all_subscriptions()]
+
+    def _all_subscriptions(self) -> List[Subscription]:
+        unique = {}
+        for subscriptions in self._subscribers.values():
+            for subscription in subscriptions:
+                unique[id(subscription)] = subscription
+        return list(unique.values())
+
+    def close(self) -> None:
+        """Stop all async subscriber tasks."""
+        for subscription in self._all_subscriptions():
+            subscription.close()
+
+
+def _keys(key) -> tuple:
+    return key if isinstance(key, tuple) else (key,)
+
+
+def _handler_name(handler: Callable) -> str:
+    owner = getattr(handler, "__self__", None)
+    name = getattr(handler, "__name__", repr(handler))
+    return f"{type(owner).__name__}.{name}" if owner is not None else name
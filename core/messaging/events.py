@@ -0,0 +1,61 @@
+"""Domain events published on the server's EventBus, alongside ParsedMessage."""
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+
+@dataclass(frozen=True)
+class ClientJoined:
+    """A client was discovered in status output for the first time in its slot."""
+    client_id: int
+    name: str
+    ip: Optional[str]
+    is_bot: bool
+    latency_ms: Optional[int] = None
+
+
+@dataclass(frozen=True)
+class ClientLeft:
+    client_id: int
+    ip: Optional[str]
+
+
+@dataclass(frozen=True)
+class ObsStatusChanged:
+    ip: str
+    connected: bool
+
+
+@dataclass(frozen=True)
+class RoundStarted:
+    """Warmup is over and the match for this round is live."""
+    round: int
+
+
+@dataclass(frozen=True)
+class RoundEnded:
+    round: int
+    latency_summary: Dict[str, Any] = field(default_factory=dict)
+    combat: Dict[str, Any] = field(default_factory=dict)
+    # Completes once OBS has stopped recording (an asyncio.Task), if recording
+    recording: Any = None
+
+
+@dataclass(frozen=True)
+class LatencyMismatch:
+    """A client's observed ping is outside the tolerance around its assigned latency."""
+    round: int
+    ip: str
+    expected_ms: int
+    observed_ms: float
+    samples: int
+
+
+@dataclass(frozen=True)
+class ExperimentFinished:
+    round: int
+
+
+@dataclass(frozen=True)
+class ServerRestarted:
+    restarts: int
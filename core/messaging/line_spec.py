@@ -0,0 +1,226 @@
+"""
+Declarative table of OpenArena console lines, shared by every OA parser.
+
+Both the server's MessageProcessor and the adapter's OAMessageProcessor are
+built from OA_LINE_RULES: a rule names an event, the literal prefix a line
+must start with, the regex that extracts its fields and how to convert
+them. LineMatcher compiles the table once and indexes it by prefix, so a
+line is only tried against the rules that can match it. StatusBlockParser
+is the shared state machine for the multi-line `status` reply.
+"""
+
+import logging
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Event names, used by the processors to pick a handler
+PLAYER_KILL = "player_kill"
+CLIENT_CONNECTING = "client_connecting"
+CLIENT_DISCONNECT = "client_disconnect"
+GAME_INITIALIZATION = "game_initialization"
+FRAGLIMIT_HIT = "fraglimit_hit"
+TIMELIMIT_HIT = "timelimit_hit"
+WARMUP = "warmup"
+SHUTDOWN_GAME = "shutdown_game"
+
+
+def _text(value: Optional[str]) -> str:
+    return value.strip() if value else ""
+
+
+@dataclass(frozen=True)
+class LineRule:
+    event: str
+    prefix: str
+    pattern: str
+    # (field name, converter) per regex group, in group order
+    fields: Tuple[Tuple[str, Callable[[Optional[str]], Any]], ...] = ()
+
+
+# In priority order: kill lines are by far the most frequent during a match
+OA_LINE_RULES: Tuple[LineRule, ...] = (
+    LineRule(PLAYER_KILL, "Kill: ", r"^Kill: ([0-9]+) ([0-9]+) ([0-9]+):",
+             (("killer", int), ("victim", int), ("mod", int))),
+    LineRule(CLIENT_CONNECTING, "Client ", r"^Client ([0-9]+) connecting with ([0-9]+) challenge ping$",
+             (("client_id", int), ("challenge_ping", int))),
+    LineRule(CLIENT_DISCONNECT, "ClientDisconnect: ", r"^ClientDisconnect: ([0-9]+)$", (("client_id", int),)),
+    LineRule(GAME_INITIALIZATION, "------- Game Initialization", r"^------- Game Initialization -------$"),
+    LineRule(FRAGLIMIT_HIT, "Exit: ", r"^Exit: Fraglimit hit\.$"),
+    LineRule(TIMELIMIT_HIT, "Exit: ", r"^Exit: Timelimit hit\.$"),
+    LineRule(WARMUP, "Warmup:", r"^Warmup:\s*(.*)$", (("info", _text),)),
+    LineRule(SHUTDOWN_GAME, "ShutdownGame:", r"^ShutdownGame:\s*(.*)$", (("info", _text),)),
+)
+
+
+class LineMatcher:
+    """
+    Matches lines against a rule table.
+
+    Rules are bucketed by the first `key_length` characters of their prefix;
+    a line only reaches the regexes in its bucket, and only after a cheap
+    startswith check. Every prefix must be at least `key_length` long.
+    """
+
+    def __init__(self, rules: Tuple[LineRule, ...] = OA_LINE_RULES, key_length: int = 4):
+        self.key_length = key_length
+        self._index: Dict[str, List[Tuple[LineRule, "re.Pattern", Tuple]]] = {}
+        for rule in rules:
+            if len(rule.prefix) < key_length:
+                raise ValueError(f"Prefix {rule.prefix!r} of rule {rule.event} is shorter than {key_length}")
+            self._index.setdefault(rule.prefix[:key_length], []).append(
+                (rule, re.compile(rule.pattern), rule.fields)
+            )
+
+    def match(self, line: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(event, fields) of the first rule that matches `line`, or None."""
+        bucket = self._index.get(line[:self.key_length])
+        if bucket is None:
+            return None
+        for rule, regex, fields in bucket:
+            if not line.startswith(rule.prefix):
+                continue
+            match = regex.match(line)
+            if match:
+                return rule.event, {name: convert(value) for (name, convert), value in zip(fields, match.groups())}
+        return None
+
+
+# Shared by every processor; the table is immutable, so one compiled copy is enough
+OA_LINE_MATCHER = LineMatcher()
+
+STATUS_CLIENT_LINE = re.compile(r"^\s*\d+\s+")
+
+
+def is_status_header(line: str) -> bool:
+    return "num score ping name" in line and "address" in line
+
+
+def _is_valid_ip(ip: str) -> bool:
+    try:
+        parts = ip.split(".")
+        return len(parts) == 4 and all(0 <= int(part) <= 255 for part in parts)
+    except (ValueError, AttributeError):
+        return False
+
+
+def parse_status_client(line: str, logger: Optional[logging.Logger] = None) -> Optional[Dict[str, Any]]:
+    """
+    Parse one client row of `status`:
+
+        num score ping name lastmsg address qport rate
+    """
+    parts = line.split()
+    if len(parts) < 6:
+        return None
+    try:
+        client_id = int(parts[0])
+        score = int(parts[1])
+        ping = int(parts[2])
+        name = parts[3]  # May contain color codes
+        lastmsg = int(parts[4])
+        address = parts[5]  # IP address or "bot"
+        qport = int(parts[6]) if parts[6] != "0" else 0
+        rate = int(parts[7])
+    except (ValueError, IndexError):
+        return None
+
+    if address == "bot":
+        client_type = "BOT"
+        ip_address = "bot"
+    else:
+        client_type = "HUMAN"
+        ip_address = address.split(":")[0] if ":" in address else address
+        if not _is_valid_ip(ip_address):
+            if logger:
+                logger.warning("[STATUS] Invalid IP format: %s", ip_address)
+            return None
+
+    return {
+        "client_id": client_id,
+        "score": score,
+        "ping": ping,
+        "name": name,
+        "lastmsg": lastmsg,
+        "ip": ip_address,
+        "qport": qport,
+        "rate": rate,
+        "type": client_type,
+    }
+
+
+class StatusBlockParser:
+    """
+    State machine for the multi-line `status` reply.
+
+    start() on the header line, then feed() every following line until it
+    reports the block finished. feed() returns (kind, data):
+
+    - ("line", data): a line inside the block; data has "client_data" and
+      "line_number" for client rows, otherwise it is empty
+    - ("complete", data): the block ended; data["client_data"] lists every
+      client row in order, one per client id
+    - ("ended", {}): the block ended on a line that isn't part of it and no
+      clients were seen, so the caller should treat the line as unparsed
+    """
+
+    LINE = "line"
+    COMPLETE = "complete"
+    ENDED = "ended"
+
+    def __init__(self, logger: logging.Logger, status_logger: logging.Logger):
+        self.logger = logger
+        self.status_logger = status_logger
+        self.active = False
+        self._line_count = 0
+        self._seen_separator = False
+        self._clients: Dict[int, Dict[str, Any]] = {}
+
+    def start(self) -> None:
+        self.status_logger.debug("[STATUS] Detected status header, starting status parsing")
+        self.active = True
+        self._line_count = 0
+        self._seen_separator = False
+        self._clients = {}
+
+    def feed(self, line: str) -> Tuple[str, Dict[str, Any]]:
+        self._line_count += 1
+        self.status_logger.debug("[STATUS] Line %d: '%s'", self._line_count, line)
+
+        if not line:
+            return self._complete(always=True)
+
+        if line.startswith("---"):
+            self.status_logger.debug("[STATUS] Found separator line, client data starts next")
+            self._seen_separator = True
+            return self.LINE, {}
+
+        if line.startswith(("map:", "num score ping")) or not self._seen_separator:
+            return self.LINE, {}
+
+        if not STATUS_CLIENT_LINE.match(line):
+            self.status_logger.debug("[STATUS] Non-client line detected, ending status parsing: '%s'", line)
+            return self._complete(always=False)
+
+        client_data = parse_status_client(line, self.logger)
+        if client_data is None:
+            self.status_logger.debug("[STATUS] Could not parse client line: '%s'", line)
+            return self.LINE, {}
+
+        self._clients.setdefault(client_data["client_id"], client_data)
+        self.status_logger.debug(
+            "[STATUS] Extracted client: ID=%s, Name=%s, IP=%s, Type=%s",
+            client_data["client_id"], client_data["name"], client_data["ip"], client_data["type"],
+        )
+        return self.LINE, {"client_data": client_data, "line_number": self._line_count}
+
+    def _complete(self, always: bool) -> Tuple[str, Dict[str, Any]]:
+        self.active = False
+        clients = list(self._clients.values())
+        humans = sum(1 for client in clients if client["type"] == "HUMAN")
+        self.logger.info(
+            "[STATUS] Extracted %d total clients: %d humans, %d bots", len(clients), humans, len(clients) - humans
+        )
+        if not clients and not always:
+            return self.ENDED, {}
+        return self.COMPLETE, {"client_data": clients, "status_complete": True}
@@ -1,9 +1,11 @@
 import logging
-import re
-from dataclasses import dataclass
-from typing import Dict, List, Optional, Callable
+from types import MappingProxyType
+from typing import Any, Dict, Callable, Mapping, NamedTuple
 from enum import Enum
 
+from core.messaging import line_spec
+from core.messaging.line_spec import OA_LINE_MATCHER, StatusBlockParser, is_status_header
+
 
 class MessageType(Enum):
     CLIENT_CONNECTING = "client_connecting"
@@ -14,107 +16,92 @@ class MessageType(Enum):
     WARMUP_STATE = "warmup_state"
     SHUTDOWN_GAME = "shutdown_game"
     STATUS_LINE = "status_line"
+    PLAYER_KILL = "player_kill"
     UNKNOWN = "unknown"
 
 
-@dataclass
-class ParsedMessage:
-    """Represents a parsed server message."""
+# Shared by every message parsed without data; read-only so no subscriber can leak state into it
+EMPTY_DATA: Mapping[str, Any] = MappingProxyType({})
+
+
+class ParsedMessage(NamedTuple):
+    """Represents a parsed server message. Immutable, and shared where possible."""
     message_type: MessageType
     raw_message: str
-    data: Dict = None
-    
-    def __post_init__(self):
-        if self.data is None:
-            self.data = {}
+    data: Mapping[str, Any] = EMPTY_DATA
+
+
+# Returned for every line no handler recognizes, so unparsed lines allocate nothing
+UNKNOWN_MESSAGE = ParsedMessage(MessageType.UNKNOWN, "")
 
 
 class MessageProcessor:
     """Processes server messages and extracts game events."""
     
-    def __init__(self, send_command_callback: Callable[[str], None]):
+    def __init__(self, send_command_callback: Callable[[str], None], event_bus=None):
         self.send_command = send_command_callback
+        self.event_bus = event_bus
         self.logger = logging.getLogger(__name__)
-        
-        self.patterns = {
-            MessageType.CLIENT_CONNECTING: re.compile(r"^Client ([0-9]+) connecting with ([0-9]+) challenge ping$"),
-            MessageType.CLIENT_DISCONNECT: re.compile(r"^ClientDisconnect: ([0-9]+)$"),
-            MessageType.GAME_INITIALIZATION: re.compile(r"^------- Game Initialization -------$"),
-            MessageType.MATCH_END_FRAGLIMIT: re.compile(r"^Exit: Fraglimit hit\.$"),
-            MessageType.MATCH_END_TIMELIMIT: re.compile(r"^Exit: Timelimit hit\.$"),
-            MessageType.WARMUP_STATE: re.compile(r"^Warmup:\s*(.*)$"),
-            MessageType.SHUTDOWN_GAME: re.compile(r"^ShutdownGame:\s*(.*)$")
+        # Per-line status parsing chatter, sampled at DEBUG (see LOG_SAMPLE_RATES)
+        self.status_logger = logging.getLogger(f"{__name__}.status")
+
+        # Line patterns come from the shared OpenArena table in line_spec
+        self.matcher = OA_LINE_MATCHER
+        self.handlers: Dict[str, Callable[[str, Dict], ParsedMessage]] = {
+            line_spec.PLAYER_KILL: self._handle_player_kill,
+            line_spec.CLIENT_CONNECTING: self._handle_client_connecting,
+            line_spec.CLIENT_DISCONNECT: self._handle_client_disconnect,
+            line_spec.GAME_INITIALIZATION: self._handle_game_initialization,
+            line_spec.FRAGLIMIT_HIT: self._handle_fraglimit_hit,
+            line_spec.TIMELIMIT_HIT: self._handle_timelimit_hit,
+            line_spec.WARMUP: self._handle_warmup_state,
+            line_spec.SHUTDOWN_GAME: self._handle_shutdown_game,
         }
-        
-        self._parsing_status = False
-        self._status_lines = []
-        self._status_line_count = 0
-        self._status_header_detected = False
-        self._status_client_count = 0
-        self._seen_separator = False
+        self.status_parser = StatusBlockParser(self.logger, self.status_logger)
         
         self._recent_fraglimit_hit = False
         self._recent_game_initialization = False
     
     def process_message(self, raw_message: str) -> ParsedMessage:
-        """Process a server message and return parsed result."""
+        """Parse a server message, publish it on the event bus and return it."""
+        parsed = self.parse_message(raw_message)
+        if self.event_bus is not None:
+            self.event_bus.publish(parsed)
+        return parsed
+
+    def parse_message(self, raw_message: str) -> ParsedMessage:
+        """Parse a server message without publishing it."""
         raw_message = raw_message.strip()
         
         if not raw_message:
-            return ParsedMessage(MessageType.UNKNOWN, raw_message)
-        
-        match = self.patterns[MessageType.CLIENT_CONNECTING].match(raw_message)
-        if match:
-            return self._handle_client_connecting(raw_message, match)
-        
-        match = self.patterns[MessageType.CLIENT_DISCONNECT].match(raw_message)
-        if match:
-            return self._handle_client_disconnect(raw_message, match)
-        
-        match = self.patterns[MessageType.GAME_INITIALIZATION].match(raw_message)
-        if match:
-            return self._handle_game_initialization(raw_message, match)
-        
-        match = self.patterns[MessageType.MATCH_END_FRAGLIMIT].match(raw_message)
-        if match:
-            return self._handle_fraglimit_hit(raw_message, match)
+            return UNKNOWN_MESSAGE
 
-        match = self.patterns[MessageType.MATCH_END_TIMELIMIT].match(raw_message)
-        if match:
-            return self._handle_timelimit_hit(raw_message, match)
-
-        match = self.patterns[MessageType.WARMUP_STATE].match(raw_message)
-        if match:
-            return self._handle_warmup_state(raw_message, match)
-        
-        match = self.patterns[MessageType.SHUTDOWN_GAME].match(raw_message)
-        if match:
-            return self._handle_shutdown_game(raw_message, match)
+        matched = self.matcher.match(raw_message)
+        if matched:
+            event, fields = matched
+            return self.handlers[event](raw_message, fields)
         
-        if "num score ping name" in raw_message and "address" in raw_message:
-            self.logger.debug(f"[STATUS] Detected status header, starting status parsing")
-            self._parsing_status = True
-            self._status_lines = []
-            self._status_line_count = 0
-            self._status_header_detected = True
-            self._status_client_count = 0
-            self._seen_separator = False
+        if is_status_header(raw_message):
+            self.status_parser.start()
             return self._handle_status_line(raw_message)
         
-        if self._parsing_status:
+        if self.status_parser.active:
             return self._handle_status_line(raw_message)
         
-        return ParsedMessage(MessageType.UNKNOWN, raw_message)
+        return UNKNOWN_MESSAGE
+
+    def _handle_player_kill(self, raw_message: str, fields: Dict) -> ParsedMessage:
+        return ParsedMessage(MessageType.PLAYER_KILL, raw_message, fields)
     
-    def _handle_client_connecting(self, raw_message: str, match: re.Match) -> ParsedMessage:
+    def _handle_client_connecting(self, raw_message: str, fields: Dict) -> ParsedMessage:
         """Handle client connecting message."""
-        client_id = int(match.group(1))
-        challenge_ping = int(match.group(2))
+        client_id = fields["client_id"]
+        challenge_ping = fields["challenge_ping"]
         
-        self.logger.info(f"Client {client_id} connecting with {challenge_ping} challenge ping")
+        self.logger.info("Client %d connecting with %d challenge ping", client_id, challenge_ping)
         
         # Request status to get client IP information
-        self.logger.debug(f"[STATUS] Sending 'status' command to get client IP information")
+        self.logger.debug("[STATUS] Sending 'status' command to get client IP information")
         self.send_command("status")
         
         return ParsedMessage(
@@ -127,11 +114,11 @@ class MessageProcessor:
             }
         )
     
-    def _handle_client_disconnect(self, raw_message: str, match: re.Match) -> ParsedMessage:
+    def _handle_client_disconnect(self, raw_message: str, fields: Dict) -> ParsedMessage:
         """Handle client disconnect message."""
-        client_id = int(match.group(1))
+        client_id = fields["client_id"]
         
-        self.logger.info(f"Client {client_id} disconnected")
+        self.logger.info("Client %d disconnected", client_id)
         
         return ParsedMessage(
             MessageType.CLIENT_DISCONNECT,
@@ -139,7 +126,7 @@ class MessageProcessor:
             {"client_id": client_id}
         )
     
-    def _handle_game_initialization(self, raw_message: str, match: re.Match) -> ParsedMessage:
+    def _handle_game_initialization(self, raw_message: str, fields: Dict) -> ParsedMessage:
         """Handle game initialization message."""
         self.logger.info("Game initialization detected - waiting to determine if warmup or match")
         
@@ -154,7 +141,7 @@ class MessageProcessor:
             }
         )
     
-    def _handle_fraglimit_hit(self, raw_message: str, match: re.Match) -> ParsedMessage:
+    def _handle_fraglimit_hit(self, raw_message: str, fields: Dict) -> ParsedMessage:
         """Handle fraglimit hit message."""
         self.logger.info("Fraglimit hit detected - match ended")
 
@@ -166,7 +153,7 @@ class MessageProcessor:
             {"event": "match_ended", "reason": "fraglimit"}
         )
 
-    def _handle_timelimit_hit(self, raw_message: str, match: re.Match) -> ParsedMessage:
+    def _handle_timelimit_hit(self, raw_message: str, fields: Dict) -> ParsedMessage:
         """Handle timelimit hit message."""
         self.logger.info("Timelimit hit detected - match ended")
 
@@ -178,13 +165,13 @@ class MessageProcessor:
             {"event": "match_ended", "reason": "timelimit"}
         )
     
-    def _handle_warmup_state(self, raw_message: str, match: re.Match) -> ParsedMessage:
+    def _handle_warmup_state(self, raw_message: str, fields: Dict) -> ParsedMessage:
         """Handle warmup state message."""
-        warmup_info = match.group(1).strip() if match.group(1) else ""
+        warmup_info = fields["info"]
         
         initialization_type = "warmup_initialization" if self._recent_game_initialization else "warmup_only"
         
-        self.logger.info(f"Warmup state detected: '{warmup_info}' (type: {initialization_type})")
+        self.logger.info("Warmup state detected: '%s' (type: %s)", warmup_info, initialization_type)
         
         self._recent_fraglimit_hit = False
         self._recent_game_initialization = False
@@ -201,9 +188,9 @@ class MessageProcessor:
             }
         )
     
-    def _handle_shutdown_game(self, raw_message: str, match: re.Match) -> ParsedMessage:
+    def _handle_shutdown_game(self, raw_message: str, fields: Dict) -> ParsedMessage:
         """Handle shutdown game message."""
-        shutdown_info = match.group(1).strip() if match.group(1) else ""
+        shutdown_info = fields["info"]
         
         is_match_end = self._recent_fraglimit_hit
         if self._recent_fraglimit_hit:
@@ -225,174 +212,10 @@ class MessageProcessor:
         )
     
     def _handle_status_line(self, raw_message: str) -> ParsedMessage:
-        """Handle server status output lines with clean exit detection."""
-        self._status_line_count += 1
-        
-        self.logger.debug(f"[STATUS] Line {self._status_line_count}: '{raw_message}'")
-        
-        if len(raw_message) == 0:
-            self.logger.info(f"[STATUS] Empty line detected, ending status parsing")
-            return self._complete_status_parsing()
-        
-        self._status_lines.append(raw_message)
-        
-        if raw_message.startswith("---"):
-            self.logger.debug(f"[STATUS] Found separator line, client data starts next")
-            self._seen_separator = True
-            return ParsedMessage(MessageType.STATUS_LINE, raw_message)
-        
-        if raw_message.startswith("map:"):
-            self.logger.debug(f"[STATUS] Found map line: {raw_message}")
-            return ParsedMessage(MessageType.STATUS_LINE, raw_message)
-        
-        if raw_message.startswith("num score ping"):
-            return ParsedMessage(MessageType.STATUS_LINE, raw_message)
-        
-        if self._seen_separator:
-            if re.match(r'^\s*\d+\s+', raw_message):
-                client_data = self._extract_client_from_status_line(raw_message)
-                if client_data:
-                    self._status_client_count += 1
-                    self.logger.info(f"[STATUS] Extracted client: ID={client_data.get('client_id')}, Name={client_data.get('name')}, IP={client_data.get('ip')}, Type={client_data.get('type')}")
-                    return ParsedMessage(
-                        MessageType.STATUS_LINE,
-                        raw_message,
-                        {
-                            "client_data": client_data,
-                            "line_number": self._status_line_count
-                        }
-                    )
-                else:
-                    self.logger.debug(f"[STATUS] Could not parse client line: '{raw_message}'")
-            else:
-                self.logger.info(f"[STATUS] Non-client line detected, ending status parsing: '{raw_message}'")
-                return self._complete_status_parsing_and_reprocess(raw_message)
-        
-        return ParsedMessage(MessageType.STATUS_LINE, raw_message)
-    
-    def _extract_client_from_status_line(self, line: str) -> Optional[dict]:
-        """Extract client data from a server status line."""
-        try:
-            parts = line.split()
-            self.logger.debug(f"[STATUS] Line parts: {parts}")
-            
-            if len(parts) < 6:
-                self.logger.debug(f"[STATUS] Line has insufficient parts: {len(parts)}")
-                return None
-            
-            # Status line format:
-            # num score ping name lastmsg address qport rate
-            #  0    1   2    3      4    5        6    7
-            try:
-                client_id = int(parts[0])
-                score = int(parts[1])
-                ping = int(parts[2])
-                name = parts[3]  # May contain color codes
-                lastmsg = int(parts[4])
-                address = parts[5]  # IP address or "bot"
-                qport = int(parts[6]) if parts[6] != '0' else 0
-                rate = int(parts[7])
-            except (ValueError, IndexError) as e:
-                self.logger.debug(f"[STATUS] Error parsing line parts: {e}")
-                return None
-            
-            if address == "bot":
-                client_type = "BOT"
-                ip_address = "bot"
-            else:
-                client_type = "HUMAN"
-                ip_address = address.split(":")[0] if ":" in address else address
-                if not self._is_valid_ip(ip_address):
-                    self.logger.warning(f"[STATUS] Invalid IP format: {ip_address}")
-                    return None
-            
-            client_data = {
-                "client_id": client_id,
-                "score": score,
-                "ping": ping,
-                "name": name,
-                "lastmsg": lastmsg,
-                "ip": ip_address,
-                "qport": qport,
-                "rate": rate,
-                "type": client_type
-            }
-            
-            self.logger.debug(f"[STATUS] Extracted client data: {client_data}")
-            return client_data
-            
-        except Exception as e:
-            self.logger.error(f"[STATUS] Error extracting client from line '{line}': {e}")
-            return None
-    
-    def _extract_client_data_from_status(self) -> List[dict]:
-        """Extract all client data from collected status lines."""
-        client_data_list = []
-        
-        self.logger.info(f"[STATUS] Processing {len(self._status_lines)} status lines")
-        
-        for i, line in enumerate(self._status_lines, 1):
-            if i <= 3:  # Skip map, headers, and separator lines
-                self.logger.debug(f"[STATUS] Skipping header line {i}: '{line}'")
-                continue
-                
-            client_data = self._extract_client_from_status_line(line)
-            if client_data:
-                existing = next((c for c in client_data_list if c["client_id"] == client_data["client_id"]), None)
-                if not existing:
-                    client_data_list.append(client_data)
-                else:
-                    self.logger.debug(f"[STATUS] Duplicate client_id {client_data['client_id']}, skipping")
-        
-        human_clients = [c for c in client_data_list if c["type"] == "HUMAN"]
-        bot_clients = [c for c in client_data_list if c["type"] == "BOT"]
-        
-        self.logger.info(f"[STATUS] Extracted {len(client_data_list)} total clients: {len(human_clients)} humans, {len(bot_clients)} bots")
-        if human_clients:
-            human_ips = [c["ip"] for c in human_clients]
-            self.logger.info(f"[STATUS] Human client IPs: {human_ips}")
-            
-        return client_data_list
-    
-    def _complete_status_parsing(self) -> ParsedMessage:
-        """Complete status parsing and return status complete message."""
-        self.logger.info(f"[STATUS] Status parsing complete. Processed {self._status_client_count} clients")
-        self._parsing_status = False
-        client_data = self._extract_client_data_from_status()
-        
-        return ParsedMessage(
-            MessageType.STATUS_LINE,
-            "STATUS_COMPLETE",
-            {
-                "client_data": client_data,
-                "status_complete": True
-            }
-        )
-    
-    def _complete_status_parsing_and_reprocess(self, raw_message: str) -> ParsedMessage:
-        """Complete status parsing and return the non-status message for reprocessing."""
-        self.logger.info(f"[STATUS] Status parsing complete. Processed {self._status_client_count} clients")
-        self._parsing_status = False
-        client_data = self._extract_client_data_from_status()
-        
-        if client_data:
-            self.logger.debug(f"[STATUS] Sending status complete with {len(client_data)} clients")
-            return ParsedMessage(
-                MessageType.STATUS_LINE,
-                "STATUS_COMPLETE",
-                {
-                    "client_data": client_data,
-                    "status_complete": True
-                }
-            )
-        else:
-            return ParsedMessage(MessageType.UNKNOWN, raw_message)
-    
-    def _is_valid_ip(self, ip: str) -> bool:
-        """Basic IP address validation."""
-        try:
-            parts = ip.split('.')
-            return (len(parts) == 4 and 
-                   all(0 <= int(part) <= 255 for part in parts))
-        except (ValueError, AttributeError):
-            return False
\ No newline at end of file
+        """Handle server status output lines (see StatusBlockParser)."""
+        kind, data = self.status_parser.feed(raw_message)
+        if kind == StatusBlockParser.COMPLETE:
+            return ParsedMessage(MessageType.STATUS_LINE, "STATUS_COMPLETE", data)
+        if kind == StatusBlockParser.ENDED:
+            return UNKNOWN_MESSAGE
+        return ParsedMessage(MessageType.STATUS_LINE, raw_message, data)
@@ -0,0 +1,202 @@
+import asyncio
+import logging
+import statistics
+import time
+from array import array
+from typing import Any, Callable, Dict, List, Optional
+
+from core.messaging.events import LatencyMismatch
+
+
+class LatencyVerifier:
+    """
+    Closed-loop check of injected latency against the ping reported by `status`.
+
+    Ping samples are kept per round in array-backed time series (one pair of
+    arrays per client IP) and compared against the netem delay assigned in
+    NetworkManager.ip_latency_map. Clients whose median ping deviates from the
+    expected value by more than the tolerance are flagged as soon as enough
+    samples are available, and a summary is published at the end of each round.
+
+    Results go to the log and, as LatencyMismatch events, to the event bus.
+    Players only see a generic in-game notice, and only with `announce`.
+    """
+
+    # Quake 3 reports 999 for clients that are still connecting or timing out
+    PING_UNKNOWN = 999
+
+    def __init__(
+        self,
+        network_manager,
+        tolerance_ms: int = 25,
+        min_samples: int = 3,
+        send_command_callback: Optional[Callable[[str], None]] = None,
+        event_bus=None,
+        announce: bool = False,
+    ):
+        self.network_manager = network_manager
+        self.tolerance_ms = tolerance_ms
+        self.min_samples = max(1, min_samples)
+        self.send_command = send_command_callback
+        self.event_bus = event_bus
+        self.announce = announce
+        self.logger = logging.getLogger(__name__)
+
+        self.round_number: int = 0
+        self.round_summaries: List[Dict[str, Any]] = []
+
+        self._pings: Dict[str, array] = {}
+        self._timestamps: Dict[str, array] = {}
+        self._flagged: Dict[str, Dict[str, Any]] = {}
+
+    def start_round(self, round_number: int) -> None:
+        """Discard previous samples and start collecting for a new round."""
+        self.round_number = round_number
+        self._pings.clear()
+        self._timestamps.clear()
+        self._flagged.clear()
+        self.logger.info(f"Latency verification started for round {round_number}")
+
+    def expected_latency(self, ip: str) -> Optional[int]:
+        """Return the delay netem should be adding for this client."""
+        if ip not in self.network_manager.ip_latency_map:
+            return None
+        if not self.network_manager.is_enabled():
+            return 0
+        return self.network_manager.ip_latency_map[ip]
+
+    def record_sample(self, ip: str, ping: int, timestamp: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        Store one ping sample for a client.
+
+        Returns:
+            The client evaluation if this sample caused the client to be flagged,
+            None otherwise.
+        """
+        if ping < 0 or ping >= self.PING_UNKNOWN:
+            return None
+        if ip not in self.network_manager.ip_latency_map:
+            return None
+
+        if ip not in self._pings:
+            self._pings[ip] = array("H")
+            self._timestamps[ip] = array("d")
+
+        self._pings[ip].append(ping)
+        self._timestamps[ip].append(timestamp if timestamp is not None else time.monotonic())
+
+        if ip in self._flagged:
+            return None
+
+        evaluation = self.evaluate_client(ip)
+        if evaluation and evaluation["within_tolerance"] is False:
+            self._flagged[ip] = evaluation
+            self.logger.warning(
+                f"[LATENCY] Client {ip} deviates from assigned latency: "
+                f"expected {evaluation['expected_ms']}ms, observed {evaluation['observed_ms']}ms "
+                f"over {evaluation['samples']} samples"
+            )
+            if self.event_bus:
+                self.event_bus.publish(LatencyMismatch(
+                    self.round_number, ip, evaluation["expected_ms"], evaluation["observed_ms"],
+                    evaluation["samples"],
+                ))
+            if self.announce and self.send_command:
+                self.send_command("say Latency check: a client is outside its assigned latency")
+            return evaluation
+
+        return None
+
+    def record_status(self, client_data_list: List[Dict[str, Any]]) -> None:
+        """Record ping samples for every human client in a completed status listing."""
+        now = time.monotonic()
+        for client_data in client_data_list:
+            if client_data.get("type") != "HUMAN":
+                continue
+            self.record_sample(client_data["ip"], client_data["ping"], now)
+
+    def evaluate_client(self, ip: str) -> Optional[Dict[str, Any]]:
+        """Compare observed ping for a client with its assigned latency."""
+        pings = self._pings.get(ip)
+        expected = self.expected_latency(ip)
+        if expected is None or not pings:
+            return None
+
+        observed = statistics.median(pings)
+        deviation = observed - expected
+        enough_samples = len(pings) >= self.min_samples
+
+        return {
+            "ip": ip,
+            "expected_ms": expected,
+            "observed_ms": round(observed, 1),
+            "min_ms": min(pings),
+            "max_ms": max(pings),
+            "deviation_ms": round(deviation, 1),
+            "samples": len(pings),
+            "within_tolerance": abs(deviation) <= self.tolerance_ms if enough_samples else None,
+        }
+
+    def get_samples(self, ip: str) -> Dict[str, array]:
+        """Return the raw (timestamp, ping) series collected for a client this round."""
+        return {
+            "timestamps": self._timestamps.get(ip, array("d")),
+            "pings": self._pings.get(ip, array("H")),
+        }
+
+    def publish_round_summary(self) -> Dict[str, Any]:
+        """Evaluate every sampled client and publish the summary for the current round."""
+        clients = [
+            evaluation
+            for evaluation in (self.evaluate_client(ip) for ip in self._pings)
+            if evaluation
+        ]
+        flagged = [c for c in clients if c["within_tolerance"] is False]
+
+        summary = {
+            "round": self.round_number,
+            "tolerance_ms": self.tolerance_ms,
+            "clients": clients,
+            "flagged": [c["ip"] for c in flagged],
+            "ok": not flagged,
+        }
+        self.round_summaries.append(summary)
+
+        for client in clients:
+            self.logger.info(
+                f"[LATENCY] Round {self.round_number} {client['ip']}: expected {client['expected_ms']}ms, "
+                f"observed {client['observed_ms']}ms (min {client['min_ms']}, max {client['max_ms']}, "
+                f"n={client['samples']})"
+            )
+
+        if flagged:
+            self.logger.warning(
+                f"[LATENCY] Round {self.round_number}: {len(flagged)}/{len(clients)} clients outside "
+                f"±{self.tolerance_ms}ms tolerance: {summary['flagged']}"
+            )
+        else:
+            self.logger.info(
+                f"[LATENCY] Round {self.round_number}: all {len(clients)} sampled clients within "
+                f"±{self.tolerance_ms}ms tolerance"
+            )
+
+        if self.announce and self.send_command and clients:
+            self.send_command(
+                f"say Round {self.round_number} latency check: "
+                f"{len(clients) - len(flagged)}/{len(clients)} clients OK"
+            )
+
+        return summary
+
+    async def run_sampling(self, is_active: Callable[[], bool], interval: float,
+                           is_shutdown: Callable[[], bool] = lambda: False) -> None:
+        """Periodically request `status` while `is_active()` holds."""
+        if interval <= 0 or not self.send_command:
+            self.logger.info("Latency sampling disabled")
+            return
+
+        self.logger.info(f"Latency sampling every {interval}s")
+        while not is_shutdown():
+            await asyncio.sleep(interval)
+            if is_active():
+                self.send_command("status")
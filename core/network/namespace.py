@@ -0,0 +1,139 @@
+import getpass
+import logging
+import os
+import socket
+import subprocess
+from contextlib import contextmanager
+from typing import Iterator, List, Optional
+
+import core.utils.settings as settings
+
+
+@contextmanager
+def enter_netns(name: Optional[str]) -> Iterator[None]:
+    """
+    Temporarily switch the calling thread into a named network namespace.
+
+    Sockets created inside the block stay bound to that namespace after the
+    thread switches back, which is how the netlink backend targets it.
+    """
+    if not name:
+        yield
+        return
+
+    original = os.open("/proc/self/ns/net", os.O_RDONLY)
+    target = os.open(f"/run/netns/{name}", os.O_RDONLY)
+    try:
+        os.setns(target, os.CLONE_NEWNET)
+        yield
+    finally:
+        os.setns(original, os.CLONE_NEWNET)
+        os.close(target)
+        os.close(original)
+
+
+def netns_socket(name: Optional[str], family: int, type: int, proto: int = 0) -> socket.socket:
+    """Create a socket that lives in the given network namespace."""
+    with enter_netns(name):
+        return socket.socket(family, type, proto)
+
+
+class NetworkNamespace:
+    """
+    Network namespace, veth pair and port forward for one managed server instance.
+
+    The game server runs inside the namespace and the latency rules are applied
+    to the namespace side of the veth pair, so each instance has its own qdisc
+    tree and nft tables and several experiments can shape traffic on one host
+    without touching each other's rules. Clients keep connecting to the host
+    address; a per-instance DNAT table forwards the game port into the namespace
+    without rewriting the client source address.
+    """
+
+    SUDO = "/usr/bin/sudo"
+
+    def __init__(self, name: str, index: int = 0, port: int = 27960, subnet_prefix: str = "10.200"):
+        self.name = name
+        self.index = index
+        self.port = port
+        self.host_veth = f"{name}-h"[:15]
+        self.ns_veth = f"{name}-n"[:15]
+        self.host_address = f"{subnet_prefix}.{index}.1"
+        self.ns_address = f"{subnet_prefix}.{index}.2"
+        self.nat_table = f"oa_{name}"
+        self.logger = logging.getLogger(__name__)
+        self._created = False
+
+    @classmethod
+    def from_settings(cls, index: int = 0, port: Optional[int] = None) -> Optional["NetworkNamespace"]:
+        """Build the namespace for an instance if namespace isolation is enabled."""
+        if not settings.netns_enable:
+            return None
+        return cls(
+            name=f"{settings.netns_prefix}{index}",
+            index=index,
+            port=port if port is not None else settings.oa_port,
+            subnet_prefix=settings.netns_subnet_prefix,
+        )
+
+    @property
+    def interface(self) -> str:
+        """Interface latency rules are applied to (inside the namespace)."""
+        return self.ns_veth
+
+    @property
+    def exec_prefix(self) -> List[str]:
+        """Command prefix that runs a program inside the namespace as the current user."""
+        return [self.SUDO, "ip", "netns", "exec", self.name, self.SUDO, "-u", getpass.getuser()]
+
+    def _run(self, *args: str, netns: bool = False) -> bool:
+        command = [self.SUDO] + (["ip", "netns", "exec", self.name] if netns else []) + list(args)
+        result = subprocess.run(command, capture_output=True, text=True)
+        if result.returncode != 0:
+            self.logger.debug(f"{' '.join(command)} failed: {result.stderr.strip()}")
+        return result.returncode == 0
+
+    def create(self) -> bool:
+        """Create the namespace, veth pair, addresses, routes and port forward."""
+        self.destroy()
+
+        self.logger.info(f"Creating network namespace {self.name} ({self.ns_address})")
+        steps = [
+            (("ip", "netns", "add", self.name), False),
+            (("ip", "link", "add", self.host_veth, "type", "veth", "peer", "name", self.ns_veth), False),
+            (("ip", "link", "set", self.ns_veth, "netns", self.name), False),
+            (("ip", "addr", "add", f"{self.host_address}/30", "dev", self.host_veth), False),
+            (("ip", "link", "set", self.host_veth, "up"), False),
+            (("ip", "addr", "add", f"{self.ns_address}/30", "dev", self.ns_veth), True),
+            (("ip", "link", "set", self.ns_veth, "up"), True),
+            (("ip", "link", "set", "lo", "up"), True),
+            (("ip", "route", "add", "default", "via", self.host_address), True),
+            (("sysctl", "-q", "-w", "net.ipv4.ip_forward=1"), False),
+            (("nft", "add", "table", "ip", self.nat_table), False),
+            (("nft", "add", "chain", "ip", self.nat_table, "prerouting",
+              "{ type nat hook prerouting priority -100; }"), False),
+            (("nft", "add", "rule", "ip", self.nat_table, "prerouting",
+              "udp", "dport", str(self.port), "dnat", "to", self.ns_address), False),
+        ]
+
+        for args, in_netns in steps:
+            if not self._run(*args, netns=in_netns):
+                self.logger.error(f"Failed to set up namespace {self.name}: {' '.join(args)}")
+                self.destroy()
+                return False
+
+        self._created = True
+        return True
+
+    def destroy(self) -> None:
+        """Remove the namespace and everything belonging to it."""
+        self._run("nft", "delete", "table", "ip", self.nat_table)
+        # Deleting the namespace also removes the veth pair and all its qdiscs
+        self._run("ip", "netns", "del", self.name)
+        self._run("ip", "link", "del", self.host_veth)
+        if self._created:
+            self.logger.info(f"Removed network namespace {self.name}")
+        self._created = False
+
+    def is_created(self) -> bool:
+        return self._created
@@ -0,0 +1,251 @@
+import errno
+import ipaddress
+import logging
+import os
+import socket
+import struct
+from typing import Dict, List, Optional, Tuple
+
+from core.network.namespace import enter_netns, netns_socket
+
+logger = logging.getLogger(__name__)
+
+# rtnetlink message types
+RTM_NEWQDISC = 36
+RTM_DELQDISC = 37
+RTM_NEWTCLASS = 40
+RTM_NEWTFILTER = 44
+
+NLMSG_ERROR = 2
+NLMSG_DONE = 3
+
+NLM_F_REQUEST = 0x001
+NLM_F_ACK = 0x004
+NLM_F_EXCL = 0x200
+NLM_F_CREATE = 0x400
+
+# Traffic control attributes
+TCA_KIND = 1
+TCA_OPTIONS = 2
+TCA_HTB_PARMS = 1
+TCA_HTB_INIT = 2
+TCA_U32_CLASSID = 1
+TCA_U32_SEL = 5
+TC_U32_TERMINAL = 1
+
+TC_H_ROOT = 0xFFFFFFFF
+TC_LINKLAYER_ETHERNET = 1
+ETH_P_IP = 0x0800
+
+HTB_RATE_BYTES = 1000 * 1000 * 1000 // 8  # 1000mbit, matching the shell backend
+HTB_MTU = 1600
+NETEM_LIMIT = 1000
+
+NLMSGHDR = struct.Struct("=IHHII")
+NLMSGERR = struct.Struct("=i")
+RTATTR = struct.Struct("=HH")
+TCMSG = struct.Struct("=BBHiIII")
+TC_RATESPEC = struct.Struct("=BBHhHI")
+TC_HTB_GLOB = struct.Struct("=IIIII")
+TC_HTB_OPT_TAIL = struct.Struct("=IIIII")
+TC_NETEM_QOPT = struct.Struct("=IIIIII")
+TC_U32_SEL = struct.Struct("=BBBxHHhhI")
+TC_U32_KEY = struct.Struct("!II")
+TC_U32_KEY_OFF = struct.Struct("=ii")
+
+
+def _handle(major: int, minor: int = 0) -> int:
+    return ((major & 0xFFFF) << 16) | (minor & 0xFFFF)
+
+
+def _align(length: int) -> int:
+    return (length + 3) & ~3
+
+
+def _attr(attr_type: int, payload: bytes) -> bytes:
+    length = RTATTR.size + len(payload)
+    return RTATTR.pack(length, attr_type) + payload + b"\x00" * (_align(length) - length)
+
+
+def _ticks_per_usec() -> float:
+    """Read the psched clock conversion the same way iproute2 does."""
+    try:
+        with open("/proc/net/psched") as f:
+            t2us, us2t, clock_res = (int(field, 16) for field in f.read().split()[:3])
+        if clock_res == 1000000000:
+            t2us = us2t
+        return t2us / us2t * (clock_res / 1000000)
+    except (OSError, ValueError, ZeroDivisionError):
+        return 15.625
+
+
+class RTNetlinkError(OSError):
+    """A traffic control request was rejected by the kernel."""
+    pass
+
+
+class RTNetlinkSocket:
+    """
+    Minimal rtnetlink client for the traffic control requests we need.
+
+    Requests are queued and sent in a single datagram, then all ACKs are
+    collected, so a full latency rule set costs one send and one or two
+    receives instead of one process spawn per rule. Requires CAP_NET_ADMIN
+    (and CAP_SYS_ADMIN to open the socket inside another network namespace).
+    """
+
+    def __init__(self, netns: Optional[str] = None):
+        self._sock = netns_socket(netns, socket.AF_NETLINK, socket.SOCK_RAW, socket.NETLINK_ROUTE)
+        self._sock.bind((0, 0))
+        self._seq = 0
+        self._pending: List[Tuple[int, bytes, bool]] = []
+
+    def close(self) -> None:
+        self._sock.close()
+
+    def __enter__(self) -> "RTNetlinkSocket":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.close()
+
+    def queue(self, msg_type: int, flags: int, payload: bytes, ignore_missing: bool = False) -> None:
+        """Queue one request; `ignore_missing` tolerates ENOENT/EINVAL (for deletes)."""
+        self._seq += 1
+        header = NLMSGHDR.pack(NLMSGHDR.size + len(payload), msg_type,
+                               flags | NLM_F_REQUEST | NLM_F_ACK, self._seq, 0)
+        self._pending.append((self._seq, header + payload, ignore_missing))
+
+    def commit(self) -> None:
+        """Send all queued requests in one datagram and wait for their ACKs."""
+        if not self._pending:
+            return
+
+        pending = {seq: ignore for seq, _, ignore in self._pending}
+        self._sock.send(b"".join(message for _, message, _ in self._pending))
+        self._pending.clear()
+
+        first_error = None
+        while pending:
+            data = memoryview(self._sock.recv(65536))
+            offset = 0
+            while offset + NLMSGHDR.size <= len(data):
+                length, msg_type, _, seq, _ = NLMSGHDR.unpack_from(data, offset)
+                if length < NLMSGHDR.size:
+                    break
+                if msg_type == NLMSG_ERROR and seq in pending:
+                    error = -NLMSGERR.unpack_from(data, offset + NLMSGHDR.size)[0]
+                    ignore = pending.pop(seq)
+                    if error and not (ignore and error in (errno.ENOENT, errno.EINVAL)):
+                        first_error = first_error or RTNetlinkError(error, os.strerror(error))
+                elif msg_type == NLMSG_DONE:
+                    pending.pop(seq, None)
+                offset += _align(length)
+
+        if first_error:
+            raise first_error
+
+    @staticmethod
+    def tcmsg(ifindex: int, handle: int, parent: int, info: int = 0) -> bytes:
+        return TCMSG.pack(socket.AF_UNSPEC, 0, 0, ifindex, handle, parent, info)
+
+
+class NetlinkNetworkUtils:
+    """
+    apply different latencies to each client ip using rtnetlink directly.
+
+    Builds the same htb + per-client netem class tree as the shell backend, but
+    classifies packets with a u32 destination-address filter instead of nft
+    marks, so every rule is a plain rtnetlink request and no subprocess (or
+    sudo) is involved. The manager process needs CAP_NET_ADMIN.
+    """
+
+    @staticmethod
+    def apply_latency_rules(ip_latency_map: Dict[str, int], interface: str,
+                            netns: Optional[str] = None) -> None:
+        ifindex = NetlinkNetworkUtils._ifindex(interface, netns)
+        ticks_per_usec = _ticks_per_usec()
+
+        with RTNetlinkSocket(netns) as nl:
+            NetlinkNetworkUtils._queue_root_delete(nl, ifindex)
+            nl.queue(
+                RTM_NEWQDISC,
+                NLM_F_CREATE | NLM_F_EXCL,
+                nl.tcmsg(ifindex, _handle(1), TC_H_ROOT)
+                + _attr(TCA_KIND, b"htb\x00")
+                + _attr(TCA_OPTIONS, _attr(TCA_HTB_INIT, TC_HTB_GLOB.pack(3, 10, 1, 0, 0))),
+            )
+
+            for i, (ip, latency) in enumerate(ip_latency_map.items(), start=1):
+                NetlinkNetworkUtils._queue_client(nl, ifindex, i, ip, latency, ticks_per_usec)
+                logger.debug(f"queued {latency}ms latency for {ip}")
+
+            nl.commit()
+
+        logger.info(f"latency rules applied via netlink to {len(ip_latency_map)} clients on {interface}")
+
+    @staticmethod
+    def dispose(interface: str, netns: Optional[str] = None) -> None:
+        ifindex = NetlinkNetworkUtils._ifindex(interface, netns)
+        with RTNetlinkSocket(netns) as nl:
+            NetlinkNetworkUtils._queue_root_delete(nl, ifindex)
+            nl.commit()
+
+    @staticmethod
+    def _ifindex(interface: str, netns: Optional[str]) -> int:
+        if not netns:
+            return socket.if_nametoindex(interface)
+        with enter_netns(netns):
+            return socket.if_nametoindex(interface)
+
+    @staticmethod
+    def _queue_root_delete(nl: RTNetlinkSocket, ifindex: int) -> None:
+        # Deleting the root qdisc restores the interface default (pfifo_fast/fq_codel)
+        nl.queue(RTM_DELQDISC, 0, nl.tcmsg(ifindex, 0, TC_H_ROOT), ignore_missing=True)
+
+    @staticmethod
+    def _queue_client(nl: RTNetlinkSocket, ifindex: int, slot: int, ip: str,
+                      latency: int, ticks_per_usec: float) -> None:
+        class_id = _handle(1, slot + 10)
+
+        rate = TC_RATESPEC.pack(0, TC_LINKLAYER_ETHERNET, 0, -1, 0, HTB_RATE_BYTES)
+        burst = HTB_RATE_BYTES // 1000 + HTB_MTU
+        buffer_ticks = int(1000000 * burst / HTB_RATE_BYTES * ticks_per_usec)
+        htb_opt = rate + rate + TC_HTB_OPT_TAIL.pack(buffer_ticks, buffer_ticks, 0, 0, 0)
+        nl.queue(
+            RTM_NEWTCLASS,
+            NLM_F_CREATE | NLM_F_EXCL,
+            nl.tcmsg(ifindex, class_id, _handle(1))
+            + _attr(TCA_KIND, b"htb\x00")
+            + _attr(TCA_OPTIONS, _attr(TCA_HTB_PARMS, htb_opt)),
+        )
+
+        nl.queue(
+            RTM_NEWQDISC,
+            NLM_F_CREATE | NLM_F_EXCL,
+            NetlinkNetworkUtils._netem_qdisc(nl, ifindex, slot, latency, ticks_per_usec),
+        )
+
+        selector = (
+            TC_U32_SEL.pack(TC_U32_TERMINAL, 0, 1, 0, 0, 0, 0, 0)
+            + TC_U32_KEY.pack(0xFFFFFFFF, int(ipaddress.IPv4Address(ip)))
+            + TC_U32_KEY_OFF.pack(16, 0)  # IPv4 destination address offset
+        )
+        nl.queue(
+            RTM_NEWTFILTER,
+            NLM_F_CREATE | NLM_F_EXCL,
+            nl.tcmsg(ifindex, 0, _handle(1), _handle(1, socket.htons(ETH_P_IP)))
+            + _attr(TCA_KIND, b"u32\x00")
+            + _attr(TCA_OPTIONS, _attr(TCA_U32_CLASSID, struct.pack("=I", class_id))
+                    + _attr(TCA_U32_SEL, selector)),
+        )
+
+    @staticmethod
+    def _netem_qdisc(nl: RTNetlinkSocket, ifindex: int, slot: int,
+                     latency: int, ticks_per_usec: float) -> bytes:
+        latency_ticks = int(latency * 1000 * ticks_per_usec)
+        return (
+            nl.tcmsg(ifindex, _handle(slot + 10), _handle(1, slot + 10))
+            + _attr(TCA_KIND, b"netem\x00")
+            + _attr(TCA_OPTIONS, TC_NETEM_QOPT.pack(latency_ticks, NETEM_LIMIT, 0, 0, 0, 0))
+        )
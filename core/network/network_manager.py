@@ -1,8 +1,11 @@
+import asyncio
 import logging
+import threading
 from typing import Any, Dict, List, Optional, Callable
 
 import core.utils.settings as settings
-from core.network.network_utils import NetworkUtils
+from core.messaging.events import ClientJoined, ClientLeft
+from core.network.network_utils import get_network_utils
 
 
 class NetworkManager:
@@ -13,8 +16,10 @@ class NetworkManager:
         "Skelebot", "Merman", "Beret", "Kyonshi",
     ]
 
-    def __init__(self, interface: str = "enp1s0", send_command_callback: Optional[Callable[[str], None]] = None):
+    def __init__(self, interface: str = "enp1s0", send_command_callback: Optional[Callable[[str], None]] = None,
+                 netns: Optional[str] = None):
         self.interface = interface
+        self.netns = netns
         self.send_command = send_command_callback
         self.logger = logging.getLogger(__name__)
 
@@ -30,6 +35,24 @@ class NetworkManager:
         self._current_latencies = list(settings.latencies)
         self._round_count = 0
         self._enabled = settings.enable_latency_control
+        self._network_utils = get_network_utils()
+        # Shaping may run in worker threads; a retry must not interleave with a late attempt
+        self._shaping_lock = threading.Lock()
+
+    def register_handlers(self, event_bus) -> None:
+        """Track clients from the server's join/leave events."""
+        event_bus.subscribe(ClientJoined, self._on_client_joined)
+        event_bus.subscribe(ClientLeft, lambda event: self.remove_client(event.client_id),
+                            name="NetworkManager.remove_client")
+
+    def _on_client_joined(self, event: ClientJoined) -> None:
+        self.add_client(
+            client_id=event.client_id,
+            ip=event.ip,
+            latency=event.latency_ms,
+            name=event.name,
+            is_bot=event.is_bot,
+        )
 
     def add_client(self, client_id: int, ip: Optional[str] = None,
                    latency: Optional[int] = None, name: Optional[str] = None,
@@ -88,6 +111,13 @@ class NetworkManager:
         if client_type == "UNKNOWN" and client_id not in self.client_type_map:
             self.logger.warning(f"Attempted to remove unknown client {client_id}")
 
+    def forget_slots(self) -> None:
+        """Drop slot-based client tracking but keep per-IP latency assignments."""
+        self.client_ip_map.clear()
+        self.client_type_map.clear()
+        self.client_name_map.clear()
+        self.player_count = self.human_count = self.bot_count = 0
+
     def get_client_count(self) -> int:
         return self.player_count
 
@@ -158,29 +188,53 @@ class NetworkManager:
     def apply_latency_rules(self) -> bool:
         """Apply current latency rules to all connected clients."""
         if not self._enabled:
-            self.logger.info("Latency control is disabled, skipping latency application")
-            if self.send_command:
-                self.send_command("say Latency control disabled")
-            return True
-
-        try:
-            if not self.ip_latency_map:
-                self.logger.warning("No clients available for latency application")
-                return False
-
-            NetworkUtils.apply_latency_rules(self.ip_latency_map, self.interface)
+            return self._skip_latency_rules()
+        return self._announce_latency_rules(self._shape_traffic(dict(self.ip_latency_map)))
 
-            self.logger.info(f"Applied latency rules to {len(self.ip_latency_map)} clients on interface {self.interface}")
+    async def apply_latency_rules_async(self) -> bool:
+        """
+        Like apply_latency_rules, with the tc/nft calls in a worker thread.
 
-            if self.send_command:
-                self.send_command(f"say Latency rules applied to {len(self.ip_latency_map)} clients")
+        The event loop keeps reading server output meanwhile; the in-game
+        announcement is still sent from the loop.
+        """
+        if not self._enabled:
+            return self._skip_latency_rules()
+        applied = await asyncio.to_thread(self._shape_traffic, dict(self.ip_latency_map))
+        return self._announce_latency_rules(applied)
+
+    def _skip_latency_rules(self) -> bool:
+        self.logger.info("Latency control is disabled, skipping latency application")
+        if self.send_command:
+            self.send_command("say Latency control disabled")
+        return True
+
+    def _shape_traffic(self, ip_latency_map: Dict[str, int]) -> bool:
+        """
+        Install the rules for `ip_latency_map`; safe to call from any thread.
+
+        An empty map (only bots, or no clients yet) has nothing to shape and
+        counts as success; False means the rules could not be installed.
+        """
+        if not ip_latency_map:
+            self.logger.info("No human clients, no latency rules to apply")
+            return True
 
+        try:
+            with self._shaping_lock:
+                self._network_utils.apply_latency_rules(ip_latency_map, self.interface, self.netns)
+            self.logger.info(f"Applied latency rules to {len(ip_latency_map)} clients on interface {self.interface}")
             return True
 
         except Exception as e:
             self.logger.error(f"Error applying latency rules: {e}", exc_info=True)
             return False
 
+    def _announce_latency_rules(self, applied: bool) -> bool:
+        if applied and self.ip_latency_map and self.send_command:
+            self.send_command(f"say Latency rules applied to {len(self.ip_latency_map)} clients")
+        return applied
+
     def rotate_latencies(self) -> bool:
         """Rotate latency assignments for the next round."""
         if not self._enabled:
@@ -208,7 +262,7 @@ class NetworkManager:
     def clear_latency_rules(self) -> bool:
         """Clear all latency rules from the network interface."""
         try:
-            NetworkUtils.dispose(self.interface)
+            self._network_utils.dispose(self.interface, self.netns)
             self.logger.info("Cleared all latency rules from network interface")
 
             if self.send_command:
@@ -221,4 +275,20 @@ class NetworkManager:
             return False
 
     def is_enabled(self) -> bool:
-        return self._enabled
\ No newline at end of file
+        return self._enabled
+
+    def to_snapshot(self) -> dict:
+        """Latency assignments and rotation state, keyed by client IP."""
+        return {
+            "ip_latency_map": dict(self.ip_latency_map),
+            "current_latencies": list(self._current_latencies),
+            "rotation_round": self._round_count,
+        }
+
+    def restore(self, snapshot: dict) -> None:
+        """Restore latency assignments and rotation state written by to_snapshot()."""
+        self.ip_latency_map = dict(snapshot.get("ip_latency_map", self.ip_latency_map))
+        self._current_latencies = list(snapshot.get("current_latencies", self._current_latencies))
+        self._round_count = snapshot.get("rotation_round", self._round_count)
+        for ip in self.ip_latency_map:
+            self.obs_status_map.setdefault(ip, False)
\ No newline at end of file
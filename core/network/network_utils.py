@@ -1,5 +1,16 @@
 import os
 
+import core.utils.settings as settings
+
+
+def get_network_utils(backend: str = None):
+    """Return the latency shaping backend selected by settings.network_backend."""
+    backend = (backend or settings.network_backend).lower()
+    if backend == "netlink":
+        from core.network.netlink_utils import NetlinkNetworkUtils
+        return NetlinkNetworkUtils
+    return NetworkUtils
+
 
 class NetworkUtils:
     """
@@ -8,25 +19,34 @@ class NetworkUtils:
     args:
         ip_latency_map (dict): a dictionary mapping ips to their latency values (in ms).
         interface (str): the network interface to configure (e.g., "enp1s0").
+        netns (str): optional network namespace the interface and nft table live in.
     """
 
     @staticmethod
-    def apply_latency_rules(ip_latency_map, interface):
+    def _prefix(netns=None):
+        if netns:
+            return f"/usr/bin/sudo ip netns exec {netns} "
+        return "/usr/bin/sudo "
+
+    @staticmethod
+    def apply_latency_rules(ip_latency_map, interface, netns=None):
+        sudo = NetworkUtils._prefix(netns)
+
         # clear existing tc rules
         print("clearing existing tc rules...")
-        os.system(f"/usr/bin/sudo /sbin/tc qdisc del dev {interface} root || true")
+        os.system(f"{sudo}/sbin/tc qdisc del dev {interface} root || true")
 
         # create nftables table if it doesn't exist
         print("setting up nftables...")
-        os.system("/usr/bin/sudo nft add table ip netem || true")
+        os.system(f"{sudo}nft add table ip netem || true")
         os.system(
-            "/usr/bin/sudo nft add chain ip netem output '{ type filter hook output priority 0; }' || true"
+            f"{sudo}nft add chain ip netem output '{{ type filter hook output priority 0; }}' || true"
         )
 
         # set up htb qdisc
         print("setting up htb qdisc...")
         os.system(
-            f"/usr/bin/sudo /sbin/tc qdisc add dev {interface} root handle 1: htb default 1"
+            f"{sudo}/sbin/tc qdisc add dev {interface} root handle 1: htb default 1"
         )
 
         for i, (ip, latency) in enumerate(ip_latency_map.items(), start=1):
@@ -37,28 +57,34 @@ class NetworkUtils:
 
             # create a class under htb
             os.system(
-                f"/usr/bin/sudo /sbin/tc class add dev {interface} parent 1: classid {class_id} htb rate 1000mbit"
+                f"{sudo}/sbin/tc class add dev {interface} parent 1: classid {class_id} htb rate 1000mbit"
             )
 
             # apply netem to this class
             os.system(
-                f"/usr/bin/sudo /sbin/tc qdisc add dev {interface} parent {class_id} handle {i + 10}: netem delay {latency}ms"
+                f"{sudo}/sbin/tc qdisc add dev {interface} parent {class_id} handle {i + 10}: netem delay {latency}ms"
             )
 
             # use tc filter to assign marked packets to the correct class
             os.system(
-                f"/usr/bin/sudo /sbin/tc filter add dev {interface} protocol ip parent 1: prio 1 handle {mark_id} fw classid {class_id}"
+                f"{sudo}/sbin/tc filter add dev {interface} protocol ip parent 1: prio 1 handle {mark_id} fw classid {class_id}"
             )
 
             # use nftables to mark packets based on destination ip
             os.system(
-                f"/usr/bin/sudo nft add rule ip netem output ip daddr {ip} meta mark set {mark_id}"
+                f"{sudo}nft add rule ip netem output ip daddr {ip} meta mark set {mark_id}"
             )
 
         print("latency rules applied successfully.")
 
     @staticmethod
-    def dispose(interface):
+    def dispose(interface, netns=None):
+        sudo = NetworkUtils._prefix(netns)
+        if netns:
+            # inside a namespace the qdisc and the netem table belong to this instance only
+            os.system(f"{sudo}/sbin/tc qdisc del dev {interface} root || true")
+            os.system(f"{sudo}nft delete table ip netem || true")
+            return
         os.system(
-            f"/usr/bin/sudo /sbin/tc qdisc replace dev {interface} root pfifo_fast"
+            f"{sudo}/sbin/tc qdisc replace dev {interface} root pfifo_fast"
         )
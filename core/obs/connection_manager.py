@@ -8,6 +8,7 @@ import asyncio
 import logging
 from typing import Callable, Dict, Optional
 
+from core.messaging.events import ClientJoined, ClientLeft, ObsStatusChanged
 from core.obs.manager import OBSManager
 from core.utils.display_utils import DisplayUtils
 
@@ -44,6 +45,22 @@ class OBSConnectionManager:
         self.logger = logging.getLogger(__name__)
 
         self._connection_tasks: Dict[str, asyncio.Task] = {}
+        self.event_bus = None
+
+    def register_handlers(self, event_bus, client_manager) -> None:
+        """Connect/disconnect OBS as human clients come and go, off the parsing path."""
+        self.event_bus = event_bus
+
+        async def on_client_event(event) -> None:
+            if isinstance(event, ClientJoined):
+                if not event.is_bot and event.ip:
+                    await self.connect_single_client_immediately(event.ip, client_manager)
+            elif event.ip and self.is_client_connected(event.ip):
+                await self.disconnect_client(event.ip)
+
+        # One queue for both, so a leave is never handled before its join; unbounded,
+        # since a dropped join or leave would leave an OBS connection open or missing
+        event_bus.subscribe_async((ClientJoined, ClientLeft), on_client_event, name="obs.clients")
 
     async def connect_single_client_immediately(
         self, client_ip: str, client_manager
@@ -67,6 +84,8 @@ class OBSConnectionManager:
             connected = await self.obs_manager.connect_client_obs(client_ip)
 
             client_manager.set_obs_status(client_ip, connected)
+            if self.event_bus:
+                self.event_bus.publish(ObsStatusChanged(client_ip, connected))
 
             if connected:
                 self.logger.info(f"✓ OBS connected for client {client_ip}")
@@ -23,6 +23,7 @@ class OBSWebSocketClient:
         self.password = password
         self.websocket = None
         self.request_id_counter = 0
+        self.last_output_path: Optional[str] = None
         self.logger = logging.getLogger(__name__)
 
     async def connect(self) -> bool:
@@ -159,6 +160,8 @@ class OBSWebSocketClient:
 
     async def start_record(self) -> bool:
         """Start recording in OBS."""
+        # A failed stop must not report the previous round's file
+        self.last_output_path = None
         try:
             await self.send_request("StartRecord")
             self.logger.info("Recording started")
@@ -172,6 +175,7 @@ class OBSWebSocketClient:
         try:
             response = await self.send_request("StopRecord")
             output_path = response.get("outputPath", "Unknown")
+            self.last_output_path = response.get("outputPath")
             self.logger.info(f"Recording stopped - saved to: {output_path}")
             return True
         except Exception as e:
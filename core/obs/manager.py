@@ -176,6 +176,11 @@ class OBSManager:
             self.logger.error(f"Error stopping recording for {client_ip}: {e}")
             return False
 
+    def get_last_recording_path(self, client_ip: str) -> Optional[str]:
+        """Output file of the client's most recently stopped recording, if known."""
+        client = self.obs_clients.get(client_ip)
+        return client.last_output_path if client else None
+
     async def start_all_recordings(self) -> Dict[str, bool]:
         """
         Start recording for all connected OBS instances.
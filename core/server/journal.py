@@ -0,0 +1,142 @@
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class ExperimentJournal:
+    """
+    Append-only JSON-lines journal with periodic snapshots.
+
+    Every record gets a sequence number. Records are written immediately but
+    fsynced in batches (every `fsync_batch` records or `fsync_interval`
+    seconds, whichever comes first), so journaling costs a buffered write per
+    event rather than a disk flush. A snapshot is written atomically
+    (tmp file + fsync + os.replace) and then the journal is truncated, so on
+    start only the snapshot and a short tail need to be read.
+    """
+
+    JOURNAL_FILE = "journal.jsonl"
+    SNAPSHOT_FILE = "snapshot.json"
+
+    def __init__(self, directory: str, fsync_interval: float = 1.0, fsync_batch: int = 64):
+        self.directory = directory
+        self.journal_path = os.path.join(directory, self.JOURNAL_FILE)
+        self.snapshot_path = os.path.join(directory, self.SNAPSHOT_FILE)
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.logger = logging.getLogger(__name__)
+
+        self.seq = 0
+        self.records_since_snapshot = 0
+        self._file = None
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def open(self) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        self._file = open(self.journal_path, "a", encoding="utf-8")
+
+    def close(self) -> None:
+        if self._file:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+    def append(self, kind: str, data: Dict[str, Any]) -> None:
+        """Append one record; it is durable after the next flush()."""
+        if not self._file:
+            return
+
+        self.seq += 1
+        self.records_since_snapshot += 1
+        record = {"seq": self.seq, "t": round(time.time(), 3), "kind": kind, "data": data}
+        self._file.write(json.dumps(record, separators=(",", ":"), default=str) + "\n")
+        self._unsynced += 1
+
+        if self._unsynced >= self.fsync_batch or time.monotonic() - self._last_sync >= self.fsync_interval:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered records to disk and fsync."""
+        if not self._file or not self._unsynced:
+            return
+        try:
+            self._file.flush()
+            os.fsync(self._file.fileno())
+        except OSError as e:
+            self.logger.error(f"Failed to sync journal: {e}")
+            return
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def write_snapshot(self, state: Dict[str, Any]) -> None:
+        """Atomically persist `state` as of the current sequence number, then compact."""
+        if not self._file:
+            return
+
+        self.flush()
+        tmp_path = f"{self.snapshot_path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"seq": self.seq, "t": round(time.time(), 3), "state": state}, f, default=str)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.snapshot_path)
+        except OSError as e:
+            self.logger.error(f"Failed to write journal snapshot: {e}")
+            return
+
+        # Everything up to self.seq is now in the snapshot
+        self._file.close()
+        self._file = open(self.journal_path, "w", encoding="utf-8")
+        self.records_since_snapshot = 0
+        self.logger.debug(f"Journal snapshot written at seq {self.seq}")
+
+    def load(self) -> Tuple[Optional[Dict[str, Any]], List[Dict[str, Any]]]:
+        """Return the latest snapshot state (or None) and the journal records after it."""
+        snapshot_state = None
+        snapshot_seq = 0
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+            snapshot_state = snapshot["state"]
+            snapshot_seq = snapshot["seq"]
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError, KeyError) as e:
+            self.logger.error(f"Ignoring unreadable journal snapshot: {e}")
+
+        tail = []
+        try:
+            with open(self.journal_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        # A torn final write from a crash; everything before it is intact
+                        self.logger.warning("Ignoring truncated journal record")
+                        break
+                    if record["seq"] > snapshot_seq:
+                        tail.append(record)
+        except FileNotFoundError:
+            pass
+
+        self.seq = tail[-1]["seq"] if tail else snapshot_seq
+        return snapshot_state, tail
+
+    def age(self) -> Optional[float]:
+        """Seconds since the journal or snapshot was last written, or None if neither exists."""
+        mtimes = [os.path.getmtime(path) for path in (self.journal_path, self.snapshot_path)
+                  if os.path.exists(path)]
+        return time.time() - max(mtimes) if mtimes else None
+
+    def archive(self) -> None:
+        """Move a finished experiment's files aside so the next run starts fresh."""
+        suffix = time.strftime("%Y%m%d-%H%M%S")
+        for path in (self.journal_path, self.snapshot_path):
+            if os.path.exists(path):
+                os.replace(path, f"{path}.{suffix}")
+        self.seq = 0
+        self.records_since_snapshot = 0
@@ -0,0 +1,261 @@
+import glob
+import gzip
+import logging
+import mmap
+import os
+import queue
+import struct
+import threading
+import time
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+CODEC_GZIP = 1
+CODEC_ZSTD = 2
+CODEC_NAMES = {"gzip": CODEC_GZIP, "zstd": CODEC_ZSTD}
+FILE_EXTENSIONS = {CODEC_GZIP: ".log.gz", CODEC_ZSTD: ".log.zst"}
+
+# Sidecar index: one header, then one fixed-size entry per block
+INDEX_MAGIC = b"OALOGIDX"
+INDEX_VERSION = 1
+INDEX_HEADER = struct.Struct("<8sHHIdd")  # magic, version, codec, reserved, wall start, monotonic start
+INDEX_ENTRY = struct.Struct("<QIIId")     # data offset, compressed size, line count, round, first timestamp
+
+
+class ArchiveBlock(NamedTuple):
+    offset: int
+    size: int
+    line_count: int
+    round: int
+    first_timestamp: float
+
+
+def resolve_codec(requested: str) -> int:
+    """zstd when available (or asked for and available), gzip otherwise."""
+    requested = (requested or "auto").lower()
+    if requested in ("zstd", "auto") and zstandard is None:
+        if requested == "zstd":
+            logging.getLogger(__name__).warning("zstandard not installed, archiving logs with gzip")
+        return CODEC_GZIP
+    return CODEC_ZSTD if requested == "auto" else CODEC_NAMES[requested]
+
+
+def _compress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+
+def _decompress(codec: int, data: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        if zstandard is None:
+            raise RuntimeError("zstandard is required to read .log.zst archives")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+
+class LogArchiveWriter:
+    """
+    Block-compressed archive of the raw server output for one session.
+
+    Lines are stored as "<monotonic seconds>\\t<line>" and collected into
+    blocks of about `block_size` bytes. A block is closed when it is full,
+    older than `flush_interval` seconds, or a new round starts, so every
+    block belongs to exactly one round. Compression and disk writes happen
+    on a background thread; append() only formats the line into the buffer.
+
+    Each block is an independent gzip member / zstd frame, so the data file
+    is also a valid .gz/.zst that standard tools can decompress as a whole.
+    The sidecar .idx file records where each block starts, its round and its
+    first timestamp; LogArchiveReader memory-maps it to jump to a round.
+    """
+
+    def __init__(self, directory: str, compression: str = "auto", block_size: int = 64 * 1024,
+                 flush_interval: float = 5.0):
+        self.directory = directory
+        self.codec = resolve_codec(compression)
+        self.block_size = block_size
+        self.flush_interval = flush_interval
+        self.logger = logging.getLogger(__name__)
+
+        self.path = os.path.join(
+            directory, f"session-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}{FILE_EXTENSIONS[self.codec]}"
+        )
+        self.index_path = f"{self.path}.idx"
+        self.round = 0
+        self.lines_written = 0
+
+        self._buffer: List[str] = []
+        self._buffer_bytes = 0
+        self._block_started = 0.0
+        self._block_first_timestamp = 0.0
+        self._queue: "queue.Queue[Optional[Tuple[bytes, int, int, float]]]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    def open(self) -> None:
+        if self._thread:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        self._thread = threading.Thread(target=self._write_blocks, name="log-archive", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Archiving raw server output to {self.path}")
+
+    def append(self, line: str) -> None:
+        """Buffer one raw output line with the current monotonic time."""
+        if not self._thread:
+            return
+
+        now = time.monotonic()
+        if not self._buffer:
+            self._block_started = now
+            self._block_first_timestamp = now
+        record = f"{now:.6f}\t{line}\n"
+        self._buffer.append(record)
+        self._buffer_bytes += len(record)
+
+        if self._buffer_bytes >= self.block_size or now - self._block_started >= self.flush_interval:
+            self.flush()
+
+    def start_round(self, round_number: int) -> None:
+        """Close the current block so the next lines start a block for this round."""
+        self.flush()
+        self.round = round_number
+
+    def flush(self) -> None:
+        """Hand the buffered lines to the writer thread as one block."""
+        if not self._buffer:
+            return
+        data = "".join(self._buffer).encode("utf-8", errors="replace")
+        self._queue.put((data, len(self._buffer), self.round, self._block_first_timestamp))
+        self.lines_written += len(self._buffer)
+        self._buffer.clear()
+        self._buffer_bytes = 0
+
+    def close(self) -> None:
+        """Write the remaining lines and wait for the writer thread."""
+        if not self._thread:
+            return
+        self.flush()
+        self._queue.put(None)
+        self._thread.join(timeout=10)
+        self._thread = None
+
+    def _write_blocks(self) -> None:
+        try:
+            data_file = open(self.path, "ab")
+            new_index = not os.path.exists(self.index_path)
+            index_file = open(self.index_path, "ab")
+            if new_index:
+                index_file.write(INDEX_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, self.codec, 0,
+                                                   time.time(), time.monotonic()))
+                index_file.flush()
+        except OSError as e:
+            self.logger.error(f"Failed to open log archive {self.path}: {e}")
+            return
+
+        with data_file, index_file:
+            while True:
+                block = self._queue.get()
+                if block is None:
+                    break
+                data, line_count, round_number, first_timestamp = block
+                try:
+                    compressed = _compress(self.codec, data)
+                    offset = data_file.tell()
+                    data_file.write(compressed)
+                    data_file.flush()
+                    # The index entry only goes out once its block is on disk
+                    index_file.write(INDEX_ENTRY.pack(offset, len(compressed), line_count,
+                                                      round_number, first_timestamp))
+                    index_file.flush()
+                except OSError as e:
+                    self.logger.error(f"Failed to write log archive block: {e}")
+
+
+class LogArchiveReader:
+    """Random access to an archive written by LogArchiveWriter."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.index_path = f"{path}.idx"
+
+        with open(self.index_path, "rb") as f:
+            self._index = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.codec, _, self.wall_start, self.monotonic_start = INDEX_HEADER.unpack_from(self._index)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self._index.close()
+            raise ValueError(f"{self.index_path} is not a log archive index")
+
+        # A torn final entry from a crash is ignored
+        self.block_count = (len(self._index) - INDEX_HEADER.size) // INDEX_ENTRY.size
+        self._data = open(path, "rb")
+
+    def close(self) -> None:
+        self._index.close()
+        self._data.close()
+
+    def __enter__(self) -> "LogArchiveReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def block(self, i: int) -> ArchiveBlock:
+        return ArchiveBlock(*INDEX_ENTRY.unpack_from(self._index, INDEX_HEADER.size + i * INDEX_ENTRY.size))
+
+    def rounds(self) -> List[int]:
+        """Round numbers present in the archive, in order."""
+        rounds = []
+        for i in range(self.block_count):
+            round_number = self.block(i).round
+            if not rounds or rounds[-1] != round_number:
+                rounds.append(round_number)
+        return rounds
+
+    def _first_block_of_round(self, round_number: int) -> int:
+        # Rounds only move forward within a session, so the index is sorted by round
+        lo, hi = 0, self.block_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.block(mid).round < round_number:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _read_block(self, block: ArchiveBlock) -> Iterator[Tuple[float, str]]:
+        self._data.seek(block.offset)
+        data = _decompress(self.codec, self._data.read(block.size))
+        for record in data.decode("utf-8", errors="replace").splitlines():
+            timestamp, _, line = record.partition("\t")
+            yield float(timestamp), line
+
+    def read_round(self, round_number: int) -> Iterator[Tuple[float, str]]:
+        """(monotonic timestamp, line) pairs logged during one round."""
+        for i in range(self._first_block_of_round(round_number), self.block_count):
+            block = self.block(i)
+            if block.round != round_number:
+                break
+            yield from self._read_block(block)
+
+    def iter_lines(self, start_round: int = 0) -> Iterator[Tuple[float, str]]:
+        """Every line from `start_round` to the end of the session."""
+        for i in range(self._first_block_of_round(start_round), self.block_count):
+            yield from self._read_block(self.block(i))
+
+    def to_wall_time(self, timestamp: float) -> float:
+        """Convert an archived monotonic timestamp to Unix time."""
+        return self.wall_start + (timestamp - self.monotonic_start)
+
+
+def find_archives(directory: str) -> List[str]:
+    """All session archives under `directory`, including per-instance subdirectories."""
+    return sorted(
+        path for path in glob.glob(os.path.join(directory, "**", "session-*"), recursive=True)
+        if not path.endswith(".idx")
+    )
@@ -0,0 +1,213 @@
+import csv
+import glob
+import logging
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+try:
+    import pyarrow as pa
+    import pyarrow.ipc as pa_ipc
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pa_ipc = None
+    pq = None
+
+
+# Column name -> arrow type name; CSV keeps the same column order
+RESULT_COLUMNS = {
+    "round": "int32",
+    "timestamp": "float64",
+    "map": "string",
+    "client_id": "int32",
+    "name": "string",
+    "ip": "string",
+    "is_bot": "bool",
+    "latency_ms": "int32",
+    "observed_ping_ms": "float64",
+    "latency_ok": "bool",  # observed ping within tolerance of the assigned latency; null if too few samples
+    "score": "int32",
+    "ping": "int32",
+    "kills": "int32",
+    "deaths": "int32",
+    "recording_path": "string",
+    # Seconds the round spent in each game state
+    "waiting_s": "float64",
+    "warmup_s": "float64",
+    "running_s": "float64",
+}
+
+FILE_EXTENSIONS = {"arrow": ".arrows", "parquet": ".parquet", "csv": ".csv"}
+
+
+def resolve_format(requested: str) -> str:
+    """Pick the output format: arrow/parquet need pyarrow, csv always works."""
+    requested = (requested or "auto").lower()
+    if requested in ("arrow", "parquet", "auto") and pa is None:
+        if requested != "auto":
+            logging.getLogger(__name__).warning(f"pyarrow not installed, writing results as CSV instead of {requested}")
+        return "csv"
+    return "arrow" if requested == "auto" else requested
+
+
+class ResultsStore:
+    """
+    Per-round, per-client experiment results written in columnar batches.
+
+    Rows are buffered column-wise in memory and flushed every `batch_size`
+    rows (and at round end / shutdown). With pyarrow each flush is one record
+    batch appended to an Arrow IPC stream (or one Parquet row group); the IPC
+    stream stays readable up to the last complete batch even if the process
+    dies. Without pyarrow rows are appended to a CSV file. Every run writes
+    its own file in `directory`, so read_results() just scans them all.
+    """
+
+    def __init__(self, directory: str, file_format: str = "auto", batch_size: int = 256):
+        self.directory = directory
+        self.format = resolve_format(file_format)
+        self.batch_size = batch_size
+        self.logger = logging.getLogger(__name__)
+
+        self.path = os.path.join(
+            directory, f"results-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}{FILE_EXTENSIONS[self.format]}"
+        )
+        self.rows_written = 0
+        self._columns: Dict[str, List[Any]] = {name: [] for name in RESULT_COLUMNS}
+        self._writer = None
+        self._csv_file = None
+        self._schema = (
+            pa.schema([(name, pa.type_for_alias(type_name)) for name, type_name in RESULT_COLUMNS.items()])
+            if pa is not None else None
+        )
+
+    @property
+    def pending_rows(self) -> int:
+        return len(self._columns["round"])
+
+    def add_row(self, **values: Any) -> None:
+        """Buffer one row; missing columns are stored as null."""
+        for name, column in self._columns.items():
+            column.append(values.get(name))
+        if self.pending_rows >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write buffered rows as one batch."""
+        count = self.pending_rows
+        if not count:
+            return
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if self.format == "csv":
+                self._flush_csv()
+            else:
+                self._flush_arrow()
+        except Exception as e:
+            self.logger.error(f"Failed to write {count} result rows to {self.path}: {e}")
+            return
+
+        self.rows_written += count
+        for column in self._columns.values():
+            column.clear()
+        self.logger.debug(f"Flushed {count} result rows to {self.path}")
+
+    def _flush_arrow(self) -> None:
+        batch = pa.record_batch(
+            [pa.array(self._columns[name], type=self._schema.field(name).type) for name in RESULT_COLUMNS],
+            schema=self._schema,
+        )
+        if self._writer is None:
+            if self.format == "parquet":
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._writer = pa_ipc.new_stream(self.path, self._schema)
+
+        if self.format == "parquet":
+            self._writer.write_table(pa.Table.from_batches([batch]))
+        else:
+            self._writer.write_batch(batch)
+
+    def _flush_csv(self) -> None:
+        if self._csv_file is None:
+            new_file = not os.path.exists(self.path)
+            self._csv_file = open(self.path, "a", newline="", encoding="utf-8")
+            if new_file:
+                csv.writer(self._csv_file).writerow(RESULT_COLUMNS)
+
+        csv.writer(self._csv_file).writerows(zip(*(self._columns[name] for name in RESULT_COLUMNS)))
+        self._csv_file.flush()
+
+    def close(self) -> None:
+        """Flush remaining rows and finalise the file."""
+        self.flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+        if self._csv_file is not None:
+            self._csv_file.close()
+            self._csv_file = None
+
+
+def _read_csv(path: str) -> Dict[str, List[Any]]:
+    casts = {
+        "int32": int,
+        "float64": float,
+        "bool": lambda value: value == "True",
+        "string": str,
+    }
+    columns: Dict[str, List[Any]] = {name: [] for name in RESULT_COLUMNS}
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            for name, type_name in RESULT_COLUMNS.items():
+                value = row.get(name, "")
+                columns[name].append(casts[type_name](value) if value != "" else None)
+    return columns
+
+
+def read_results_file(path: str) -> Optional[Dict[str, List[Any]]]:
+    """
+    Load one results file into a dict of columns.
+
+    Returns None for files that cannot be read here (Arrow/Parquet without
+    pyarrow). A truncated Arrow stream yields the batches written before the crash.
+    """
+    if path.endswith(".csv"):
+        return _read_csv(path)
+    if pa is None:
+        logging.getLogger(__name__).warning(f"Skipping {path}: pyarrow not installed")
+        return None
+    if path.endswith(".parquet"):
+        return pq.read_table(path).to_pydict()
+
+    batches = []
+    try:
+        with pa.memory_map(path) as source:
+            for batch in pa_ipc.open_stream(source):
+                batches.append(batch)
+    except pa.ArrowInvalid:
+        pass
+    if not batches:
+        return None
+    return pa.Table.from_batches(batches).to_pydict()
+
+
+def find_results_files(directory: str) -> List[str]:
+    """All results files under `directory`, including per-instance subdirectories."""
+    return sorted(glob.glob(os.path.join(directory, "**", "results-*"), recursive=True))
+
+
+def read_results(directory: str) -> Dict[str, List[Any]]:
+    """Load every results file under `directory` into a dict of columns."""
+    columns: Dict[str, List[Any]] = {name: [] for name in RESULT_COLUMNS}
+
+    for path in find_results_files(directory):
+        part = read_results_file(path)
+        if not part:
+            continue
+        row_count = len(part["round"])
+        for name in RESULT_COLUMNS:
+            columns[name].extend(part.get(name) or [None] * row_count)
+
+    return columns
@@ -0,0 +1,214 @@
+"""
+Round transitions as concurrent steps with deadlines, retries and timings.
+
+A ShutdownGame line triggers a handful of side effects (OBS recording,
+traffic shaping, game commands) that don't depend on each other. The
+pipeline starts them together on the event loop, gives each one a deadline
+and a number of retries, and reports how long the transition took from
+the triggering line until its last step finished ("armed").
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+
+@dataclass
+class TransitionStep:
+    """One side effect of a round transition."""
+    name: str
+    # Called once per attempt; a result of False counts as a failed attempt
+    action: Callable[[], Awaitable[Any]]
+    deadline: float
+    retries: int = 0
+    # Steps that must have finished (successfully or not) before this one starts
+    after: Tuple[str, ...] = ()
+
+
+@dataclass
+class StepResult:
+    name: str
+    ok: bool
+    attempts: int
+    started_ms: float  # since the triggering line
+    elapsed_ms: float
+    error: Optional[str] = None
+    result: Any = None
+
+
+@dataclass
+class TransitionReport:
+    kind: str
+    round: int
+    armed_ms: float  # triggering line to last step finished
+    steps: List[StepResult] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return all(step.ok for step in self.steps)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "kind": self.kind,
+            "round": self.round,
+            "ok": self.ok,
+            "armed_ms": round(self.armed_ms, 1),
+            "steps": [
+                {
+                    "name": step.name,
+                    "ok": step.ok,
+                    "attempts": step.attempts,
+                    "started_ms": round(step.started_ms, 1),
+                    "elapsed_ms": round(step.elapsed_ms, 1),
+                    "error": step.error,
+                }
+                for step in self.steps
+            ],
+        }
+
+
+class Transition:
+    """
+    A transition in flight: one task per step, and `finished` resolving to the report.
+
+    Steps can be added until the transition has finished.
+    """
+
+    def __init__(self, pipeline: "RoundTransitionPipeline", kind: str, round_number: int, started: float,
+                 loop: asyncio.AbstractEventLoop):
+        self.pipeline = pipeline
+        self.kind = kind
+        self.round = round_number
+        self.started = started
+        self.loop = loop
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self.finished: Optional[asyncio.Task] = None
+
+    def add(self, step: TransitionStep) -> asyncio.Task:
+        """Start `step` now, once the steps it runs after have finished."""
+        if self.finished is not None and self.finished.done():
+            raise RuntimeError(f"Transition {self.kind} has already finished")
+        if step.name in self.tasks:
+            raise ValueError(f"Duplicate transition step {step.name}")
+        unknown = [name for name in step.after if name not in self.tasks]
+        if unknown:
+            raise ValueError(f"Step {step.name} runs after unknown steps: {', '.join(unknown)}")
+        dependencies = [self.tasks[name] for name in step.after]
+        task = self.loop.create_task(self.pipeline._run_step(step, dependencies, self.started))
+        self.tasks[step.name] = task
+        return task
+
+    def step(self, name: str) -> Optional[asyncio.Task]:
+        return self.tasks.get(name)
+
+
+class RoundTransitionPipeline:
+    """
+    Runs the steps of each round transition concurrently.
+
+    A step is retried after an exception, a False result or a missed
+    deadline, up to its `retries`. Blocking work belongs in
+    asyncio.to_thread inside the step; note that a deadline only abandons
+    the thread, so such steps must tolerate a late first attempt.
+    """
+
+    def __init__(self, on_report: Optional[Callable[[TransitionReport], None]] = None,
+                 retry_delay: float = 0.1, history: int = 50):
+        self.on_report = on_report
+        self.retry_delay = retry_delay
+        self.history: Deque[TransitionReport] = deque(maxlen=history)
+        self.logger = logging.getLogger(__name__)
+
+    def start(self, kind: str, round_number: int, steps: List[TransitionStep],
+              loop: Optional[asyncio.AbstractEventLoop] = None, started: Optional[float] = None) -> Transition:
+        """
+        Schedule every step on `loop` (the running loop by default) and return at once.
+
+        `started` is the time.monotonic() of the triggering line; timings
+        are measured from it.
+        """
+        loop = loop or asyncio.get_running_loop()
+        transition = Transition(self, kind, round_number, time.monotonic() if started is None else started, loop)
+        for step in steps:
+            transition.add(step)
+        transition.finished = loop.create_task(self._finish(transition))
+        return transition
+
+    async def run(self, kind: str, round_number: int, steps: List[TransitionStep],
+                  started: Optional[float] = None) -> TransitionReport:
+        """Run a transition to completion."""
+        return await self.start(kind, round_number, steps, started=started).finished
+
+    async def _run_step(self, step: TransitionStep, dependencies: List[asyncio.Task], started: float) -> StepResult:
+        if dependencies:
+            await asyncio.wait(dependencies)
+
+        step_started = time.monotonic()
+        error = None
+        attempts = 0
+        while attempts <= step.retries:
+            attempts += 1
+            try:
+                result = await asyncio.wait_for(step.action(), timeout=step.deadline)
+            except asyncio.TimeoutError:
+                error = f"no result within {step.deadline:.1f}s"
+            except Exception as e:
+                error = str(e) or type(e).__name__
+            else:
+                if result is not False:
+                    return StepResult(step.name, True, attempts, (step_started - started) * 1000,
+                                      (time.monotonic() - step_started) * 1000, result=result)
+                error = "step reported failure"
+
+            self.logger.warning(f"Transition step {step.name} attempt {attempts}/{step.retries + 1} failed: {error}")
+            if attempts <= step.retries:
+                await asyncio.sleep(self.retry_delay)
+
+        return StepResult(step.name, False, attempts, (step_started - started) * 1000,
+                          (time.monotonic() - step_started) * 1000, error=error)
+
+    async def _finish(self, transition: Transition) -> TransitionReport:
+        # Steps may be added while others run
+        while True:
+            pending = [task for task in transition.tasks.values() if not task.done()]
+            if not pending:
+                break
+            await asyncio.wait(pending)
+        steps = [task.result() for task in transition.tasks.values()]
+        report = TransitionReport(transition.kind, transition.round,
+                                  (time.monotonic() - transition.started) * 1000, steps)
+        self.history.append(report)
+
+        breakdown = ", ".join(
+            f"{step.name} {step.elapsed_ms:.0f}ms"
+            + (f" ({step.attempts} attempts)" if step.attempts > 1 else "")
+            + ("" if step.ok else f" FAILED: {step.error}")
+            for step in steps
+        )
+        log = self.logger.info if report.ok else self.logger.warning
+        log(f"Round {report.round} {report.kind} armed in {report.armed_ms:.0f}ms: {breakdown}")
+
+        if self.on_report:
+            try:
+                self.on_report(report)
+            except Exception as e:
+                self.logger.error(f"Error handling transition report: {e}", exc_info=True)
+        return report
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Armed times per transition kind over the recent history, and the last report."""
+        by_kind: Dict[str, List[float]] = {}
+        for report in self.history:
+            by_kind.setdefault(report.kind, []).append(report.armed_ms)
+        return {
+            "transitions": len(self.history),
+            "armed_ms": {
+                kind: {"last": round(times[-1], 1), "mean": round(sum(times) / len(times), 1),
+                       "max": round(max(times), 1)}
+                for kind, times in by_kind.items()
+            },
+            "last": self.history[-1].to_dict() if self.history else None,
+        }
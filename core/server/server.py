@@ -1,18 +1,29 @@
 import asyncio
 import logging
-import subprocess
 import threading
 import time
-from subprocess import PIPE, Popen
-from typing import Optional
+from typing import Dict, List, Optional, Set
 
 import core.utils.settings as settings
+from core.adapters.base import GameAdapterConfig
+from core.adapters.openarena.adapter import OAGameAdapter
+from core.adapters.openarena.query_client import Q3QueryClient, ServerStatus
+from core.game.combat_stats import CombatStatsAggregator
 from core.game.game_manager import GameManager
-from core.game.state_manager import GameStateManager
+from core.game.state_manager import GameState, GameStateManager
+from core.messaging.event_bus import EventBus
+from core.messaging.events import ClientJoined, ClientLeft, ExperimentFinished, RoundEnded, RoundStarted, ServerRestarted
 from core.messaging.message_processor import MessageProcessor, MessageType
+from core.network.latency_verifier import LatencyVerifier
+from core.network.namespace import NetworkNamespace
 from core.network.network_manager import NetworkManager
 from core.obs.connection_manager import OBSConnectionManager
+from core.server.journal import ExperimentJournal
+from core.server.log_archive import LogArchiveWriter
+from core.server.results_store import ResultsStore
+from core.server.round_pipeline import RoundTransitionPipeline, Transition, TransitionReport, TransitionStep
 from core.server.shutdown_strategies import MatchShutdownStrategy, WarmupShutdownStrategy
+from core.server.watchdog import ServerWatchdog
 from core.utils.display_utils import DisplayUtils
 
 
@@ -21,29 +32,102 @@ class Server:
     Refactored OpenArena server management with separated concerns.
 
     This class now focuses solely on:
-    - Server process management
+    - Server process management (through OAGameAdapter)
     - Message processing coordination
     - Component integration
+
+    Everything runs on a single asyncio event loop: the stderr reader,
+    message handlers, OBS operations and bot addition.
     """
 
-    def __init__(self):
+    def __init__(self, netns: Optional[NetworkNamespace] = None,
+                 adapter_config: Optional[GameAdapterConfig] = None,
+                 journal_dir: Optional[str] = None,
+                 results_dir: Optional[str] = None,
+                 log_archive_dir: Optional[str] = None):
         """Initialize server with all specialized managers."""
         self.logger = logging.getLogger(__name__)
+        self.netns = netns if netns is not None else NetworkNamespace.from_settings()
         self.nplayers_threshold = settings.nplayers_threshold
         self._output_handler = None
 
-        self._process: Optional[Popen] = None
+        if adapter_config is None:
+            adapter_config = GameAdapterConfig(
+                game_type="openarena",
+                port=settings.oa_port,
+                binary_path=settings.oa_binary_path,
+                max_clients=settings.oa_max_clients,
+                homepath=settings.oa_homepath,
+                server_config=settings.oa_server_configs[0],
+            )
+        if self.netns and not adapter_config.exec_prefix:
+            adapter_config.exec_prefix = self.netns.exec_prefix
+        self.adapter = OAGameAdapter(adapter_config)
         self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._sampling_task: Optional[asyncio.Task] = None
         self._shutdown_event = threading.Event()
+        self.last_output_time = time.monotonic()
+        self.query_client = Q3QueryClient(timeout=settings.query_timeout)
+        self.watchdog = (
+            ServerWatchdog(self, probe=self._query_probe if settings.query_probe_enable else None)
+            if settings.watchdog_enable else None
+        )
         self.insufficient_humans = False
+        self.experiment_finished = False
+        self.event_bus = EventBus()
         self._current_map = ""
 
+        self.journal = (
+            ExperimentJournal(
+                journal_dir or settings.journal_dir,
+                fsync_interval=settings.journal_fsync_interval,
+                fsync_batch=settings.journal_fsync_batch,
+            )
+            if settings.journal_enable else None
+        )
+        self._journaled_state: Dict[str, dict] = {}
+
+        self.results_store = (
+            ResultsStore(
+                results_dir or settings.results_dir,
+                file_format=settings.results_format,
+                batch_size=settings.results_batch_size,
+            )
+            if settings.results_enable else None
+        )
+        self._last_status_clients: Dict[int, dict] = {}
+        # Resolves to the clients in the status reply requested when the match ended
+        self._final_status: Optional[asyncio.Future] = None
+        self._pending_results: Optional[asyncio.Task] = None
+
+        self.log_archive = (
+            LogArchiveWriter(
+                log_archive_dir or settings.log_archive_dir,
+                compression=settings.log_archive_compression,
+                block_size=settings.log_archive_block_size,
+                flush_interval=settings.log_archive_flush_interval,
+            )
+            if settings.log_archive_enable else None
+        )
+
         self.network_manager = NetworkManager(
-            interface=settings.interface, send_command_callback=self.send_command
+            interface=self.netns.interface if self.netns else settings.interface,
+            send_command_callback=self.send_command,
+            netns=self.netns.name if self.netns else None,
         )
         self.game_manager = GameManager(send_command_callback=self.send_command)
         self.game_state_manager = GameStateManager(self.send_command)
-        self.message_processor = MessageProcessor(self.send_command)
+        self.message_processor = MessageProcessor(self.send_command, self.event_bus)
+        self.latency_verifier = LatencyVerifier(
+            self.network_manager,
+            tolerance_ms=settings.latency_tolerance_ms,
+            min_samples=settings.latency_min_samples,
+            send_command_callback=self.send_command,
+            event_bus=self.event_bus,
+            announce=settings.latency_announce,
+        )
+        self.combat_stats = CombatStatsAggregator()
         self.display_utils = DisplayUtils()
 
         self.obs_connection_manager = OBSConnectionManager(
@@ -53,6 +137,7 @@ class Server:
             send_command_callback=self.send_command,
         )
 
+        self.transitions = RoundTransitionPipeline(on_report=self._on_transition_report)
         self._shutdown_strategies = {
             "match_end": MatchShutdownStrategy(),
             "warmup_end": WarmupShutdownStrategy(),
@@ -68,68 +153,301 @@ class Server:
             MessageType.SHUTDOWN_GAME: self._on_shutdown,
             MessageType.STATUS_LINE: self._on_status,
         }
-
-    def start_server(self):
-        """Start the OpenArena dedicated server process."""
-        self.logger.info("Starting OpenArena server process")
-
-        startup_config = self.game_manager.apply_startup_config()
-
-        server_args = [
-            "oa_ded",
-            "+set",
-            "dedicated",
-            "1",
-            "+set",
-            "net_port",
-            "27960",
-            "+set",
-            "com_legacyprotocol",
-            "71",
-            "+set",
-            "com_protocol",
-            "71",
-            "+set"
-            "sv_pure", "0"
-            "+set",
-            "sv_master1",
-            "dpmaster.deathmask.net",
-            "+set",
-            "sv_maxclients", "4"
-            "+set",
-            "cl_motd",
-            "Welcome To ASTRID lab",
-        ]
-
-        for key, value in startup_config.items():
-            server_args.extend(["+set", key, value])
-
-        server_args.extend(["+exec", "t_server.cfg"])
-
-        self._process = Popen(
-            server_args,
-            stdout=PIPE,
-            stdin=PIPE,
-            stderr=PIPE,
-            universal_newlines=False,
-        )
+        self._register_event_handlers()
+
+    def _register_event_handlers(self):
+        """
+        Wire components to the event bus. Sync subscribers run in this order,
+        so managers update their state before the server's handlers react and
+        the journal records the result last.
+        """
+        bus = self.event_bus
+        self.network_manager.register_handlers(bus)
+        self.game_state_manager.register_handlers(bus)
+        self.combat_stats.register_handlers(bus)
+        self.obs_connection_manager.register_handlers(bus, self.network_manager)
+
+        for message_type, handler in self.message_handlers.items():
+            bus.subscribe(message_type, handler)
+        bus.subscribe(RoundEnded, self._on_round_ended)
+
+        if self.log_archive:
+            bus.subscribe(RoundStarted, lambda event: self.log_archive.start_round(event.round),
+                          name="LogArchiveWriter.start_round")
+            # The intermission and warmup before a match are archived with it
+            bus.subscribe(RoundEnded, lambda event: self.log_archive.start_round(event.round + 1),
+                          name="LogArchiveWriter.next_round")
+
+        if self.journal:
+            bus.subscribe(tuple(self.message_handlers), self._journal_message)
+
+    async def start_server(self) -> bool:
+        """Start the OpenArena dedicated server process on the running loop."""
+        self._async_loop = asyncio.get_running_loop()
+        # A server stopped with request_stop() can be started again
+        self._shutdown_event.clear()
+
+        if self.journal and self._resume_from_journal():
+            self.run_async(self._flush_journal_periodically())
+
+        if self.log_archive:
+            self.log_archive.open()
+            self.log_archive.start_round(self.game_state_manager.round_count)
+            self.run_async(self._flush_log_archive_periodically())
+
+        if self.netns and not self.netns.is_created():
+            if not self.netns.create():
+                raise RuntimeError(f"Could not create network namespace {self.netns.name}")
+
+        if not await self.adapter.connect():
+            return False
 
         self._initialize_server()
+        return True
 
     def _initialize_server(self):
         """Initialize server with bot and game settings."""
+        self.last_output_time = time.monotonic()
         self.game_manager.initialize_bot_settings(self.nplayers_threshold)
         self.game_manager.apply_default_config()
+        if self._sampling_task is None:
+            self._sampling_task = self.run_async(
+                self.latency_verifier.run_sampling(
+                    is_active=self._is_match_running,
+                    interval=settings.latency_verify_interval,
+                    is_shutdown=self.is_shutdown_requested,
+                )
+            )
 
-    def send_command(self, command: str):
-        """Send a command to the server's stdin."""
-        if self._process and self._process.poll() is None:
+    def _journal_snapshot_state(self) -> dict:
+        return {
+            "game": self.game_state_manager.to_snapshot(),
+            "network": self.network_manager.to_snapshot(),
+            "experiment_finished": self.experiment_finished,
+        }
+
+    def _resume_from_journal(self) -> bool:
+        """
+        Restore round progression and latency rotation from the journal.
+
+        Loads the latest snapshot, replays the component states recorded after
+        it, and compacts everything into a fresh snapshot. A journal older than
+        JOURNAL_STALE_AFTER is archived instead unless JOURNAL_RESUME_STALE is
+        set. Returns False if the journal was already open.
+        """
+        if self.journal.seq or self.journal.records_since_snapshot:
+            return False
+
+        age = self.journal.age()
+        if age is not None and age > settings.journal_stale_after:
+            if settings.journal_resume_stale:
+                self.logger.warning(
+                    f"Resuming from a journal last written {age / 3600:.1f}h ago in {self.journal.directory} "
+                    f"(JOURNAL_RESUME_STALE is set)"
+                )
+            else:
+                self.logger.warning(
+                    f"Journal in {self.journal.directory} was last written {age / 3600:.1f}h ago; archiving it "
+                    f"and starting a new experiment. Set JOURNAL_RESUME_STALE=true to resume it instead"
+                )
+                self.journal.archive()
+
+        started = time.perf_counter()
+        state, tail = self.journal.load()
+        for record in tail:
+            if record["kind"] in ("game", "network"):
+                state = state or {}
+                state[record["kind"]] = record["data"]
+            elif record["kind"] == "experiment_finished":
+                state = state or {}
+                state["experiment_finished"] = True
+
+        if state and state.get("experiment_finished"):
+            self.logger.info("Previous experiment finished; archiving its journal")
+            self.journal.archive()
+            state = None
+
+        if state:
+            self.game_state_manager.restore(state.get("game", {}))
+            self.network_manager.restore(state.get("network", {}))
+            # The game server process is new, so the round has to be played from the start
+            self.game_state_manager.reset(GameState.WAITING)
+            self.logger.info(
+                f"Resumed experiment at round {self.game_state_manager.round_count}/"
+                f"{self.game_state_manager.max_rounds} with {len(self.network_manager.ip_latency_map)} "
+                f"latency assignments ({len(tail)} journal records replayed in "
+                f"{(time.perf_counter() - started) * 1000:.1f}ms)"
+            )
+
+        self.journal.open()
+        self._journaled_state = self._journal_snapshot_state()
+        self.journal.write_snapshot(self._journaled_state)
+        return True
+
+    def _journal_message(self, parsed):
+        """Record a handled event and any component state it changed."""
+        if parsed.message_type != MessageType.STATUS_LINE:
+            self.journal.append("event", {"type": parsed.message_type.name, "data": parsed.data})
+
+        for component, snapshot in (
+            ("game", self.game_state_manager.to_snapshot()),
+            ("network", self.network_manager.to_snapshot()),
+        ):
+            if snapshot != self._journaled_state.get(component):
+                self._journaled_state[component] = snapshot
+                self.journal.append(component, snapshot)
+
+        if self.journal.records_since_snapshot >= settings.journal_snapshot_every:
+            self.journal.write_snapshot(self._journal_snapshot_state())
+
+    async def _flush_journal_periodically(self):
+        while not self.is_shutdown_requested():
+            await asyncio.sleep(settings.journal_fsync_interval)
+            self.journal.flush()
+
+    async def _flush_log_archive_periodically(self):
+        # Lines only close a block when the next one arrives; don't let a quiet server hold them back
+        while not self.is_shutdown_requested():
+            await asyncio.sleep(settings.log_archive_flush_interval)
+            self.log_archive.flush()
+
+    def _on_round_ended(self, event: RoundEnded):
+        self.record_round_results(event.latency_summary, event.combat, event.recording)
+
+    def record_round_results(self, latency_summary: dict, combat_snapshot: Optional[dict] = None,
+                             recording_task=None):
+        """
+        Store one results row per client for the round that just ended.
+
+        Scores and pings come from the status reply requested when the match
+        ended (the periodic status can be several seconds old by then); the
+        recording paths are filled in once OBS has stopped recording.
+        """
+        # Cleared once the reply arrives, so None here means _last_status_clients is already fresh
+        final_status = self._final_status
+        if not self.results_store:
+            return
+
+        evaluations = {client["ip"]: client for client in latency_summary.get("clients", [])}
+        combat = (combat_snapshot or {}).get("clients", {})
+        round_number = self.game_state_manager.round_count
+        dwell = self.game_state_manager.get_round_dwell()
+        timestamp = time.time()
+        current_map = self._current_map
+        # Latencies rotate for the next round before the rows are built
+        latency_map = dict(self.network_manager.ip_latency_map)
+
+        def build_rows(clients: Dict[int, dict]) -> List[dict]:
+            rows = []
+            for client in clients.values():
+                ip = None if client["type"] == "BOT" else client["ip"]
+                rows.append({
+                    "round": round_number,
+                    "timestamp": timestamp,
+                    "map": current_map,
+                    "client_id": client["client_id"],
+                    "name": client["name"],
+                    "ip": ip,
+                    "is_bot": ip is None,
+                    "latency_ms": latency_map.get(ip) if ip else None,
+                    "observed_ping_ms": evaluations.get(ip, {}).get("observed_ms"),
+                    "latency_ok": evaluations.get(ip, {}).get("within_tolerance"),
+                    "score": client["score"],
+                    "ping": client["ping"],
+                    "kills": combat.get(client["client_id"], {}).get("kills"),
+                    "deaths": combat.get(client["client_id"], {}).get("deaths"),
+                    "waiting_s": dwell["waiting"],
+                    "warmup_s": dwell["warmup"],
+                    "running_s": dwell["running"],
+                })
+            return rows
+
+        if final_status is None and recording_task is None:
+            self._store_round_results(build_rows(self._last_status_clients))
+        else:
+            self._pending_results = self.run_async(
+                self._store_round_results_after(build_rows, final_status, recording_task)
+            )
+
+    async def _store_round_results_after(self, build_rows, final_status, recording_task):
+        clients = self._last_status_clients
+        if final_status is not None:
             try:
-                self.logger.debug(f"CMD_SEND: {command}")
-                self._process.stdin.write(f"{command}\r\n".encode())
-                self._process.stdin.flush()
-            except (BrokenPipeError, OSError) as e:
-                self.logger.error(f"Failed to send command: {e}")
+                clients = await asyncio.wait_for(final_status, timeout=settings.transition_command_deadline)
+            except asyncio.TimeoutError:
+                self.logger.warning("No status reply after the match ended, storing results from the last status")
+                clients = self._last_status_clients
+        rows = build_rows(clients)
+
+        if recording_task is not None:
+            try:
+                await asyncio.wait_for(asyncio.shield(recording_task), timeout=15)
+            except Exception as e:
+                self.logger.warning(f"Recording stop did not complete cleanly: {e!r}")
+
+            obs_manager = self.obs_connection_manager.obs_manager
+            for row in rows:
+                if row["ip"]:
+                    row["recording_path"] = obs_manager.get_last_recording_path(row["ip"])
+        self._store_round_results(rows)
+
+    def _store_round_results(self, rows):
+        for row in rows:
+            self.results_store.add_row(**row)
+        # One batch per round keeps the file current without per-row writes
+        self.results_store.flush()
+        self.logger.info(f"Stored {len(rows)} result rows for round {rows[0]['round'] if rows else '?'}")
+
+    def finish_experiment(self):
+        """Stop the game server for good once the last round is over."""
+        self.experiment_finished = True
+        self.event_bus.publish(ExperimentFinished(self.game_state_manager.round_count))
+        if self.journal:
+            self.journal.append("experiment_finished", {"round": self.game_state_manager.round_count})
+            self.journal.write_snapshot(self._journal_snapshot_state())
+        self.request_stop()
+
+    def request_stop(self):
+        """Stop oa_ded on purpose: the watchdog sees a requested shutdown, not a crash to restart."""
+        self._shutdown_event.set()
+        self.send_command("killserver")
+        self.logger.info("Sent killserver command to stop the server")
+
+    async def restart_server(self, stop_timeout: float = 5.0) -> bool:
+        """
+        Warm restart after a crash or hang: same port and config, same namespace.
+
+        Latency assignments and the round state are kept in memory, so the
+        current round's rules are re-applied straight away and returning
+        clients get their previous latency. Slot numbers are forgotten because
+        clients are rediscovered from status output, and bots are re-added.
+        """
+        await self.adapter.disconnect(timeout=stop_timeout)
+        if self.is_shutdown_requested():
+            return False
+
+        if not await self.adapter.connect():
+            return False
+        if not await self.wait_until_ready(settings.query_ready_timeout):
+            self.logger.warning("Restarted server is not answering queries yet")
+
+        self.network_manager.forget_slots()
+        self._initialize_server()
+        self.event_bus.publish(ServerRestarted(self.watchdog.restart_count if self.watchdog else 0))
+
+        if self.network_manager.is_enabled() and self.network_manager.ip_latency_map:
+            await self.network_manager.apply_latency_rules_async()
+
+        self.game_manager.reset_bot_state()
+        if self.game_manager.should_add_bots():
+            self.run_async(self.game_manager.add_bots_to_server_async())
+
+        self.send_command("status")
+        return True
+
+    def send_command(self, command: str) -> bool:
+        """Send a command to the server's stdin."""
+        return self.adapter.send_command_sync(command)
 
     def kick_client(self, client_id: int):
         """Kick a client by their slot number (client_id)."""
@@ -139,35 +457,58 @@ class Server:
             self.send_command(f"clientkick {client_id}")
             self.logger.info(f"Kicked {client_type} client {client_id} ({client_name})")
 
-            time.sleep(0.5)
-            self.send_command(f"status")
+            if self._async_loop:
+                self._async_loop.call_later(0.5, self.send_command, "status")
+            else:
+                self.send_command("status")
         else:
             self.logger.warning(f"Cannot kick client {client_id}: client not found")
 
-    def read_server(self) -> str:
-        """Read a message from the server's stderr."""
-        try:
-            return (
-                self._process.stderr.readline().decode("utf-8", errors="replace").rstrip()
-            )
-        except (OSError, ValueError) as e:
-            self.logger.error(f"Failed to read from server: {e}")
-            return ""
-
     def dispose(self):
+        """Stop the server without waiting; prefer `await shutdown()` on the loop."""
+        self._shutdown_event.set()
+        self.game_manager.reset_bot_state()
+        self.adapter.stop_server()
+        self.event_bus.close()
+        if self.journal:
+            # Records not yet fsynced would be lost on exit
+            self.journal.close()
+        if self.log_archive:
+            self.log_archive.close()
+        if self.results_store:
+            # Nothing to wait on without the loop; a late write would reopen the finished file
+            if self._pending_results and not self._pending_results.done():
+                self.logger.warning("Round results still waiting for OBS; dropping them on dispose")
+                self._pending_results.cancel()
+            # Writes the Parquet footer; without it the file is unreadable
+            self.results_store.close()
+
+        if self.netns and self.netns.is_created():
+            self.netns.destroy()
+
+    async def shutdown(self):
+        """Stop the server process, release OBS connections and tear down the namespace."""
         self._shutdown_event.set()
         self.game_manager.reset_bot_state()
 
-        if self._process and self._process.poll() is None:
-            self._process.terminate()
-            try:
-                self._process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self._process.kill()
-                self._process.wait()
-
-    def set_async_loop(self, loop: asyncio.AbstractEventLoop):
-        self._async_loop = loop
+        self.event_bus.close()
+        await self.cleanup_obs_async()
+        await self.adapter.disconnect()
+        self.query_client.close()
+        if self.journal:
+            self.journal.close()
+        if self.log_archive:
+            self.log_archive.close()
+        if self.results_store:
+            if self._pending_results and not self._pending_results.done():
+                try:
+                    await asyncio.wait_for(asyncio.shield(self._pending_results), timeout=5)
+                except asyncio.TimeoutError:
+                    self.logger.warning("Round results still waiting for OBS; writing without recording paths")
+            self.results_store.close()
+
+        if self.netns and self.netns.is_created():
+            self.netns.destroy()
 
     def set_output_handler(self, handler):
         self._output_handler = handler
@@ -176,24 +517,101 @@ class Server:
         await self.obs_connection_manager.cleanup_all()
 
     def run_async(self, coro):
-        if self._async_loop and not self._shutdown_event.is_set():
-            asyncio.run_coroutine_threadsafe(coro, self._async_loop)
+        """Schedule a coroutine on the server's event loop."""
+        if not self._async_loop or self._shutdown_event.is_set():
+            coro.close()
+            return None
+
+        try:
+            running_loop = asyncio.get_running_loop()
+        except RuntimeError:
+            running_loop = None
+
+        if running_loop is self._async_loop:
+            task = running_loop.create_task(coro)
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+            return task
+
+        # Caller is on another thread (e.g. a UI worker)
+        return asyncio.run_coroutine_threadsafe(coro, self._async_loop)
+
+    def run_transition(self, kind: str, steps: List[TransitionStep]) -> Optional[Transition]:
+        """
+        Start a round transition's steps on the event loop.
+
+        Timings run from the server line that triggered it. Returns None
+        once shutdown has been requested.
+        """
+        if not self._async_loop or self._shutdown_event.is_set():
+            return None
+        transition = self.transitions.start(kind, self.game_state_manager.round_count, steps,
+                                            loop=self._async_loop, started=self.last_output_time)
+        self._tasks.add(transition.finished)
+        transition.finished.add_done_callback(self._tasks.discard)
+        return transition
+
+    def _on_transition_report(self, report: TransitionReport):
+        if self.journal:
+            self.journal.append("transition", report.to_dict())
 
     def is_shutdown_requested(self):
         """Check if shutdown has been requested."""
         return self._shutdown_event.is_set()
 
+    def _is_match_running(self) -> bool:
+        return self.game_state_manager.get_current_state() == GameState.RUNNING
+
     def is_running(self):
-        """Check if server process is running (thread-safe)."""
-        return self._process is not None and self._process.poll() is None
+        """Check if server process is running."""
+        return self.adapter.is_connected
+
+    @property
+    def query_address(self) -> str:
+        """Address the server answers UDP queries on from this host."""
+        return self.netns.ns_address if self.netns else "127.0.0.1"
+
+    async def query_status(self) -> Optional[ServerStatus]:
+        """Roster and cvars over the UDP query protocol, without touching the console."""
+        return await self.query_client.get_status(self.query_address, self.adapter.config.port)
+
+    async def wait_until_ready(self, timeout: float) -> bool:
+        """Wait until the server process answers getinfo, or `timeout` expires."""
+        deadline = time.monotonic() + timeout
+        while self.is_running() and time.monotonic() < deadline:
+            if await self.query_client.is_alive(self.query_address, self.adapter.config.port):
+                return True
+            await asyncio.sleep(0.2)
+        return False
+
+    async def _query_probe(self) -> bool:
+        return await self.query_client.is_alive(
+            self.query_address, self.adapter.config.port, timeout=settings.watchdog_probe_timeout
+        )
 
-    def process_server_message(self, raw_message: str):
-        """Process server message using dispatch dictionary."""
-        parsed = self.message_processor.process_message(raw_message)
+    def get_status(self) -> dict:
+        """Snapshot of process, game and client state for monitoring."""
+        round_info = self.game_state_manager.get_round_info()
+        return {
+            "running": self.is_running(),
+            "pid": self.adapter.pid,
+            "port": self.adapter.config.port,
+            "map": self._current_map,
+            "state": round_info["state"],
+            "round": round_info["current_round"],
+            "max_rounds": round_info["max_rounds"],
+            "humans": self.network_manager.get_human_count(),
+            "bots": self.network_manager.get_bot_count(),
+            "netns": self.netns.name if self.netns else None,
+            "restarts": self.watchdog.restart_count if self.watchdog else 0,
+            "event_bus": self.event_bus.get_stats(),
+            "transitions": self.transitions.get_stats(),
+            "state_dwell": self.game_state_manager.get_round_dwell(),
+        }
 
-        handler = self.message_handlers.get(parsed.message_type)
-        if handler:
-            handler(parsed)
+    def process_server_message(self, raw_message: str):
+        """Parse a server line; the processor publishes it to the event bus subscribers."""
+        self.message_processor.process_message(raw_message)
 
     def _update_player_status(self):
         """Common player status update logic."""
@@ -217,16 +635,31 @@ class Server:
         self.logger.info(f"Processing client {client_id} connection")
 
     def _on_game_initialization(self, msg):
-        self.logger.info("Game initialization detected")
-
-        result = self.game_state_manager.handle_game_initialization_detected()
-        if result.get("state_changed"):
-            self.logger.info("Game state updated to RUNNING")
+        self.logger.info(f"Game initialization detected, state {self.game_state_manager.get_current_state().name}")
+
+    def publish_combat_snapshot(self) -> dict:
+        """Round-end combat counters per slot, logged next to each client's latency."""
+        snapshot = self.combat_stats.snapshot(list(self._last_status_clients))
+        for slot, stats in snapshot["clients"].items():
+            ip = self.network_manager.get_client_ip(slot)
+            latency = self.network_manager.ip_latency_map.get(ip) if ip else None
+            self.logger.info(
+                f"[COMBAT] Round {self.game_state_manager.round_count} slot {slot} "
+                f"({self.network_manager.client_name_map.get(slot, '?')}, latency {latency}ms): "
+                f"{stats['kills']} kills, {stats['deaths']} deaths, {stats['kills_per_minute']}/min"
+            )
+        if self.journal:
+            self.journal.append("combat", {"round": self.game_state_manager.round_count, **snapshot})
+        return snapshot
 
     def _on_match_end(self, msg):
         reason = msg.data.get("reason", "unknown")
         self.logger.info(f"Match ended - {reason} hit")
 
+        # The round's result rows are built from this reply
+        if self._async_loop:
+            self._final_status = self._async_loop.create_future()
+        self.send_command("status")
         self.send_command(f"say Match ended! {reason} hit.")
 
     def _on_warmup(self, msg):
@@ -234,8 +667,6 @@ class Server:
         warmup_info = msg.data.get("warmup_info", "")
         self.logger.info(f"Warmup phase started: {warmup_info}")
 
-        result = self.game_state_manager.handle_warmup_detected()
-
         if (
             self.game_manager.should_add_bots()
             and not self.game_manager.are_bots_added()
@@ -260,14 +691,22 @@ class Server:
         if raw_message.startswith("map:"):
             map_name = raw_message.split(":", 1)[1].strip()
             self._current_map = map_name
-            self.logger.debug(f"Current map updated to: {map_name}")
+            self.logger.debug("Current map updated to: %s", map_name)
 
         if msg.data.get("status_complete"):
             client_data_list = msg.data.get("client_data", [])
+            self._last_status_clients = {client["client_id"]: client for client in client_data_list}
+            if self._final_status:
+                if not self._final_status.done():
+                    self._final_status.set_result(dict(self._last_status_clients))
+                self._final_status = None
+            if self._is_match_running():
+                self.latency_verifier.record_status(client_data_list)
             for client_data in client_data_list:
                 self._process_discovered_client(client_data)
         elif msg.data.get("client_data"):
             client_data = msg.data["client_data"]
+            self._last_status_clients[client_data["client_id"]] = client_data
             self._process_discovered_client(client_data)
 
     def _process_discovered_client(self, client_data):
@@ -277,7 +716,7 @@ class Server:
         client_ip = client_data["ip"]
 
         if client_id in self.network_manager.client_type_map:
-            self.logger.debug(f"[CLIENT] Client {client_id} already tracked")
+            self.logger.debug("[CLIENT] Client %d already tracked", client_id)
             return
 
         if client_ip and client_ip != "bot":
@@ -285,26 +724,13 @@ class Server:
                 len(self.network_manager.ip_latency_map) % len(settings.latencies)
             ]
 
-            self.network_manager.add_client(
-                client_id=client_id,
-                ip=client_ip,
-                latency=latency,
-                name=client_name,
-                is_bot=False,
-            )
+            self.event_bus.publish(ClientJoined(client_id, client_name, client_ip, is_bot=False, latency_ms=latency))
             self.logger.info(
                 f"[CLIENT] New HUMAN client: ID={client_id}, Name={client_name}, IP={client_ip}, Latency={latency}ms"
             )
-            self.run_async(self.obs_connection_manager.connect_single_client_immediately(client_ip, self.network_manager))
 
         elif client_ip == "bot":
-            self.network_manager.add_client(
-                client_id=client_id,
-                ip=None,
-                latency=None,
-                name=client_name,
-                is_bot=True,
-            )
+            self.event_bus.publish(ClientJoined(client_id, client_name, None, is_bot=True))
             self.logger.info(
                 f"[CLIENT] BOT client: ID={client_id}, Name={client_name}"
             )
@@ -315,12 +741,8 @@ class Server:
     def _on_client_disconnect(self, msg):
         """Handle client disconnection event."""
         client_id = msg.data["client_id"]
-        client_ip = self.network_manager.get_client_ip(client_id)
-
-        if client_ip and self.obs_connection_manager.is_client_connected(client_ip):
-            self.run_async(self.obs_connection_manager.disconnect_client(client_ip))
-
-        self.network_manager.remove_client(client_id)
+        self.event_bus.publish(ClientLeft(client_id, self.network_manager.get_client_ip(client_id)))
+        self._last_status_clients.pop(client_id, None)
         self.logger.info(
             f"Client {client_id} disconnected. Current players: {self.network_manager.get_client_count()}"
         )
@@ -331,26 +753,41 @@ class Server:
         human_count = self.network_manager.get_human_count()
         self.insufficient_humans = human_count < self.nplayers_threshold
 
-    def run_server_loop(self):
+    async def run_server_loop(self):
         """Main server message processing loop."""
         self.logger.info("Starting server message processing loop")
 
         try:
-            while not self.is_shutdown_requested():
-                message = self.read_server()
-                if message:
-                    if self._output_handler:
-                        self._output_handler(message)
-                    else:
-                        print(f"[SERVER] {message}")
-                    self.process_server_message(message)
-
-                time.sleep(0.01)
-
-        except KeyboardInterrupt:
-            self.logger.info("Server loop interrupted by user")
+            async for message in self.adapter.read_messages():
+                if self.is_shutdown_requested():
+                    break
+                self.last_output_time = time.monotonic()
+                if self.log_archive:
+                    self.log_archive.append(message)
+                if self._output_handler:
+                    self._output_handler(message)
+                else:
+                    print(f"[SERVER] {message}")
+                self.process_server_message(message)
+
+        except asyncio.CancelledError:
+            self.logger.info("Server loop cancelled")
+            raise
         except Exception as e:
             self.logger.error(f"Error in server loop: {e}", exc_info=True)
         finally:
             self.logger.info("Server loop ended")
 
+    async def run_until_stopped(self):
+        """Process server output until shutdown, restarting the server on failure if enabled."""
+        if self.watchdog:
+            await self.watchdog.watch()
+        else:
+            await self.run_server_loop()
+
+    async def run(self):
+        """Start the server process and process its output until shutdown."""
+        if not await self.start_server():
+            self.logger.error("OpenArena server failed to start")
+            return
+        await self.run_until_stopped()
@@ -1,39 +1,65 @@
-import time
-
-from core.game.state_manager import GameState
+import core.utils.settings as settings
+from core.messaging.events import RoundEnded, RoundStarted
+from core.server.round_pipeline import TransitionStep
 
 
 class ShutdownStrategy:
+    """
+    Reacts to one kind of ShutdownGame line.
+
+    State changes (through the GameStateManager transition table) and
+    events happen inline, so the next server line sees them. Slow side
+    effects (OBS, traffic shaping, game commands) are handed to the
+    server's round transition pipeline and run concurrently.
+    """
+
     def handle(self, server, msg):
         raise NotImplementedError
 
+    @staticmethod
+    def command_step(server, name, *commands):
+        async def send():
+            return all([server.send_command(command) is not False for command in commands])
+        return TransitionStep(name, send, settings.transition_command_deadline, retries=settings.transition_retries)
+
 
 class MatchShutdownStrategy(ShutdownStrategy):
     def handle(self, server, msg):
         server.logger.info("ShutdownGame: Match ended completely")
 
-        server.run_async(
-            server.obs_connection_manager.stop_match_recording(
-                server.game_state_manager
-            )
-        )
-
-        result = server.game_state_manager.handle_match_shutdown_detected()
+        state = server.game_state_manager
+        # The round results wait for this step to fill in the recording paths
+        transition = server.run_transition("match_end", [
+            TransitionStep(
+                "obs_stop",
+                lambda: server.obs_connection_manager.stop_match_recording(state),
+                settings.transition_obs_deadline,
+            ),
+        ])
+
+        server.event_bus.publish(RoundEnded(
+            round=state.round_count,
+            latency_summary=server.latency_verifier.publish_round_summary(),
+            combat=server.publish_combat_snapshot(),
+            recording=transition.step("obs_stop") if transition else None,
+        ))
+
+        result = state.handle_match_shutdown_detected()
 
         if result and "actions" in result:
             self._process_match_shutdown_actions(server, result["actions"])
 
         if result and result.get("experiment_finished"):
-            server.send_command("killserver")
-            server.logger.info("Sent killserver command to stop the server")
+            server.finish_experiment()
+        elif transition:
+            transition.add(self.command_step(server, "commands", "say Match completed!"))
         else:
             server.send_command("say Match completed!")
 
-        server.game_state_manager.current_state = GameState.WAITING
-
     @staticmethod
     def _process_match_shutdown_actions(server, actions):
         if "rotate_latency" in actions:
+            # Only reassigns latencies in memory; the rules are applied when the next match starts
             server.network_manager.rotate_latencies()
 
 
@@ -45,13 +71,36 @@ class WarmupShutdownStrategy(ShutdownStrategy):
             server.game_manager.set_next_round_with_warmup_phase()
             return
 
-        result = server.game_state_manager.handle_match_start_detected()
+        state = server.game_state_manager
+        result = state.handle_match_start_detected()
         if result and "actions" in result:
             actions = result["actions"]
+            steps = []
             if "start_match_recording" in actions:
-                server.run_async(server.obs_connection_manager.start_match_recording(server.game_state_manager))
+                steps.append(TransitionStep(
+                    "obs_start",
+                    lambda: server.obs_connection_manager.start_match_recording(state),
+                    settings.transition_obs_deadline,
+                ))
             if "apply_latency" in actions:
-                if server.network_manager.is_enabled():
-                    server.network_manager.apply_latency_rules()
+                round_number = state.round_count
+                server.event_bus.publish(RoundStarted(round_number))
 
-        server.game_state_manager.current_state = GameState.WAITING
\ No newline at end of file
+                async def start_verification():
+                    server.latency_verifier.start_round(round_number)
+
+                if server.network_manager.is_enabled():
+                    steps.append(TransitionStep(
+                        "tc_apply",
+                        server.network_manager.apply_latency_rules_async,
+                        settings.transition_tc_deadline,
+                        retries=settings.transition_retries,
+                    ))
+                    # Samples taken before the rules are in place would be flagged as mismatches
+                    after = ("tc_apply",)
+                else:
+                    after = ()
+                steps.append(TransitionStep("latency_verifier", start_verification,
+                                            settings.transition_command_deadline, after=after))
+            if steps and not server.run_transition("match_start", steps):
+                server.logger.warning("Event loop not running, round transition side effects skipped")
@@ -0,0 +1,422 @@
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import signal
+import socket
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Set
+
+import core.utils.settings as settings
+from core.adapters.base import GameAdapterConfig
+from core.utils.logging_utils import configure_logging, parse_sample_rates
+
+
+# Instance process exit codes
+EXIT_FINISHED = 0  # experiment complete or stop requested
+EXIT_CRASHED = 1  # restarted by the supervisor
+EXIT_GAVE_UP = 3  # the instance's own watchdog spent its restart budget; never restarted
+
+
+@dataclass
+class InstanceSpec:
+    """Everything a child process needs to run one managed oa_ded instance."""
+
+    instance_id: int
+    port: int
+    homepath: str
+    server_config: str
+    max_clients: int = 4
+    game_cores: List[int] = field(default_factory=list)
+    manager_cores: List[int] = field(default_factory=list)
+
+    def adapter_config(self) -> GameAdapterConfig:
+        return GameAdapterConfig(
+            game_type="openarena",
+            port=self.port,
+            binary_path=settings.oa_binary_path,
+            max_clients=self.max_clients,
+            homepath=self.homepath,
+            server_config=self.server_config,
+            cpu_affinity=self.game_cores or None,
+        )
+
+
+def is_port_free(port: int) -> bool:
+    """Check whether a UDP port can be bound on all interfaces."""
+    with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sock:
+        try:
+            sock.bind(("", port))
+            return True
+        except OSError:
+            return False
+
+
+def allocate_ports(count: int, base_port: int, max_tries: int = 100) -> List[int]:
+    """Pick `count` free UDP ports starting at `base_port`, skipping busy ones."""
+    ports = []
+    port = base_port
+    while len(ports) < count:
+        if port >= base_port + count + max_tries:
+            raise RuntimeError(f"Could not find {count} free ports from {base_port}")
+        if is_port_free(port):
+            ports.append(port)
+        port += 1
+    return ports
+
+
+def plan_cpu_sets(count: int) -> List[Dict[str, List[int]]]:
+    """
+    Split the cores available to this process between instances.
+
+    Core 0 of the allowed set is left to the supervisor. Every instance then
+    gets a dedicated core for oa_ded and one for its manager process; when
+    there are not enough cores, manager processes share a core and game
+    servers are assigned round-robin over the rest.
+    """
+    cores = sorted(os.sched_getaffinity(0))
+    if len(cores) < 2:
+        return [{"game": [], "manager": []} for _ in range(count)]
+
+    workers = cores[1:]
+    if len(workers) >= 2 * count:
+        return [
+            {"game": [workers[2 * i]], "manager": [workers[2 * i + 1]]}
+            for i in range(count)
+        ]
+
+    manager_core = workers[0]
+    game_cores = workers[1:] or workers
+    return [
+        {"game": [game_cores[i % len(game_cores)]], "manager": [manager_core]}
+        for i in range(count)
+    ]
+
+
+def build_instance_specs(count: int, base_port: Optional[int] = None,
+                         pin_cpus: Optional[bool] = None) -> List[InstanceSpec]:
+    """Build per-instance port, homepath, config and core assignments from settings."""
+    base_port = base_port if base_port is not None else settings.oa_port
+    pin_cpus = settings.oa_cpu_pinning if pin_cpus is None else pin_cpus
+
+    ports = allocate_ports(count, base_port)
+    cpu_sets = plan_cpu_sets(count) if pin_cpus else [{"game": [], "manager": []}] * count
+    configs = settings.oa_server_configs
+
+    return [
+        InstanceSpec(
+            instance_id=i,
+            port=ports[i],
+            homepath=os.path.abspath(os.path.join(settings.oa_instance_root, f"instance{i}")),
+            server_config=configs[i % len(configs)],
+            max_clients=settings.oa_max_clients,
+            game_cores=cpu_sets[i]["game"],
+            manager_cores=cpu_sets[i]["manager"],
+        )
+        for i in range(count)
+    ]
+
+
+def _run_instance(spec: InstanceSpec, status_queue, status_interval: float) -> None:
+    """Child process entry point: one Server state machine on its own event loop."""
+    configure_logging(
+        level=settings.log_level,
+        fmt=f"%(asctime)s - [oa{spec.instance_id}] %(name)s - %(levelname)s - %(message)s",
+        sample_rates=parse_sample_rates(settings.log_sample_rates),
+    )
+    if spec.manager_cores:
+        os.sched_setaffinity(0, spec.manager_cores)
+    os.makedirs(spec.homepath, exist_ok=True)
+
+    try:
+        exit_code = asyncio.run(_instance_main(spec, status_queue, status_interval))
+    except KeyboardInterrupt:
+        exit_code = EXIT_FINISHED
+    sys.exit(exit_code)
+
+
+async def _instance_main(spec: InstanceSpec, status_queue, status_interval: float) -> int:
+    """Run the instance until it stops; returns the process exit code (EXIT_*)."""
+    # Imported here so the supervisor process itself never builds a Server
+    from core.network.namespace import NetworkNamespace
+    from core.network.network_utils import get_network_utils
+    from core.server.server import Server
+
+    logger = logging.getLogger(__name__)
+    netns = NetworkNamespace.from_settings(index=spec.instance_id, port=spec.port)
+    server = Server(
+        netns=netns,
+        adapter_config=spec.adapter_config(),
+        journal_dir=os.path.join(settings.journal_dir, f"instance{spec.instance_id}"),
+        results_dir=os.path.join(settings.results_dir, f"instance{spec.instance_id}"),
+        log_archive_dir=os.path.join(settings.log_archive_dir, f"instance{spec.instance_id}"),
+    )
+
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_requested.set)
+
+    def report() -> None:
+        status = server.get_status()
+        status.update(instance_id=spec.instance_id, manager_pid=os.getpid(),
+                      game_cores=spec.game_cores, manager_cores=spec.manager_cores,
+                      timestamp=time.time())
+        try:
+            status_queue.put_nowait(status)
+        except queue.Full:
+            pass
+
+    server_task = asyncio.create_task(server.run(), name=f"oa-server-{spec.instance_id}")
+    try:
+        while not server_task.done() and not stop_requested.is_set():
+            report()
+            try:
+                await asyncio.wait_for(stop_requested.wait(), timeout=status_interval)
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        logger.info(f"Instance {spec.instance_id} shutting down")
+        try:
+            get_network_utils().dispose(server.network_manager.interface, server.network_manager.netns)
+        except Exception as e:
+            logger.error(f"Error cleaning up network rules: {e}")
+        try:
+            await asyncio.wait_for(server.shutdown(), timeout=10)
+        except asyncio.TimeoutError:
+            logger.error("Server shutdown timed out")
+        server_task.cancel()
+        await asyncio.gather(server_task, return_exceptions=True)
+        report()
+
+    if stop_requested.is_set() or server.experiment_finished:
+        return EXIT_FINISHED
+    if server.watchdog and server.watchdog.gave_up:
+        # Restarting the whole instance would only repeat what the watchdog already gave up on
+        return EXIT_GAVE_UP
+    return EXIT_CRASHED
+
+
+class ServerSupervisor:
+    """
+    Launch and monitor several oa_ded instances, one manager process each.
+
+    Every instance runs its own Server state machine in a separate process
+    (so one busy manager cannot delay another's console handling), with its
+    own port, homepath and config, and is pinned to dedicated cores. Children
+    push status snapshots over a queue; the supervisor keeps the latest one
+    per instance, restarts manager processes that crash (after a doubling
+    delay, up to `max_restarts` within `restart_window`), and publishes an
+    aggregate status file. An instance whose watchdog gave up, or that spent
+    its restart budget, is marked failed and left stopped.
+    """
+
+    def __init__(self, specs: List[InstanceSpec], restart_on_exit: bool = True,
+                 status_file: Optional[str] = None, poll_interval: Optional[float] = None,
+                 max_restarts: Optional[int] = None, restart_window: Optional[float] = None,
+                 restart_backoff: Optional[float] = None, restart_backoff_max: Optional[float] = None):
+        if len(specs) > 1 and settings.enable_latency_control and not settings.netns_enable:
+            # Without namespaces every instance shapes the same interface and wipes the others' rules
+            raise RuntimeError(
+                f"{len(specs)} instances with latency control need NETNS_ENABLE=true "
+                f"so each instance shapes its own interface"
+            )
+        self.specs = {spec.instance_id: spec for spec in specs}
+        self.restart_on_exit = restart_on_exit
+        self.status_file = status_file if status_file is not None else settings.oa_supervisor_status_file
+        self.poll_interval = poll_interval or settings.oa_supervisor_poll_interval
+        self.max_restarts = max_restarts if max_restarts is not None else settings.oa_supervisor_max_restarts
+        self.restart_window = restart_window or settings.oa_supervisor_restart_window
+        self.restart_backoff = restart_backoff if restart_backoff is not None else settings.oa_supervisor_restart_backoff
+        self.restart_backoff_max = restart_backoff_max or settings.oa_supervisor_restart_backoff_max
+        self.logger = logging.getLogger(__name__)
+
+        self._ctx = multiprocessing.get_context("spawn")
+        self._status_queue = self._ctx.Queue(maxsize=1000)
+        self._processes: Dict[int, multiprocessing.Process] = {}
+        self._statuses: Dict[int, dict] = {}
+        self._restarts: Dict[int, int] = {instance_id: 0 for instance_id in self.specs}
+        self._restart_times: Dict[int, Deque[float]] = {instance_id: deque() for instance_id in self.specs}
+        # Monotonic time at which a crashed instance is due to be started again
+        self._restart_due: Dict[int, float] = {}
+        self._finished: Set[int] = set()
+        self._failed: Set[int] = set()
+        self._stopping = False
+
+    @classmethod
+    def from_settings(cls, count: Optional[int] = None) -> "ServerSupervisor":
+        return cls(build_instance_specs(count or settings.oa_instances))
+
+    def start(self) -> None:
+        """Start a manager process for every instance."""
+        if settings.oa_cpu_pinning:
+            cores = sorted(os.sched_getaffinity(0))
+            if cores:
+                os.sched_setaffinity(0, cores[:1])
+
+        for instance_id in self.specs:
+            self._start_instance(instance_id)
+
+    def _start_instance(self, instance_id: int) -> None:
+        spec = self.specs[instance_id]
+        process = self._ctx.Process(
+            target=_run_instance,
+            args=(spec, self._status_queue, self.poll_interval),
+            name=f"oa-instance-{instance_id}",
+        )
+        process.start()
+        self._processes[instance_id] = process
+        self.logger.info(
+            f"Started instance {instance_id} (pid {process.pid}) on port {spec.port}, "
+            f"game cores {spec.game_cores}, manager cores {spec.manager_cores}"
+        )
+
+    def poll(self) -> None:
+        """Collect status updates and handle instances whose process has exited."""
+        while True:
+            try:
+                status = self._status_queue.get_nowait()
+            except queue.Empty:
+                break
+            self._statuses[status["instance_id"]] = status
+
+        now = time.monotonic()
+        for instance_id, process in list(self._processes.items()):
+            if (process.is_alive() or self._stopping or instance_id in self._finished
+                    or instance_id in self._failed):
+                continue
+            if instance_id in self._restart_due:
+                if now >= self._restart_due[instance_id]:
+                    del self._restart_due[instance_id]
+                    self._restarts[instance_id] += 1
+                    self._start_instance(instance_id)
+                continue
+
+            if process.exitcode == EXIT_FINISHED:
+                # A clean exit means the experiment sequence completed
+                self.logger.info(f"Instance {instance_id} finished")
+                self._finished.add(instance_id)
+            elif process.exitcode == EXIT_GAVE_UP:
+                self.logger.error(f"Instance {instance_id} failed: its watchdog gave up restarting the server")
+                self._failed.add(instance_id)
+            elif self.restart_on_exit:
+                self._schedule_restart(instance_id, process.exitcode, now)
+            else:
+                self.logger.warning(f"Instance {instance_id} exited with code {process.exitcode}")
+                self._failed.add(instance_id)
+
+        self._write_status_file()
+
+    def _schedule_restart(self, instance_id: int, exitcode: Optional[int], now: float) -> None:
+        times = self._restart_times[instance_id]
+        while times and now - times[0] > self.restart_window:
+            times.popleft()
+        if len(times) >= self.max_restarts:
+            self.logger.error(
+                f"Instance {instance_id} exited with code {exitcode} after {len(times)} restarts "
+                f"within {self.restart_window:.0f}s, marking it failed"
+            )
+            self._failed.add(instance_id)
+            return
+
+        delay = min(self.restart_backoff * 2 ** len(times), self.restart_backoff_max)
+        times.append(now)
+        self._restart_due[instance_id] = now + delay
+        self.logger.warning(f"Instance {instance_id} exited with code {exitcode}, restarting in {delay:.1f}s")
+
+    def get_instance_status(self, instance_id: int) -> dict:
+        """Latest status reported by one instance, plus supervisor-side process info."""
+        spec = self.specs[instance_id]
+        process = self._processes.get(instance_id)
+        status = dict(self._statuses.get(instance_id, {}))
+        status.update(
+            instance_id=instance_id,
+            port=spec.port,
+            homepath=spec.homepath,
+            server_config=spec.server_config,
+            alive=bool(process and process.is_alive()),
+            exitcode=process.exitcode if process else None,
+            restarts=self._restarts[instance_id],
+            finished=instance_id in self._finished,
+            failed=instance_id in self._failed,
+        )
+        return status
+
+    def get_aggregate_status(self) -> dict:
+        """Summary across all instances."""
+        instances = [self.get_instance_status(instance_id) for instance_id in self.specs]
+        return {
+            "instances": len(instances),
+            "alive": sum(1 for s in instances if s["alive"]),
+            "running": sum(1 for s in instances if s.get("running")),
+            "humans": sum(s.get("humans", 0) for s in instances),
+            "bots": sum(s.get("bots", 0) for s in instances),
+            "restarts": sum(s["restarts"] for s in instances),
+            "finished": len(self._finished),
+            "failed": len(self._failed),
+            "per_instance": instances,
+        }
+
+    def _write_status_file(self) -> None:
+        if not self.status_file:
+            return
+        tmp_path = f"{self.status_file}.tmp"
+        try:
+            with open(tmp_path, "w") as f:
+                json.dump(self.get_aggregate_status(), f, indent=2, default=str)
+            os.replace(tmp_path, self.status_file)
+        except OSError as e:
+            self.logger.error(f"Failed to write supervisor status: {e}")
+
+    def stop(self, timeout: float = 15.0) -> None:
+        """Ask every instance to shut down gracefully, then kill stragglers."""
+        self._stopping = True
+        for process in self._processes.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + timeout
+        for instance_id, process in self._processes.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                self.logger.error(f"Instance {instance_id} did not stop in time, killing it")
+                process.kill()
+                process.join()
+
+        self.poll()
+        self.logger.info("All instances stopped")
+
+    def run(self) -> None:
+        """Start all instances and monitor them until they finish or SIGINT/SIGTERM."""
+        stop_requested = False
+
+        def request_stop(sig, frame):
+            nonlocal stop_requested
+            stop_requested = True
+
+        signal.signal(signal.SIGINT, request_stop)
+        signal.signal(signal.SIGTERM, request_stop)
+
+        self.start()
+        last_summary = 0.0
+        try:
+            while not stop_requested and len(self._finished) + len(self._failed) < len(self.specs):
+                self.poll()
+                now = time.monotonic()
+                if now - last_summary >= 30:
+                    last_summary = now
+                    summary = self.get_aggregate_status()
+                    self.logger.info(
+                        f"Instances alive {summary['alive']}/{summary['instances']}, "
+                        f"running {summary['running']}, humans {summary['humans']}, "
+                        f"restarts {summary['restarts']}, failed {summary['failed']}"
+                    )
+                time.sleep(self.poll_interval)
+        finally:
+            self.logger.warning("Stopping all instances...")
+            self.stop()
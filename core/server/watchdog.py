@@ -0,0 +1,122 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Optional
+
+import core.utils.settings as settings
+
+
+class ServerWatchdog:
+    """
+    Detects a dead or hung oa_ded and restarts it in place.
+
+    A failure is any of: the process exiting, stderr reaching EOF, or no output
+    for `stall_timeout` seconds followed by a failed liveness probe. oa_ded is
+    silent while idle, so silence alone never triggers a restart. The probe is
+    pluggable: Server passes a UDP getinfo query, and the fallback echoes a
+    marker through the console and waits for any output to come back.
+    """
+
+    def __init__(self, server, stall_timeout: Optional[float] = None,
+                 probe_timeout: Optional[float] = None, check_interval: float = 1.0,
+                 max_restarts: Optional[int] = None, restart_window: Optional[float] = None,
+                 probe: Optional[Callable[[], Awaitable[bool]]] = None):
+        self.server = server
+        self.stall_timeout = stall_timeout or settings.watchdog_stall_timeout
+        self.probe_timeout = probe_timeout or settings.watchdog_probe_timeout
+        self.check_interval = check_interval
+        self.max_restarts = max_restarts if max_restarts is not None else settings.watchdog_max_restarts
+        self.restart_window = restart_window or settings.watchdog_restart_window
+        self.probe = probe or self.console_probe
+        self.logger = logging.getLogger(__name__)
+
+        self.restart_count = 0
+        self.last_failure: Optional[str] = None
+        # Set once the restart budget is spent and the watchdog stops trying
+        self.gave_up = False
+        self._restart_times: Deque[float] = deque()
+        self._last_alive = time.monotonic()
+
+    async def watch(self) -> None:
+        """Run the server message loop, restarting the server until shutdown."""
+        while not self.server.is_shutdown_requested():
+            loop_task = asyncio.create_task(self.server.run_server_loop(), name="oa-server-loop")
+            reason = await self._supervise(loop_task)
+            if reason is None:
+                return
+
+            self.last_failure = reason
+            if not self._restart_allowed():
+                self.logger.error(
+                    f"Server failed ({reason}) after {self.max_restarts} restarts "
+                    f"within {self.restart_window:.0f}s, giving up"
+                )
+                self.gave_up = True
+                return
+
+            self.logger.warning(f"Server failure detected: {reason}. Restarting...")
+            # A hung server will not honour SIGTERM, so don't wait long before killing it
+            await self._restart(stop_timeout=1.0)
+
+    async def _supervise(self, loop_task: asyncio.Task) -> Optional[str]:
+        """Wait until the loop ends or the server looks dead; returns the failure reason."""
+        self._last_alive = time.monotonic()
+        try:
+            while True:
+                await asyncio.wait({loop_task}, timeout=self.check_interval)
+
+                if self.server.is_shutdown_requested():
+                    return None
+                if loop_task.done():
+                    return "process exited" if not self.server.is_running() else "server output closed"
+                if not self.server.is_running():
+                    return "process exited"
+
+                last_seen = max(self._last_alive, self.server.last_output_time)
+                if time.monotonic() - last_seen < self.stall_timeout:
+                    continue
+
+                if await self.probe():
+                    self._last_alive = time.monotonic()
+                    continue
+                return f"no output for {self.stall_timeout:.0f}s and liveness probe failed"
+        finally:
+            if not loop_task.done():
+                loop_task.cancel()
+                await asyncio.gather(loop_task, return_exceptions=True)
+
+    async def console_probe(self) -> bool:
+        """Send a console command and wait for the server to print anything."""
+        before = self.server.last_output_time
+        self.server.send_command("echo watchdog")
+
+        deadline = time.monotonic() + self.probe_timeout
+        while time.monotonic() < deadline:
+            await asyncio.sleep(0.1)
+            if self.server.last_output_time > before:
+                return True
+        return False
+
+    def _restart_allowed(self) -> bool:
+        now = time.monotonic()
+        while self._restart_times and now - self._restart_times[0] > self.restart_window:
+            self._restart_times.popleft()
+        return len(self._restart_times) < self.max_restarts
+
+    async def _restart(self, stop_timeout: float) -> None:
+        self._restart_times.append(time.monotonic())
+        self.restart_count += 1
+        started = time.monotonic()
+
+        delay = 0.5
+        while not self.server.is_shutdown_requested():
+            if await self.server.restart_server(stop_timeout=stop_timeout):
+                self.logger.info(
+                    f"Server restarted in {time.monotonic() - started:.1f}s "
+                    f"(restart {self.restart_count})"
+                )
+                return
+            self.logger.error(f"Server restart failed, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 10.0)
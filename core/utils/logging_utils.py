@@ -0,0 +1,122 @@
+"""Queue-based logging setup shared by the CLI, the TUI and supervisor instances."""
+
+import atexit
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, List, Optional
+
+DEFAULT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listener: Optional[QueueListener] = None
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep only every Nth DEBUG record of high-frequency categories.
+
+    A category is the last component of the logger name, e.g. the
+    `<module>.status` loggers the message processors use for per-line status
+    parsing. Records at INFO and above always pass.
+    """
+
+    def __init__(self, rates: Dict[str, int]):
+        super().__init__()
+        self.rates = {category: rate for category, rate in rates.items() if rate > 1}
+        self._counts: Dict[str, int] = {}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG or not self.rates:
+            return True
+        category = record.name.rpartition(".")[2]
+        rate = self.rates.get(category)
+        if rate is None:
+            return True
+        count = self._counts.get(category, 0)
+        self._counts[category] = count + 1
+        return count % rate == 0
+
+
+class _EnqueueHandler(QueueHandler):
+    """QueueHandler that leaves formatting to the listener thread."""
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The stock prepare() formats the message here, on the logging thread.
+        # Records only cross threads, not processes, so they can go as they are.
+        return record
+
+
+def parse_sample_rates(spec: str) -> Dict[str, int]:
+    """Parse "status=50,packets=20" into {"status": 50, "packets": 20}."""
+    rates = {}
+    for item in spec.split(","):
+        category, _, rate = item.partition("=")
+        if category.strip() and rate.strip().isdigit():
+            rates[category.strip()] = int(rate)
+    return rates
+
+
+def configure_logging(level: str = "DEBUG", fmt: str = DEFAULT_FORMAT,
+                      handlers: Optional[List[logging.Handler]] = None,
+                      sample_rates: Optional[Dict[str, int]] = None) -> QueueListener:
+    """
+    Route all logging through a queue drained by a dedicated writer thread.
+
+    The calling thread only creates the record and puts it on the queue;
+    formatting and handler I/O (console, rotating file, TUI) happen on the
+    listener thread. Defaults to a stderr handler if none are given.
+    """
+    global _listener
+    if _listener is not None:
+        return _listener
+
+    if not handlers:
+        handlers = [logging.StreamHandler(sys.stderr)]
+    for handler in handlers:
+        if handler.formatter is None:
+            handler.setFormatter(logging.Formatter(fmt))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = _EnqueueHandler(log_queue)
+    if sample_rates:
+        queue_handler.addFilter(SamplingFilter(sample_rates))
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    root.setLevel(level)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_logging)
+    return _listener
+
+
+def add_log_handler(handler: logging.Handler, fmt: str = DEFAULT_FORMAT) -> None:
+    """Attach another output handler to the running listener."""
+    if handler.formatter is None:
+        handler.setFormatter(logging.Formatter(fmt))
+    if _listener is None:
+        logging.getLogger().addHandler(handler)
+        return
+    _listener.handlers = _listener.handlers + (handler,)
+
+
+def remove_log_handler(handler: logging.Handler) -> None:
+    if _listener is None:
+        logging.getLogger().removeHandler(handler)
+        return
+    _listener.handlers = tuple(h for h in _listener.handlers if h is not handler)
+
+
+def stop_logging() -> None:
+    """Drain the queue and stop the writer thread."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.flush()
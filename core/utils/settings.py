@@ -9,6 +9,11 @@ def get_bool_env(key, default=False):
     return os.getenv(key, str(default)).lower() in ("true", "1", "yes")
 
 
+# Logging
+log_level = os.getenv("LOG_LEVEL", "DEBUG").upper()
+# Keep every Nth DEBUG record of these high-frequency logger categories
+log_sample_rates = os.getenv("LOG_SAMPLE_RATES", "status=50,packets=50")
+
 # Game Type Selection
 # Supported: "openarena", "dota2"
 game_type = os.getenv("GAME_TYPE", "openarena").lower()
@@ -28,6 +33,26 @@ bot_names = os.getenv("BOT_NAMES", "").split(",")
 interface = os.getenv("INTERFACE", "eno2")
 latencies = [int(lat) for lat in os.getenv("LATENCIES", "200").split(",")]
 enable_latency_control = get_bool_env("ENABLE_LATENCY_CONTROL", False)
+# Latency shaping backend: "shell" (sudo tc/nft) or "netlink" (rtnetlink, needs CAP_NET_ADMIN)
+network_backend = os.getenv("NETWORK_BACKEND", "shell").lower()
+
+# Network namespace isolation (one namespace, veth pair and nft table per server instance)
+netns_enable = get_bool_env("NETNS_ENABLE", False)
+netns_prefix = os.getenv("NETNS_PREFIX", "oa")
+netns_subnet_prefix = os.getenv("NETNS_SUBNET_PREFIX", "10.200")
+
+# Latency verification (observed status ping vs. assigned netem delay)
+latency_verify_interval = float(os.getenv("LATENCY_VERIFY_INTERVAL", 10.0))
+latency_tolerance_ms = int(os.getenv("LATENCY_TOLERANCE_MS", 25))
+latency_min_samples = int(os.getenv("LATENCY_MIN_SAMPLES", 3))
+# In-game notice when a check fails or a round is summarised; never names clients, IPs or latencies
+latency_announce = get_bool_env("LATENCY_ANNOUNCE", False)
+
+# Round transitions: the side effects of a ShutdownGame line run concurrently, each with a deadline
+transition_obs_deadline = float(os.getenv("TRANSITION_OBS_DEADLINE", 15.0))  # stopping waits 2s first
+transition_tc_deadline = float(os.getenv("TRANSITION_TC_DEADLINE", 10.0))
+transition_command_deadline = float(os.getenv("TRANSITION_COMMAND_DEADLINE", 2.0))
+transition_retries = int(os.getenv("TRANSITION_RETRIES", 2))  # for steps that are safe to repeat
 
 # OpenArena game settings
 fraglimit = int(os.getenv("FLAGLIMIT", 10))
@@ -37,6 +62,57 @@ enable_warmup = get_bool_env("ENABLE_WARMUP", True)
 # OpenArena server settings
 oa_binary_path = os.getenv("OA_BINARY_PATH", "oa_ded")
 oa_port = int(os.getenv("OA_PORT", 27960))
+oa_max_clients = int(os.getenv("OA_MAX_CLIENTS", 4))
+oa_homepath = os.getenv("OA_HOMEPATH", None)  # passed as fs_homepath; relative paths resolve from the working directory
+oa_server_configs = os.getenv("OA_SERVER_CONFIG", "t_server.cfg").split(",")
+
+# Watchdog
+watchdog_enable = get_bool_env("WATCHDOG_ENABLE", True)
+watchdog_stall_timeout = float(os.getenv("WATCHDOG_STALL_TIMEOUT", 30.0))
+watchdog_probe_timeout = float(os.getenv("WATCHDOG_PROBE_TIMEOUT", 5.0))
+watchdog_max_restarts = int(os.getenv("WATCHDOG_MAX_RESTARTS", 5))
+watchdog_restart_window = float(os.getenv("WATCHDOG_RESTART_WINDOW", 300.0))
+
+# UDP getstatus/getinfo queries
+query_timeout = float(os.getenv("QUERY_TIMEOUT", 1.0))
+query_ready_timeout = float(os.getenv("QUERY_READY_TIMEOUT", 15.0))
+query_probe_enable = get_bool_env("QUERY_PROBE_ENABLE", True)
+
+# Experiment journal
+journal_enable = get_bool_env("JOURNAL_ENABLE", True)
+journal_dir = os.getenv("JOURNAL_DIR", "journal")
+journal_fsync_interval = float(os.getenv("JOURNAL_FSYNC_INTERVAL", 1.0))
+journal_fsync_batch = int(os.getenv("JOURNAL_FSYNC_BATCH", 64))
+journal_snapshot_every = int(os.getenv("JOURNAL_SNAPSHOT_EVERY", 200))
+# A journal untouched for longer is archived instead of resumed, unless JOURNAL_RESUME_STALE is set
+journal_stale_after = float(os.getenv("JOURNAL_STALE_AFTER", 3600))
+journal_resume_stale = get_bool_env("JOURNAL_RESUME_STALE", False)
+
+# Per-round results
+results_enable = get_bool_env("RESULTS_ENABLE", True)
+results_dir = os.getenv("RESULTS_DIR", "results")
+results_format = os.getenv("RESULTS_FORMAT", "auto")  # auto, arrow, parquet or csv
+results_batch_size = int(os.getenv("RESULTS_BATCH_SIZE", 256))
+
+# Raw server output archive
+log_archive_enable = get_bool_env("LOG_ARCHIVE_ENABLE", True)
+log_archive_dir = os.getenv("LOG_ARCHIVE_DIR", "logs")
+log_archive_compression = os.getenv("LOG_ARCHIVE_COMPRESSION", "auto")  # auto, zstd or gzip
+log_archive_block_size = int(os.getenv("LOG_ARCHIVE_BLOCK_SIZE", 64 * 1024))
+log_archive_flush_interval = float(os.getenv("LOG_ARCHIVE_FLUSH_INTERVAL", 5.0))
+
+# Multi-instance supervisor
+oa_instances = int(os.getenv("OA_INSTANCES", 1))
+oa_instance_root = os.getenv("OA_INSTANCE_ROOT", "instances")
+oa_cpu_pinning = get_bool_env("OA_CPU_PINNING", True)
+oa_supervisor_status_file = os.getenv("OA_SUPERVISOR_STATUS_FILE", "supervisor_status.json")
+oa_supervisor_poll_interval = float(os.getenv("OA_SUPERVISOR_POLL_INTERVAL", 2.0))
+# Crashed instances are restarted after a doubling delay, at most OA_SUPERVISOR_MAX_RESTARTS
+# times within OA_SUPERVISOR_RESTART_WINDOW seconds; after that the instance is marked failed
+oa_supervisor_max_restarts = int(os.getenv("OA_SUPERVISOR_MAX_RESTARTS", 5))
+oa_supervisor_restart_window = float(os.getenv("OA_SUPERVISOR_RESTART_WINDOW", 600.0))
+oa_supervisor_restart_backoff = float(os.getenv("OA_SUPERVISOR_RESTART_BACKOFF", 2.0))
+oa_supervisor_restart_backoff_max = float(os.getenv("OA_SUPERVISOR_RESTART_BACKOFF_MAX", 120.0))
 
 # OBS Integration
 obs_port = os.getenv("OBS_PORT", "4455")
@@ -48,6 +124,30 @@ dota2_rcon_host = os.getenv("DOTA2_RCON_HOST", "localhost")
 dota2_rcon_port = int(os.getenv("DOTA2_RCON_PORT", 27015))
 dota2_rcon_password = os.getenv("DOTA2_RCON_PASSWORD", "")
 dota2_poll_interval = float(os.getenv("DOTA2_POLL_INTERVAL", 5.0))
+dota2_poll_min_interval = float(os.getenv("DOTA2_POLL_MIN_INTERVAL", 0.5))  # during timed phases
+dota2_poll_max_interval = float(os.getenv("DOTA2_POLL_MAX_INTERVAL", 30.0))  # backed off while idle
+# Polled with `status`, whose output has no game state; the reply must name a DOTA_GAMERULES_STATE_*
+dota2_game_state_command = os.getenv("DOTA2_GAME_STATE_COMMAND", "dota_gamerules_state")
 dota2_gamemode = int(os.getenv("DOTA2_GAMEMODE", 1))  # 1=All Pick
 dota2_cheats = get_bool_env("DOTA2_CHEATS", False)
+# Servers for `main.py rcon`: "host[:port],password@host[:port],..." (default password: DOTA2_RCON_PASSWORD)
+dota2_fleet = os.getenv("DOTA2_FLEET", "")
+dota2_fleet_deadline = float(os.getenv("DOTA2_FLEET_DEADLINE", 5.0))  # seconds per server per command
+
+# Dota 2 Game State Integration: the game POSTs state changes to this endpoint
+# instead of the adapter polling `status` over RCON (RCON still sends commands)
+dota2_gsi_enable = get_bool_env("DOTA2_GSI_ENABLE", False)
+dota2_gsi_host = os.getenv("DOTA2_GSI_HOST", "127.0.0.1")
+dota2_gsi_port = int(os.getenv("DOTA2_GSI_PORT", 3000))
+dota2_gsi_token = os.getenv("DOTA2_GSI_TOKEN", "")
+
+# Dota 2 remote logging: the server sends its console log to us over UDP
+# (logaddress_add), which carries connects, disconnects and state changes
+dota2_log_enable = get_bool_env("DOTA2_LOG_ENABLE", False)
+dota2_log_host = os.getenv("DOTA2_LOG_HOST", "")  # defaults to the interface facing the server
+dota2_log_port = int(os.getenv("DOTA2_LOG_PORT", 27500))
+dota2_log_address = os.getenv("DOTA2_LOG_ADDRESS", "")  # defaults to our address on the RCON connection
+dota2_log_secret = os.getenv("DOTA2_LOG_SECRET", "")  # must match sv_logsecret if set
+# Comma-separated addresses allowed to send log lines; defaults to the RCON server's address
+dota2_log_allowed_hosts = [host for host in os.getenv("DOTA2_LOG_ALLOWED_HOSTS", "").split(",") if host]
 
@@ -1,5 +1,7 @@
+import argparse
 import os
 import asyncio
+import json
 import logging
 import signal
 import sys
@@ -7,23 +9,22 @@ import threading
 import time
 
 import core.utils.settings as settings
-from core.network.network_utils import NetworkUtils
+from core.network.network_utils import get_network_utils
 from core.server.server import Server
+from core.server.supervisor import ServerSupervisor
+from core.utils.logging_utils import configure_logging, parse_sample_rates
 from core.adapters import (
     GameAdapterConfig,
     GameAdapterRegistry,
     register_default_adapters,
 )
+from core.adapters.base import MessageType
+from core.adapters.dota2 import Dota2MessageProcessor
 
-logging.basicConfig(
-    level=logging.DEBUG, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s"
-)
-
+# Importing this module has no side effects: the supervisor's spawned children
+# re-import it as __mp_main__ and set up their own logging and Server
 logger = logging.getLogger("ASTRIDServerUtil")
 
-# Register available game adapters
-register_default_adapters()
-
 
 def create_adapter_config() -> GameAdapterConfig:
     """Create adapter configuration based on game type."""
@@ -36,6 +37,17 @@ def create_adapter_config() -> GameAdapterConfig:
             port=settings.dota2_rcon_port,
             password=settings.dota2_rcon_password,
             poll_interval=settings.dota2_poll_interval,
+            poll_min_interval=settings.dota2_poll_min_interval,
+            poll_max_interval=settings.dota2_poll_max_interval,
+            game_state_command=settings.dota2_game_state_command or None,
+            gsi_port=settings.dota2_gsi_port if settings.dota2_gsi_enable else None,
+            gsi_host=settings.dota2_gsi_host,
+            gsi_token=settings.dota2_gsi_token or None,
+            log_port=settings.dota2_log_port if settings.dota2_log_enable else None,
+            log_host=settings.dota2_log_host or None,
+            log_allowed_hosts=settings.dota2_log_allowed_hosts or None,
+            log_address=settings.dota2_log_address or None,
+            log_secret=settings.dota2_log_secret or None,
         )
     else:  # Default to OpenArena
         return GameAdapterConfig(
@@ -46,35 +58,30 @@ def create_adapter_config() -> GameAdapterConfig:
         )
 
 
-# For now, use the existing Server class for OpenArena
+# OpenArena runs through Server on a single event loop (built by run_openarena)
 # Dota 2 mode will use the adapter directly
-server = Server()
+server = None
 game_adapter = None
-async_loop = None
-interface = settings.interface
 
 
-def cleanup():
-    """Centralized cleanup function."""
-    if async_loop and async_loop.is_running():
-        try:
-            future = asyncio.run_coroutine_threadsafe(
-                server.cleanup_obs_async(), async_loop
-            )
-            future.result(timeout=5)
-        except Exception as e:
-            logger.error(f"Error cleaning up OBS connections: {e}")
-
+def cleanup_network():
+    """Remove this server's latency rules: its namespace, or the host interface."""
+    if server is None:
+        return
     try:
-        NetworkUtils.dispose(interface)
+        get_network_utils().dispose(
+            server.network_manager.interface, server.network_manager.netns
+        )
         logger.info("Network rules cleaned up")
     except Exception as e:
         logger.error(f"Error cleaning up network rules: {e}")
 
-    server.dispose()
 
-    if async_loop and async_loop.is_running():
-        async_loop.call_soon_threadsafe(async_loop.stop)
+def cleanup():
+    """Centralized synchronous cleanup, used outside the event loop."""
+    cleanup_network()
+    if server is not None:
+        server.dispose()
 
 
 def signal_handler(sig, frame):
@@ -100,42 +107,44 @@ def signal_handler(sig, frame):
         sys.exit(1)
 
 
-def run_async_loop():
-    """Run the async event loop in a separate thread."""
-    global async_loop
-    async_loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(async_loop)
+def exception_handler(loop, context):
+    """Handle unhandled exceptions in the async loop."""
+    exception = context.get('exception')
+    if exception:
+        logger.error(f"Unhandled exception in async loop: {exception}", exc_info=exception)
+    else:
+        logger.error(f"Async loop error: {context['message']}")
 
-    server.set_async_loop(async_loop)
 
-    def exception_handler(loop, context):
-        """Handle unhandled exceptions in the async loop."""
-        exception = context.get('exception')
-        if exception:
-            logger.error(f"Unhandled exception in async loop: {exception}", exc_info=True)
-        else:
-            logger.error(f"Async loop error: {context['message']}")
+async def run_openarena():
+    """Run the OpenArena server and all its managers on the current event loop."""
+    global server
 
-    async_loop.set_exception_handler(exception_handler)
+    server = Server()
+    loop = asyncio.get_running_loop()
+    loop.set_exception_handler(exception_handler)
 
-    try:
-        logger.info("Starting async event loop")
-        async_loop.run_forever()
-    except Exception as e:
-        logger.error(f"Fatal async loop error: {e}", exc_info=True)
-    finally:
-        logger.info("Async event loop closing")
-        async_loop.close()
+    stop_requested = asyncio.Event()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop_requested.set)
+
+    server_task = asyncio.create_task(server.run(), name="oa-server")
+    stop_task = asyncio.create_task(stop_requested.wait(), name="oa-stop")
 
-def run_server_thread():
-    """Run server in background thread."""
     try:
-        server.start_server()
-        logger.info("Server process started successfully")
-        server.run_server_loop()
-    except Exception as e:
-        logger.error(f"Server thread error: {e}")
-        cleanup()
+        await asyncio.wait({server_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+        if stop_requested.is_set():
+            logger.warning("Shutdown signal received. Starting graceful shutdown...")
+    finally:
+        logger.info("Application is shutting down.")
+        stop_task.cancel()
+        cleanup_network()
+        try:
+            await asyncio.wait_for(server.shutdown(), timeout=10)
+        except asyncio.TimeoutError:
+            logger.error("Server shutdown timed out")
+        server_task.cancel()
+        await asyncio.gather(server_task, return_exceptions=True)
 
 
 async def run_dota2_adapter():
@@ -152,14 +161,24 @@ async def run_dota2_adapter():
         return
 
     logger.info("Connected to Dota 2 server, starting message loop...")
+    processor = Dota2MessageProcessor(game_adapter.send_command_sync)
+    game_adapter.track_game_state(processor.get_current_game_state)
 
     try:
         async for message in game_adapter.read_messages():
-            if message:
-                logger.info(f"[DOTA2] {message[:100]}...")
+            if not message:
+                continue
+            parsed = processor.process_message(message)
+            if parsed.message_type == MessageType.UNKNOWN:
+                logger.debug(f"[DOTA2] {message[:100]}")
+            else:
+                logger.info(f"[DOTA2] {parsed.message_type.name}: {message[:100]}")
     except Exception as e:
         logger.error(f"Dota 2 adapter error: {e}")
     finally:
+        poll_stats = game_adapter.get_poll_stats()
+        if poll_stats["polls"]:
+            logger.info(f"Dota 2 status polling: {poll_stats}")
         await game_adapter.disconnect()
 
 
@@ -175,10 +194,83 @@ def run_dota2_thread():
         loop.close()
 
 
+def run_analyze(results_dir: str, as_json: bool) -> int:
+    """Summarise every results file under results_dir and print it."""
+    from core.analytics import AnalyticsUnavailable, analyze_results, format_summary
+
+    try:
+        summary = analyze_results(results_dir)
+    except AnalyticsUnavailable as e:
+        logger.error(str(e))
+        return 1
+
+    if not summary["rows"]:
+        logger.warning(f"No results found in {results_dir}")
+        return 1
+
+    print(json.dumps(summary, indent=2) if as_json else format_summary(summary))
+    return 0
+
+
+async def run_fleet_command(command: str, spec: str, deadline: float, as_json: bool) -> int:
+    """Run one RCON command on every server of the fleet at once and print the replies."""
+    from tabulate import tabulate
+    from core.adapters.dota2.fleet import RCONFleet, parse_fleet_spec, summarize_results
+
+    servers = parse_fleet_spec(spec, settings.dota2_rcon_password, settings.dota2_rcon_port)
+    if not servers:
+        logger.error("No fleet servers given (--servers or DOTA2_FLEET)")
+        return 1
+
+    async with RCONFleet(servers, deadline=deadline) as fleet:
+        results = await fleet.broadcast(command)
+
+    summary = summarize_results(results)
+    if as_json:
+        print(json.dumps({"summary": summary, "results": [vars(result) for result in results]}, indent=2))
+    else:
+        rows = [
+            [result.server, "ok" if result.ok else "FAILED", f"{result.elapsed_ms:.0f}",
+             (result.response or "").strip()[:60] if result.ok else result.error]
+            for result in results
+        ]
+        print(tabulate(rows, headers=["Server", "Result", "ms", "Reply"], tablefmt="grid"))
+        print(f"{summary['ok']}/{summary['servers']} servers ok")
+    return 0 if not summary["failed"] else 2
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="ASTRID server management")
+    subcommands = parser.add_subparsers(dest="command")
+
+    analyze = subcommands.add_parser("analyze", help="Summarise experiment results and exit")
+    analyze.add_argument("--results-dir", default=settings.results_dir, help="Directory with results files")
+    analyze.add_argument("--json", action="store_true", help="Print the summary as JSON")
+
+    rcon = subcommands.add_parser("rcon", help="Run one RCON command on a fleet of Dota 2 servers and exit")
+    rcon.add_argument("rcon_command", metavar="COMMAND", help='e.g. "say hello" or dota_pause')
+    rcon.add_argument("--servers", default=settings.dota2_fleet, help="host[:port],password@host[:port],...")
+    rcon.add_argument("--deadline", type=float, default=settings.dota2_fleet_deadline,
+                      help="Seconds each server gets before it counts as failed")
+    rcon.add_argument("--json", action="store_true", help="Print the results as JSON")
+
+    return parser.parse_args(argv)
+
+
 def main():
     """Main execution function."""
-    signal.signal(signal.SIGINT, signal_handler)
-    signal.signal(signal.SIGTERM, signal_handler)
+    configure_logging(
+        level=settings.log_level,
+        sample_rates=parse_sample_rates(settings.log_sample_rates),
+    )
+    # Register available game adapters
+    register_default_adapters()
+
+    args = parse_args()
+    if args.command == "analyze":
+        sys.exit(run_analyze(args.results_dir, args.json))
+    if args.command == "rcon":
+        sys.exit(asyncio.run(run_fleet_command(args.rcon_command, args.servers, args.deadline, args.json)))
 
     game_type = settings.game_type
     logger.info(f"Starting ASTRID Server Management System")
@@ -188,6 +280,8 @@ def main():
     if game_type == "dota2":
         # Dota 2 mode - use RCON adapter
         logger.info("Running in Dota 2 RCON mode")
+        signal.signal(signal.SIGINT, signal_handler)
+        signal.signal(signal.SIGTERM, signal_handler)
 
         dota2_thread = threading.Thread(target=run_dota2_thread, name="Dota2Thread")
         dota2_thread.start()
@@ -200,29 +294,19 @@ def main():
             if game_adapter:
                 game_adapter.request_shutdown()
 
+    elif settings.oa_instances > 1:
+        # Several OpenArena instances, one manager process each
+        logger.info(f"Running {settings.oa_instances} OpenArena instances under the supervisor")
+        ServerSupervisor.from_settings().run()
+
     else:
-        # OpenArena mode - use existing Server class
+        # OpenArena mode - Server, OBS and bots share one event loop
         logger.info("Running in OpenArena mode")
 
-        async_thread = threading.Thread(target=run_async_loop, daemon=True)
-        async_thread.start()
-
-        time.sleep(0.2)
-
-        server_thread = threading.Thread(target=run_server_thread, name="ServerThread")
-        server_thread.start()
-
         try:
-            while not server.is_shutdown_requested():
-                time.sleep(1)
+            asyncio.run(run_openarena())
         except Exception as e:
             logger.critical(f"An unhandled exception occurred: {e}", exc_info=True)
-        finally:
-            logger.info("Application is shutting down.")
-            cleanup()
-            if async_loop and async_loop.is_running():
-                async_thread.join(timeout=2)
-            server_thread.join(timeout=5)
 
 
 if __name__ == "__main__":
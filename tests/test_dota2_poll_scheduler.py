@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""Test that adaptive Dota 2 status polling follows the game state it polls over RCON (no game needed)."""
+
+import asyncio
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.adapters.base import GameAdapterConfig, MessageType
+from core.adapters.dota2.adapter import Dota2GameAdapter
+from core.adapters.dota2.message_processor import Dota2MessageProcessor
+from core.adapters.dota2.poll_scheduler import PollScheduler, parse_game_state
+
+STATUS = """hostname: Test Server
+map     : dota
+players : 1 humans, 0 bots (10 max)
+# userid name uniqueid connected ping loss state rate
+#  2 "Alice" [U:1:1001] 00:10 40 0 active 80000
+"""
+
+
+class FakeRCON:
+    """Answers `status` with a fixed table and the game state command with the next scripted state."""
+
+    is_authenticated = True
+
+    def __init__(self, states):
+        self.states = list(states)
+        self.commands = []
+
+    async def get_status(self):
+        return await self.execute("status")
+
+    async def execute(self, command):
+        self.commands.append(command)
+        if command == "status":
+            return STATUS
+        state = self.states.pop(0) if len(self.states) > 1 else self.states[0]
+        return f"dota_gamerules_state = {state}" if state else "Unknown command \"dota_gamerules_state\""
+
+
+def adapter_with(states, game_state_command="dota_gamerules_state"):
+    adapter = Dota2GameAdapter(GameAdapterConfig(
+        game_type="dota2", poll_interval=0.02, poll_min_interval=0.01, poll_max_interval=0.05,
+        game_state_command=game_state_command,
+    ))
+    adapter.rcon = FakeRCON(states)
+    return adapter
+
+
+async def collect(adapter, processor, polls):
+    """Process `polls` polls; returns the parsed lines and the (state, next interval) after each poll."""
+    scheduler = adapter.poll_scheduler
+    record_poll = scheduler.record_poll
+    intervals = []
+
+    def recording(*args, **kwargs):
+        changed = record_poll(*args, **kwargs)
+        intervals.append((scheduler.state, scheduler.next_interval()))
+        if len(intervals) == polls:
+            adapter._polling = False
+        return changed
+
+    scheduler.record_poll = recording
+    messages = [processor.process_message(line) async for line in adapter.read_messages()]
+    return messages, intervals
+
+
+def test_parse_game_state():
+    assert parse_game_state("dota_gamerules_state = DOTA_GAMERULES_STATE_PRE_GAME") == "PRE_GAME"
+    assert parse_game_state("Unknown command") is None
+    assert parse_game_state(None) is None
+    print("  ✓ game state parsed from the RCON reply")
+
+
+def test_poll_interval_follows_polled_state():
+    adapter = adapter_with([
+        "DOTA_GAMERULES_STATE_GAME_IN_PROGRESS",
+        "DOTA_GAMERULES_STATE_GAME_IN_PROGRESS",
+        "DOTA_GAMERULES_STATE_GAME_IN_PROGRESS",
+        "DOTA_GAMERULES_STATE_POST_GAME",
+    ])
+    processor = Dota2MessageProcessor(lambda command: None)
+    messages, intervals = asyncio.run(collect(adapter, processor, polls=4))
+
+    # The processor sees the polled states as ordinary state change lines
+    types = [m.message_type for m in messages if m.message_type != MessageType.STATUS_UPDATE]
+    assert types == [MessageType.GAME_START, MessageType.GAME_END], types
+    assert processor.get_current_game_state() == "POST_GAME"
+
+    # Backs off past the base interval during the game, drops to the floor on POST_GAME
+    states = [state for state, _ in intervals]
+    assert states == ["GAME_IN_PROGRESS"] * 3 + ["POST_GAME"], states
+    assert intervals[2][1] > adapter.poll_scheduler.base_interval, intervals
+    assert intervals[3][1] == adapter.poll_scheduler.min_interval, intervals
+    print("  ✓ poll interval follows the game state polled over RCON")
+
+
+def test_unsupported_command_is_dropped():
+    adapter = adapter_with([None])
+    processor = Dota2MessageProcessor(lambda command: None)
+    _, intervals = asyncio.run(collect(adapter, processor, polls=3))
+
+    assert adapter.rcon.commands.count("dota_gamerules_state") == 1, adapter.rcon.commands
+    assert [state for state, _ in intervals] == [None] * 3
+    print("  ✓ a server without the game state command is polled for status only")
+
+
+def test_scheduler_bounds():
+    scheduler = PollScheduler(base_interval=5.0, min_interval=0.5, max_interval=30.0, backoff=2.0)
+    scheduler.record_poll("a", "HERO_SELECTION", now=0.0)
+    scheduler.record_poll("a", "STRATEGY_TIME", now=1.0)
+    assert scheduler.next_interval() == 0.5
+    for now in range(2, 10):
+        scheduler.record_poll("a", "STRATEGY_TIME", now=float(now))
+    assert scheduler.next_interval() == 5.0
+    for now in range(10, 20):
+        scheduler.record_poll("a", "GAME_IN_PROGRESS", now=float(now))
+    assert scheduler.next_interval() == 30.0
+    print("  ✓ timed phases poll fast and cap at the base interval, others back off to the max")
+
+
+if __name__ == "__main__":
+    print("Dota 2 poll scheduler test")
+    test_parse_game_state()
+    test_poll_interval_follows_polled_state()
+    test_unsupported_command_is_dropped()
+    test_scheduler_bounds()
+    print("✓ All tests passed!")
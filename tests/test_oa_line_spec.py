@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+"""Test the shared OpenArena line table and benchmark it against a sequential regex chain."""
+
+import gc
+import logging
+import random
+import re
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.adapters.openarena.message_processor import OAMessageProcessor
+from core.messaging.line_spec import OA_LINE_MATCHER, OA_LINE_RULES
+from core.adapters.base import UNKNOWN_MESSAGE as ADAPTER_UNKNOWN
+from core.messaging.message_processor import UNKNOWN_MESSAGE, MessageProcessor
+
+STATUS_BLOCK = [
+    "map: oa_dm1",
+    "num score ping name            lastmsg address               qport rate",
+    "--- ----- ---- --------------- ------- --------------------- ----- -----",
+    "  0     0    0 Sarge^7               0 bot                       0 16384",
+    "  1     5   42 Alice^7               0 10.0.0.5:27960        1234 25000",
+    "  2     5   42 Bob^7                 0 10.0.0.6:27960        1234 25000",
+    # Blank lines are dropped before parsing; the next non-client line ends the block
+    "say: Alice: gg",
+]
+
+EVENT_LINES = [
+    "Client 3 connecting with 50 challenge ping",
+    "ClientDisconnect: 3",
+    "------- Game Initialization -------",
+    "Exit: Fraglimit hit.",
+    "Exit: Timelimit hit.",
+    "Warmup: 10",
+    "ShutdownGame:",
+]
+
+# A match log is mostly kills and lines nobody parses
+TRAFFIC = (["Kill: 0 1 10: Alice killed Bob by MOD_RAILGUN"] * 60
+           + ["Item: 1 weapon_railgun"] * 15
+           + ["say: Alice: gg"] * 5
+           + ["ClientUserinfoChanged: 2 n\\Bob\\t\\0"] * 5
+           + EVENT_LINES)
+
+
+def legacy_match(line: str):
+    """The previous parsers' approach: try every regex in turn, then convert the groups."""
+    for rule, regex in LEGACY_CHAIN:
+        match = regex.match(line)
+        if match:
+            return rule.event, {name: convert(value) for (name, convert), value in zip(rule.fields, match.groups())}
+    return None
+
+
+LEGACY_CHAIN = [(rule, re.compile(rule.pattern)) for rule in OA_LINE_RULES]
+
+
+def test_matcher_fields():
+    assert OA_LINE_MATCHER.match("Kill: 0 1 10: A killed B by MOD_RAILGUN") == (
+        "player_kill", {"killer": 0, "victim": 1, "mod": 10})
+    assert OA_LINE_MATCHER.match("Client 3 connecting with 50 challenge ping") == (
+        "client_connecting", {"client_id": 3, "challenge_ping": 50})
+    assert OA_LINE_MATCHER.match("Warmup:") == ("warmup", {"info": ""})
+    assert OA_LINE_MATCHER.match("Exit: something else") is None
+    assert OA_LINE_MATCHER.match("Kil") is None
+
+    for line in TRAFFIC + ["Kill: x", "Client 3 connecting", "random text", ""]:
+        legacy = legacy_match(line)
+        matched = OA_LINE_MATCHER.match(line)
+        assert (legacy and legacy[0]) == (matched and matched[0]), line
+    print("  ✓ prefix index matches the same rules as the sequential chain")
+
+
+def test_processors_agree():
+    server = MessageProcessor(lambda command: None)
+    adapter = OAMessageProcessor(lambda command: None)
+    # The two MessageType enums name events differently; both must recognize the same lines
+    for line in EVENT_LINES + ["Kill: 0 1 10: A killed B by MOD_RAILGUN", "random text"]:
+        recognized = (server.parse_message(line).message_type.name != "UNKNOWN",
+                      adapter.process_message(line).message_type.name != "UNKNOWN")
+        assert recognized == ((line != "random text"),) * 2, line
+
+    for processor, parse in ((server, server.parse_message), (adapter, adapter.process_message)):
+        results = [parse(line) for line in STATUS_BLOCK]
+        complete = results[-1]
+        assert complete.data.get("status_complete"), processor
+        clients = complete.data["client_data"]
+        assert [client["client_id"] for client in clients] == [0, 1, 2]
+        assert [client["type"] for client in clients] == ["BOT", "HUMAN", "HUMAN"]
+    print("  ✓ server and adapter processors parse the same events and status blocks")
+
+
+def run_benchmark(lines: int = 200000):
+    random.seed(0)
+    corpus = [random.choice(TRAFFIC) for _ in range(lines)]
+
+    started = time.perf_counter()
+    for line in corpus:
+        legacy_match(line)
+    legacy = time.perf_counter() - started
+
+    match = OA_LINE_MATCHER.match
+    started = time.perf_counter()
+    for line in corpus:
+        match(line)
+    indexed = time.perf_counter() - started
+
+    processor = MessageProcessor(lambda command: None)
+    started = time.perf_counter()
+    for line in corpus:
+        processor.parse_message(line)
+    full = time.perf_counter() - started
+
+    per_line = lambda seconds: seconds / lines * 1e6
+    print(f"  sequential regex chain: {per_line(legacy):.2f} us/line")
+    print(f"  prefix-indexed table:   {per_line(indexed):.2f} us/line ({legacy / indexed:.1f}x)")
+    print(f"  MessageProcessor:       {per_line(full):.2f} us/line")
+    return legacy, indexed
+
+
+def test_benchmark():
+    run_benchmark(lines=20000)
+
+
+def allocated_blocks(parse, lines) -> int:
+    """Memory blocks still allocated after parsing `lines`, with every result kept alive."""
+    results = [None] * len(lines)
+    gc.collect()
+    gc.disable()
+    try:
+        before = sys.getallocatedblocks()
+        for i, line in enumerate(lines):
+            results[i] = parse(line)
+        return sys.getallocatedblocks() - before
+    finally:
+        gc.enable()
+
+
+def run_allocation_benchmark(lines: int = 10000):
+    random.seed(0)
+    corpora = {
+        "match traffic": [random.choice(TRAFFIC) for _ in range(lines)],
+        "unparsed lines": [random.choice(("Item: 1 weapon_railgun", "say: Alice: gg")) for _ in range(lines)],
+    }
+    counts = {}
+    for name, corpus in corpora.items():
+        for processor, parse in ((MessageProcessor(lambda command: None), "parse_message"),
+                                 (OAMessageProcessor(lambda command: None), "process_message")):
+            blocks = allocated_blocks(getattr(processor, parse), corpus)
+            counts[name, type(processor).__name__] = blocks
+            print(f"  {name:<15} {type(processor).__name__:<19} {blocks * 10000 / lines:>8.0f} blocks / 10k lines")
+    return counts
+
+
+def test_unknown_lines_allocate_nothing():
+    server = MessageProcessor(lambda command: None)
+    adapter = OAMessageProcessor(lambda command: None)
+    assert server.parse_message("say: Alice: gg") is UNKNOWN_MESSAGE
+    assert adapter.process_message("say: Alice: gg") is ADAPTER_UNKNOWN
+    try:
+        UNKNOWN_MESSAGE.data["leak"] = True
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("shared message data is writable")
+
+    counts = run_allocation_benchmark(lines=10000)
+    # Was two blocks per line (message object and its data dict)
+    assert counts["unparsed lines", "MessageProcessor"] < 100
+    assert counts["unparsed lines", "OAMessageProcessor"] < 100
+
+
+if __name__ == "__main__":
+    logging.disable(logging.CRITICAL)
+    print("OpenArena line table test")
+    test_matcher_fields()
+    test_processors_agree()
+    print("Microbenchmark: match log traffic")
+    run_benchmark()
+    print("Allocations: parsed messages kept alive")
+    test_unknown_lines_allocate_nothing()
+    print("✓ All tests passed!")
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""Test the Quake 3 UDP query client against a local fake oa_ded responder."""
+
+import asyncio
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.adapters.openarena.query_client import (
+    OOB_HEADER,
+    Q3QueryClient,
+    parse_infostring,
+)
+
+
+class FakeQ3Server(asyncio.DatagramProtocol):
+    """Answers getstatus/getinfo like oa_ded, echoing the challenge."""
+
+    def __init__(self, map_name: str, players, silent: bool = False):
+        self.map_name = map_name
+        self.players = players
+        self.silent = silent
+        self.requests = 0
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.requests += 1
+        if self.silent or not data.startswith(OOB_HEADER):
+            return
+
+        command, _, challenge = data[len(OOB_HEADER):].decode().partition(" ")
+        info = (
+            f"\\challenge\\{challenge.strip()}\\mapname\\{self.map_name}"
+            f"\\sv_maxclients\\8\\clients\\{len(self.players)}\\hostname\\fake"
+        )
+        if command == "getstatus":
+            lines = [f'{score} {ping} "{name}"' for score, ping, name in self.players]
+            body = "statusResponse\n" + info + "\n" + "".join(line + "\n" for line in lines)
+        elif command == "getinfo":
+            body = "infoResponse\n" + info
+        else:
+            return
+        self.transport.sendto(OOB_HEADER + body.encode(), addr)
+
+
+async def start_fake(map_name, players, silent=False):
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: FakeQ3Server(map_name, players, silent), local_addr=("127.0.0.1", 0)
+    )
+    return transport, protocol, transport.get_extra_info("sockname")[1]
+
+
+async def run_status_and_info():
+    transport, _, port = await start_fake("oa_dm1", [(5, 42, "Alice^7"), (0, 0, "Sarge")])
+    try:
+        async with Q3QueryClient(timeout=0.5) as client:
+            status = await client.get_status("127.0.0.1", port)
+            assert status is not None, "no statusResponse"
+            assert status.map_name == "oa_dm1"
+            assert status.max_clients == 8
+            assert [p.name for p in status.players] == ["Alice^7", "Sarge"]
+            assert status.players[0].ping == 42 and status.human_count == 1
+
+            info = await client.get_info("127.0.0.1", port)
+            assert info is not None and info.clients == 2 and info.map_name == "oa_dm1"
+            assert await client.is_alive("127.0.0.1", port)
+    finally:
+        transport.close()
+    print("  ✓ getstatus/getinfo parsed")
+
+
+async def run_many_servers_one_socket():
+    fakes = [await start_fake(f"map{i}", [(i, 10 * i + 1, f"P{i}")]) for i in range(20)]
+    silent_transport, silent, silent_port = await start_fake("none", [], silent=True)
+    try:
+        addresses = [("127.0.0.1", port) for _, _, port in fakes] + [("127.0.0.1", silent_port)]
+        async with Q3QueryClient(timeout=0.3, retries=1) as client:
+            results = await client.status_many(addresses)
+        for i, (_, _, port) in enumerate(fakes):
+            assert results[("127.0.0.1", port)].map_name == f"map{i}"
+        assert results[("127.0.0.1", silent_port)] is None
+        assert silent.requests == 2, "expected one retry for the silent server"
+    finally:
+        for transport, _, _ in fakes:
+            transport.close()
+        silent_transport.close()
+    print("  ✓ 20 servers queried concurrently, silent server timed out after retry")
+
+
+def test_parse_infostring():
+    assert parse_infostring("\\a\\1\\b\\two words") == {"a": "1", "b": "two words"}
+    assert parse_infostring("") == {}
+
+
+def test_status_and_info():
+    asyncio.run(run_status_and_info())
+
+
+def test_many_servers_one_socket():
+    asyncio.run(run_many_servers_one_socket())
+
+
+if __name__ == "__main__":
+    print("Quake 3 query client test")
+    test_parse_infostring()
+    test_status_and_info()
+    test_many_servers_one_socket()
+    print("✓ All tests passed!")
@@ -0,0 +1,147 @@
+#!/usr/bin/env python
+"""Test the sans-IO RCON codec and benchmark it against per-packet readexactly parsing."""
+
+import asyncio
+import struct
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.adapters.dota2.rcon_client import RCONPacketType, SourceRCONClient
+from core.adapters.dota2.rcon_codec import RCONPacketParser, RCONProtocolError, encode_packet
+
+PASSWORD = "secret"
+
+
+def cvarlist_response(request_id: int, packets: int = 200, body_size: int = 4096) -> bytes:
+    """A large multi-packet response like `cvarlist` on a Source server."""
+    line = "sv_cheats                                : 0        : , \"sv\", \"rep\"    : Allow cheats\n"
+    body = (line * (body_size // len(line) + 1))[:body_size]
+    return b"".join(encode_packet(request_id, RCONPacketType.SERVERDATA_RESPONSE_VALUE, body)
+                    for _ in range(packets))
+
+
+def test_roundtrip_any_chunking():
+    stream = (encode_packet(1, 3, "password") + encode_packet(2, 2, "status")
+              + encode_packet(3, 0, "héllo\nwörld") + encode_packet(4, 0, ""))
+    expected = [(1, 3, "password"), (2, 2, "status"), (3, 0, "héllo\nwörld"), (4, 0, "")]
+
+    for chunk_size in (1, 3, 7, 64, len(stream)):
+        parser = RCONPacketParser()
+        packets = []
+        for i in range(0, len(stream), chunk_size):
+            packets.extend(parser.feed(stream[i:i + chunk_size]))
+        assert [tuple(p) for p in packets] == expected, chunk_size
+        assert parser.buffered == 0
+
+    try:
+        RCONPacketParser().feed(struct.pack("<i", 3) + b"\x00" * 8)
+    except RCONProtocolError:
+        pass
+    else:
+        raise AssertionError("undersized packet accepted")
+    print("  ✓ packets parse identically for every chunk size")
+
+
+class FakeRCONServer:
+    """Accepts the password and answers `cvarlist` with a multi-packet response in one write."""
+
+    async def handle(self, reader, writer):
+        parser = RCONPacketParser()
+        while True:
+            data = await reader.read(4096)
+            if not data:
+                break
+            for request_id, packet_type, body in parser.feed(data):
+                if packet_type == RCONPacketType.SERVERDATA_AUTH:
+                    writer.write(encode_packet(request_id, RCONPacketType.SERVERDATA_RESPONSE_VALUE, ""))
+                    auth_id = request_id if body == PASSWORD else -1
+                    writer.write(encode_packet(auth_id, RCONPacketType.SERVERDATA_AUTH_RESPONSE, ""))
+                elif body == "cvarlist":
+                    writer.write(cvarlist_response(request_id))
+            await writer.drain()
+        writer.close()
+
+
+async def run_client_against_fake():
+    server = await asyncio.start_server(FakeRCONServer().handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        client = SourceRCONClient("127.0.0.1", port, PASSWORD, timeout=2.0, response_timeout=0.2)
+        await client.connect()
+        response = await client.execute("cvarlist")
+        assert len(response) == 200 * 4096
+        chunks = client._protocol.chunks_received
+        await client.disconnect()
+    finally:
+        server.close()
+        await server.wait_closed()
+    print(f"  ✓ 200-packet cvarlist response received in {chunks} chunk(s)")
+
+
+def test_client_against_fake():
+    asyncio.run(run_client_against_fake())
+
+
+async def legacy_parse(stream: bytes, chunk_size: int) -> int:
+    """The previous client's approach: two readexactly awaits and slice copies per packet."""
+    reader = asyncio.StreamReader(limit=len(stream) + 1)
+    for i in range(0, len(stream), chunk_size):
+        reader.feed_data(stream[i:i + chunk_size])
+    reader.feed_eof()
+    count = 0
+    while not reader.at_eof():
+        size = struct.unpack("<i", await reader.readexactly(4))[0]
+        body_data = await reader.readexactly(size)
+        struct.unpack("<ii", body_data[:8])
+        body_data[8:-2].decode("utf-8", errors="replace")
+        count += 1
+    return count
+
+
+def codec_parse(stream: bytes, chunk_size: int) -> int:
+    parser = RCONPacketParser()
+    count = 0
+    for i in range(0, len(stream), chunk_size):
+        count += len(parser.feed(stream[i:i + chunk_size]))
+    return count
+
+
+def run_benchmark(rounds: int = 20):
+    stream = cvarlist_response(7)
+    # Typical TCP read sizes for a burst of large packets
+    chunk_size = 64 * 1024
+    packets = len(stream) // (4096 + 14)
+
+    async def time_legacy():
+        started = time.perf_counter()
+        for _ in range(rounds):
+            assert await legacy_parse(stream, chunk_size) == packets
+        return time.perf_counter() - started
+
+    legacy = asyncio.run(time_legacy())
+    started = time.perf_counter()
+    for _ in range(rounds):
+        assert codec_parse(stream, chunk_size) == packets
+    codec = time.perf_counter() - started
+
+    per_packet = lambda seconds: seconds / (rounds * packets) * 1e6
+    print(f"  legacy readexactly: {per_packet(legacy):.2f} us/packet")
+    print(f"  sans-IO codec:      {per_packet(codec):.2f} us/packet ({legacy / codec:.1f}x)")
+    return legacy, codec
+
+
+def test_benchmark():
+    run_benchmark(rounds=3)
+
+
+if __name__ == "__main__":
+    print("RCON codec test")
+    test_roundtrip_any_chunking()
+    test_client_against_fake()
+    print("Microbenchmark: 200 x 4 KiB response packets")
+    run_benchmark()
+    print("✓ All tests passed!")
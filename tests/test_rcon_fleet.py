@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+"""Test that an RCON fleet broadcast finishes within one deadline when some servers are silent or dead."""
+
+import asyncio
+import socket
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.adapters.dota2.fleet import FleetServer, RCONFleet, summarize_results
+from tests.test_rcon_codec import PASSWORD, FakeRCONServer
+
+HEALTHY = 10
+DEADLINE = 2.0
+
+
+async def silent_handler(reader, writer):
+    """Accepts the connection and reads forever without ever answering."""
+    while await reader.read(4096):
+        pass
+    writer.close()
+
+
+def dead_port() -> int:
+    """A local port with nothing listening on it."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def run_broadcast():
+    servers = [await asyncio.start_server(FakeRCONServer().handle, "127.0.0.1", 0) for _ in range(HEALTHY)]
+    servers.append(await asyncio.start_server(silent_handler, "127.0.0.1", 0))
+    fleet_servers = [
+        FleetServer(f"fake{i}", "127.0.0.1", server.sockets[0].getsockname()[1], PASSWORD)
+        for i, server in enumerate(servers[:HEALTHY])
+    ]
+    fleet_servers.append(FleetServer("silent", "127.0.0.1", servers[-1].sockets[0].getsockname()[1], PASSWORD))
+    fleet_servers.append(FleetServer("dead", "127.0.0.1", dead_port(), PASSWORD))
+
+    try:
+        async with RCONFleet(fleet_servers, deadline=DEADLINE, response_timeout=0.2) as fleet:
+            rounds = []
+            # The second round reconnects the failed servers, which must not stall the batch either
+            for _ in range(2):
+                started = time.perf_counter()
+                results = await fleet.broadcast("cvarlist")
+                rounds.append((summarize_results(results), time.perf_counter() - started, results))
+            status = fleet.get_status()
+    finally:
+        for server in servers:
+            server.close()
+    return rounds, status
+
+
+def test_slow_or_dead_servers_never_stall_the_batch():
+    rounds, status = asyncio.run(run_broadcast())
+
+    for summary, elapsed, results in rounds:
+        assert summary["servers"] == HEALTHY + 2
+        assert summary["ok"] == HEALTHY, summary
+        assert summary["failed"] == ["silent", "dead"], summary
+        assert all(len(result.response) == 200 * 4096 for result in results if result.ok)
+        # Every server runs concurrently, so the batch takes about one deadline, not one per server
+        assert elapsed < DEADLINE * 1.5, f"batch took {elapsed:.2f}s"
+        print(f"  ✓ {summary['ok']}/{summary['servers']} ok in {elapsed * 1000:.0f}ms "
+              f"(deadline {DEADLINE * 1000:.0f}ms, slowest reply {summary['slowest_ms']}ms)")
+
+    failures = {entry["server"]: entry["consecutive_failures"] for entry in status}
+    assert failures["silent"] == 2 and failures["dead"] == 2
+    assert all(failures[f"fake{i}"] == 0 for i in range(HEALTHY))
+    print("  ✓ failures are counted per server")
+
+
+if __name__ == "__main__":
+    print("RCON fleet test")
+    test_slow_or_dead_servers_never_stall_the_batch()
+    print("✓ All tests passed!")
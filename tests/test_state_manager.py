@@ -0,0 +1,82 @@
+#!/usr/bin/env python
+"""Test the GameStateManager transition table, its hooks and per-round dwell times."""
+
+import logging
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.game.state_manager import GameEvent, GameState, GameStateManager
+
+
+def test_round_cycle():
+    manager = GameStateManager(lambda command: None)
+    manager.max_rounds = 5
+    seen = []
+    manager.add_transition_hook(seen.append)
+
+    # Server output of one round: map load, warmup, match, next map load
+    assert manager.handle_warmup_detected() == {"state_changed": True, "actions": []}
+    time.sleep(0.02)
+    start = manager.handle_match_start_detected()
+    assert start["actions"] == ["start_match_recording", "apply_latency"]
+    assert manager.current_state == GameState.WAITING
+    manager.handle_game_initialization_detected()
+    assert manager.current_state == GameState.RUNNING
+    time.sleep(0.05)
+    end = manager.handle_match_shutdown_detected()
+    assert end["round_completed"] and end["actions"] == ["rotate_latency"]
+    assert manager.current_state == GameState.WAITING and manager.round_count == 2
+
+    assert [(t.from_state, t.event, t.to_state) for t in seen] == [
+        (GameState.WAITING, GameEvent.WARMUP, GameState.WARMUP),
+        (GameState.WARMUP, GameEvent.MATCH_START, GameState.WAITING),
+        (GameState.WAITING, GameEvent.GAME_INITIALIZATION, GameState.RUNNING),
+        (GameState.RUNNING, GameEvent.MATCH_END, GameState.WAITING),
+    ]
+    assert all(t.round == 1 for t in seen)
+
+    dwell = manager.round_dwell_times[1]
+    assert 0.02 <= dwell["warmup"] < 0.2 and 0.05 <= dwell["running"] < 0.3, dwell
+    assert manager.get_round_dwell(1) == dwell
+    assert manager.get_round_dwell()["running"] == 0.0
+    print(f"  ✓ one round through the table, dwell {dwell}")
+
+
+def test_illegal_transitions_rejected():
+    manager = GameStateManager(lambda command: None)
+    assert manager.handle_match_shutdown_detected()["round_completed"] is False
+    assert manager.handle_match_start_detected() == {"state_changed": False, "actions": []}
+    assert manager.current_state == GameState.WAITING and manager.round_count == 1
+    assert manager.rejected_transitions == 2
+    try:
+        manager.current_state = GameState.RUNNING
+    except AttributeError:
+        pass
+    else:
+        raise AssertionError("current_state is writable")
+    print("  ✓ illegal transitions leave the state alone")
+
+
+def test_experiment_finishes():
+    manager = GameStateManager(lambda command: None)
+    manager.max_rounds = 2
+    manager.reset(GameState.RUNNING)
+    assert not manager.is_experiment_finished()
+    assert manager.handle_match_shutdown_detected()["experiment_finished"]
+    # The final MATCH_END leaves the state in WAITING; the experiment still counts as finished
+    assert manager.current_state == GameState.WAITING and manager.is_experiment_finished()
+    assert set(manager.round_dwell_times) == {1}
+    print("  ✓ last round finishes the experiment")
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.WARNING)
+    print("Game state machine test")
+    test_round_cycle()
+    test_illegal_transitions_rejected()
+    test_experiment_finishes()
+    print("✓ All tests passed!")
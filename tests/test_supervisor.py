@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""Test the supervisor's restart budget and backoff against fake instance processes (no server needed)."""
+
+import sys
+import os
+import time
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.adapters.openarena.adapter import OAGameAdapter
+from core.server.supervisor import (
+    EXIT_CRASHED, EXIT_FINISHED, EXIT_GAVE_UP, InstanceSpec, ServerSupervisor, build_instance_specs,
+)
+
+
+class FakeProcess:
+    def __init__(self, exitcode=None):
+        self.exitcode = exitcode
+
+    def is_alive(self):
+        return self.exitcode is None
+
+
+class FakeSupervisor(ServerSupervisor):
+    """Starts FakeProcesses that exit with the next scripted code."""
+
+    def __init__(self, exitcodes, **kwargs):
+        super().__init__([InstanceSpec(0, 27960, "/tmp/oa0", "t_server.cfg")],
+                         status_file="", poll_interval=0.01, **kwargs)
+        self.exitcodes = list(exitcodes)
+        self.started_at = []
+
+    def _start_instance(self, instance_id):
+        self.started_at.append(time.monotonic())
+        self._processes[instance_id] = FakeProcess(self.exitcodes.pop(0) if self.exitcodes else None)
+
+
+def poll_for(supervisor, seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        supervisor.poll()
+        time.sleep(0.005)
+
+
+def test_crashes_back_off_until_the_budget_is_spent():
+    supervisor = FakeSupervisor([EXIT_CRASHED] * 10, max_restarts=3, restart_window=60,
+                                restart_backoff=0.05, restart_backoff_max=1.0)
+    supervisor.start()
+    poll_for(supervisor, 0.6)
+
+    # The first start plus three restarts, 0.05s, 0.1s and 0.2s apart
+    assert len(supervisor.started_at) == 4, supervisor.started_at
+    gaps = [b - a for a, b in zip(supervisor.started_at, supervisor.started_at[1:])]
+    for gap, expected in zip(gaps, (0.05, 0.1, 0.2)):
+        assert expected <= gap < expected + 0.1, gaps
+    status = supervisor.get_aggregate_status()
+    assert status["failed"] == 1 and status["restarts"] == 3, status
+    print("  ✓ crashed instances restart with a doubling delay and are marked failed after the budget")
+
+
+def test_watchdog_give_up_is_terminal():
+    supervisor = FakeSupervisor([EXIT_GAVE_UP], restart_backoff=0.01)
+    supervisor.start()
+    poll_for(supervisor, 0.1)
+
+    assert len(supervisor.started_at) == 1
+    assert supervisor.get_instance_status(0)["failed"]
+    print("  ✓ an instance whose watchdog gave up is not restarted")
+
+
+def test_finished_instance_is_not_restarted():
+    supervisor = FakeSupervisor([EXIT_FINISHED], restart_backoff=0.01)
+    supervisor.start()
+    poll_for(supervisor, 0.1)
+
+    assert len(supervisor.started_at) == 1
+    status = supervisor.get_instance_status(0)
+    assert status["finished"] and not status["failed"]
+    print("  ✓ a finished instance stays stopped")
+
+
+def test_instances_get_their_own_homepath():
+    specs = build_instance_specs(2, base_port=27960, pin_cpus=False)
+    for spec in specs:
+        args = OAGameAdapter(spec.adapter_config()).build_server_args()
+        index = args.index("fs_homepath")
+        assert args[index - 1] == "+set" and args[index + 1] == spec.homepath, args
+        assert os.path.isabs(spec.homepath)
+        assert "com_homepath" not in args
+    assert specs[0].homepath != specs[1].homepath
+    print("  ✓ each instance runs with its own absolute fs_homepath")
+
+
+if __name__ == "__main__":
+    print("Supervisor test")
+    test_crashes_back_off_until_the_budget_is_spent()
+    test_watchdog_give_up_is_terminal()
+    test_finished_instance_is_not_restarted()
+    test_instances_get_their_own_homepath()
+    print("✓ All tests passed!")
@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""Test that the watchdog restarts a crashed server but not one an operator stopped (no oa_ded needed)."""
+
+import asyncio
+import sys
+import os
+
+# Add project root to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import core.utils.settings as settings
+from core.server.server import Server
+from core.server.watchdog import ServerWatchdog
+
+
+class FakeOAAdapter:
+    """Stands in for oa_ded: prints a line every few ms until `killserver` or a crash."""
+
+    def __init__(self):
+        self.is_connected = True
+        self.commands = []
+        self._stopped = asyncio.Event()
+
+    def send_command_sync(self, command):
+        self.commands.append(command)
+        if command == "killserver":
+            self.exit()
+        return True
+
+    def exit(self):
+        self.is_connected = False
+        self._stopped.set()
+
+    async def read_messages(self):
+        while not self._stopped.is_set():
+            yield "Heartbeat"
+            try:
+                await asyncio.wait_for(self._stopped.wait(), timeout=0.01)
+            except asyncio.TimeoutError:
+                pass
+
+
+def build_server():
+    # Nothing on disk: no journal, results or log archive
+    saved = settings.journal_enable, settings.results_enable, settings.log_archive_enable
+    settings.journal_enable = settings.results_enable = settings.log_archive_enable = False
+    try:
+        server = Server()
+    finally:
+        settings.journal_enable, settings.results_enable, settings.log_archive_enable = saved
+    server.adapter = FakeOAAdapter()
+    server.set_output_handler(lambda line: None)
+    server.process_server_message = lambda line: None
+    server.watchdog = ServerWatchdog(server, check_interval=0.01, max_restarts=3)
+    restarts = []
+
+    async def restart_server(stop_timeout=5.0):
+        restarts.append(stop_timeout)
+        server.adapter = FakeOAAdapter()
+        return True
+
+    server.restart_server = restart_server
+    return server, restarts
+
+
+async def run_and(server, action):
+    watch = asyncio.create_task(server.run_until_stopped())
+    await asyncio.sleep(0.05)
+    action()
+    await asyncio.wait_for(watch, timeout=1.0)
+
+
+def test_operator_stop_is_not_restarted():
+    server, restarts = build_server()
+    asyncio.run(run_and(server, server.request_stop))
+
+    assert server.adapter.commands == ["killserver"]
+    assert restarts == [] and server.watchdog.restart_count == 0
+    assert server.is_shutdown_requested()
+    print("  ✓ a server stopped by the operator stays stopped")
+
+
+def test_crash_is_restarted():
+    server, restarts = build_server()
+
+    async def crash_then_stop():
+        watch = asyncio.create_task(server.run_until_stopped())
+        await asyncio.sleep(0.05)
+        server.adapter.exit()
+        await asyncio.sleep(0.1)
+        server.request_stop()
+        await asyncio.wait_for(watch, timeout=1.0)
+
+    asyncio.run(crash_then_stop())
+    assert len(restarts) == 1 and server.watchdog.restart_count == 1
+    assert server.watchdog.last_failure == "process exited"
+    print("  ✓ a server that exits on its own is restarted")
+
+
+if __name__ == "__main__":
+    print("Watchdog test")
+    test_operator_stop_is_not_restarted()
+    test_crash_is_restarted()
+    print("✓ All tests passed!")
@@ -12,12 +12,24 @@ from textual.binding import Binding
 from textual import work
 
 import core.utils.settings as settings
-from core.network.network_utils import NetworkUtils
+from core.network.network_utils import get_network_utils
+from core.messaging.events import (
+    ClientJoined,
+    ClientLeft,
+    ExperimentFinished,
+    ObsStatusChanged,
+    RoundEnded,
+    RoundStarted,
+    ServerRestarted,
+)
+from core.messaging.message_processor import MessageType
 from core.server.server import Server
+from core.analytics import AnalyticsUnavailable, SUMMARY_COLUMNS, analyze_results, summary_table_rows
 from core.adapters import (
     register_default_adapters,
 )
 from core.adapters.dota2.rcon_client import SourceRCONClient
+from core.utils.logging_utils import add_log_handler, configure_logging, parse_sample_rates, remove_log_handler
 
 # Register available game adapters
 register_default_adapters()
@@ -25,7 +37,7 @@ register_default_adapters()
 # OpenArena server (used when game_type is openarena)
 server = Server()
 
-# Dota 2 RCON client (used when game_type is dota2)
+# Dota 2 RCON client (used when game_type is dota2), driven from its own loop thread
 rcon_client: SourceRCONClient | None = None
 rcon_connected = False
 
@@ -34,6 +46,11 @@ async_thread = None
 cleanup_done = False
 game_type = settings.game_type
 
+# Server events arriving within one frame are applied to the widgets together
+FRAME_INTERVAL = 1 / 30
+
+USER_TABLE_COLUMNS = ("ID", "Name", "OBS", "Action")
+
 def cleanup():
     global cleanup_done, rcon_client, rcon_connected
     if cleanup_done:
@@ -60,7 +77,9 @@ def cleanup():
 
     if getattr(settings, 'enable_latency_control', False):
         try:
-            NetworkUtils.dispose(settings.interface)
+            get_network_utils().dispose(
+                server.network_manager.interface, server.network_manager.netns
+            )
         except Exception as e:
             logging.warning(f"Network cleanup skipped: {e}")
 
@@ -73,19 +92,21 @@ def run_async_loop():
     global async_loop
     async_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(async_loop)
-    server.set_async_loop(async_loop)
     async_loop.run_forever()
 
 
 class TUILogHandler(logging.Handler):
-    def __init__(self, log_widget):
+    """Runs on the logging listener thread; hands lines to the app's loop."""
+
+    def __init__(self, app, log_widget):
         super().__init__()
+        self.app = app
         self.log_widget = log_widget
 
     def emit(self, record):
         try:
             msg = self.format(record)
-            self.log_widget.write_line(msg)
+            self.app.call_from_thread(self.log_widget.write_line, msg)
         except Exception as e:
             print(f"TUI log error: {e}", file=sys.stderr)
 
@@ -106,6 +127,14 @@ class AdminApp(App):
     CSS_PATH = "tui_main.tcss"
     BINDINGS = [Binding("q", "quit", "Quit")]
 
+    def __init__(self):
+        super().__init__()
+        self._dirty_clients: set = set()
+        self._resync_clients = False
+        self._status_dirty = False
+        self._flush_scheduled = False
+        self._label_text: dict = {}
+
     def compose(self) -> ComposeResult:
         # Show different controls based on game type
         is_dota2 = game_type == "dota2"
@@ -131,9 +160,11 @@ class AdminApp(App):
                     Horizontal(
                         Button(start_label, id="start-server-btn", variant="success"),
                         Button(stop_label, id="kill-server-btn", variant="error"),
+                        Button("Analyze", id="analyze-btn", variant="default"),
                         id="server-control-buttons",
                     ),
                     DataTable(id="user-table"),
+                    DataTable(id="analytics-table"),
                     id="left-panel",
                 ),
                 Vertical(Log(id="app-log"), Log(id="server-log"), id="right-panel"),
@@ -142,13 +173,17 @@ class AdminApp(App):
             id="main-container",
         )
 
-    @work(thread=True)
-    def run_server_worker(self):
-        """Run server process in background thread using Textual Worker."""
+    @work(exclusive=True, group="oa-server")
+    async def run_server_worker(self):
+        """Run the server on the app's event loop; handlers, OBS and bots share it."""
         logging.info("Server worker starting...")
-        server.start_server()
+        if not await server.start_server():
+            logging.error("OpenArena server failed to start")
+            return
         logging.info("Server process started, entering message loop...")
-        server.run_server_loop()
+        self.update_start_button()
+        await server.run_until_stopped()
+        self.update_start_button()
 
     @work(thread=True)
     def connect_rcon_worker(self):
@@ -189,6 +224,28 @@ class AdminApp(App):
             except Exception as e:
                 logging.error(f"RCON connect error: {e}")
 
+    @work(thread=True, exclusive=True, group="analytics")
+    def run_analytics_worker(self):
+        """Summarise the results written so far without blocking the UI."""
+        try:
+            summary = analyze_results(settings.results_dir)
+        except AnalyticsUnavailable as e:
+            logging.error(str(e))
+            return
+        except Exception as e:
+            logging.error(f"Analytics failed: {e}")
+            return
+        self.call_from_thread(self._update_analytics_table, summary)
+
+    def _update_analytics_table(self, summary: dict):
+        analytics_table = self.query_one("#analytics-table", DataTable)
+        analytics_table.clear()
+        for cells in summary_table_rows(summary):
+            analytics_table.add_row(*cells)
+        analytics_table.border_subtitle = (
+            f"{summary['sessions']} sessions, {summary['rounds']} rounds, {summary['total_ms']}ms"
+        )
+
     def _update_server_log(self, message: str):
         """Update server log from worker thread."""
         try:
@@ -228,21 +285,67 @@ class AdminApp(App):
         user_table = self.query_one("#user-table", DataTable)
         user_table.border_title = "Connected Users"
         user_table.cursor_type = "row"
-        user_table.add_columns("ID", "Name", "OBS", "Action")
+        for column in USER_TABLE_COLUMNS:
+            user_table.add_column(column, key=column)
 
-        handler = TUILogHandler(app_log)
-        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
-        logging.getLogger().addHandler(handler)
-        logging.getLogger().setLevel(logging.INFO)
+        analytics_table = self.query_one("#analytics-table", DataTable)
+        analytics_table.border_title = "Results Summary"
+        analytics_table.add_columns(*(title for title, _, _ in SUMMARY_COLUMNS))
+
+        self.log_handler = TUILogHandler(self, app_log)
+        add_log_handler(self.log_handler, "%(asctime)s - %(levelname)s - %(message)s")
 
         server.set_output_handler(lambda msg: server_log.write_line(msg))
+        # The server runs on this app's loop, so events arrive on the UI thread
+        server.event_bus.subscribe(
+            (ClientJoined, ClientLeft, ObsStatusChanged, RoundStarted, RoundEnded, ExperimentFinished,
+             ServerRestarted, MessageType.WARMUP_STATE, MessageType.GAME_INITIALIZATION, MessageType.SHUTDOWN_GAME),
+            self._on_server_event,
+            name="tui",
+        )
 
         self.update_status_display()
 
-        async_thread = threading.Thread(target=run_async_loop, daemon=True)
-        async_thread.start()
-
-        self.setup_periodic_updates()
+        if game_type == "dota2":
+            async_thread = threading.Thread(target=run_async_loop, daemon=True)
+            async_thread.start()
+
+
+    def on_unmount(self) -> None:
+        # Log records arriving after this would be handed to a loop that is going away
+        remove_log_handler(self.log_handler)
+
+    def _on_server_event(self, event) -> None:
+        """Called inline while the server parses; only records what changed."""
+        if isinstance(event, (ClientJoined, ClientLeft)):
+            self._dirty_clients.add(event.client_id)
+        elif isinstance(event, ObsStatusChanged):
+            self._dirty_clients.update(
+                client_id for client_id, ip in server.network_manager.client_ip_map.items() if ip == event.ip
+            )
+        elif isinstance(event, ServerRestarted):
+            # Slots were forgotten; compare the whole table once
+            self._resync_clients = True
+        self._status_dirty = True
+
+        if not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.set_timer(FRAME_INTERVAL, self._flush_ui_updates)
+
+    def _flush_ui_updates(self) -> None:
+        self._flush_scheduled = False
+        if self._resync_clients:
+            self._resync_clients = False
+            user_table = self.query_one("#user-table", DataTable)
+            self._dirty_clients.update(int(row_key.value) for row_key in user_table.rows)
+            self._dirty_clients.update(server.network_manager.client_type_map)
+        if self._dirty_clients:
+            dirty, self._dirty_clients = self._dirty_clients, set()
+            self.update_user_rows(dirty)
+        if self._status_dirty:
+            self._status_dirty = False
+            self.update_status_display()
+            self.update_start_button()
 
     def on_input_submitted(self, message: Input.Submitted) -> None:
         input_id = message.input.id
@@ -311,30 +414,46 @@ class AdminApp(App):
                 current_round = server.game_state_manager.round_count
                 max_rounds = server.game_state_manager.max_rounds
 
-            state_label.update(f"State: {current_state}")
-            round_label.update(f"Round: {current_round}/{max_rounds}")
+            for label, text in ((state_label, f"State: {current_state}"),
+                                (round_label, f"Round: {current_round}/{max_rounds}")):
+                if self._label_text.get(label.id) != text:
+                    self._label_text[label.id] = text
+                    label.update(text)
         except Exception as e:
             logging.error(f"Error updating status display: {e}")
 
-    def update_user_table(self):
-        try:
-            user_table = self.query_one("#user-table", DataTable)
-            user_table.clear()
-
-            if hasattr(server, 'network_manager') and server.network_manager:
-                network_mgr = server.network_manager
+    def _user_row(self, client_id: int):
+        network_mgr = server.network_manager
+        name = network_mgr.client_name_map.get(client_id, f"Client_{client_id}")
 
-                for client_id, client_type in network_mgr.client_type_map.items():
-                    name = network_mgr.client_name_map.get(client_id, f"Client_{client_id}")
+        if network_mgr.client_type_map[client_id] == "BOT":
+            obs_status = "N/A"
+        else:
+            client_ip = network_mgr.client_ip_map.get(client_id)
+            obs_status = "✓" if client_ip and server.obs_connection_manager.is_client_connected(client_ip) else "✗"
 
-                    if client_type == "BOT":
-                        obs_status = "N/A"
-                    else:
-                        client_ip = network_mgr.client_ip_map.get(client_id)
-                        obs_status = "✓" if (client_ip and hasattr(server, 'obs_connection_manager')
-                                           and server.obs_connection_manager.is_client_connected(client_ip)) else "✗"
+        return (str(client_id), name, obs_status, "Kick")
 
-                    user_table.add_row(str(client_id), name, obs_status, "Kick")
+    def update_user_rows(self, client_ids):
+        """Add, update or remove only the rows of clients that changed."""
+        try:
+            user_table = self.query_one("#user-table", DataTable)
+            for client_id in client_ids:
+                row_key = str(client_id)
+                exists = row_key in user_table.rows
+
+                if client_id not in server.network_manager.client_type_map:
+                    if exists:
+                        user_table.remove_row(row_key)
+                    continue
+
+                row = self._user_row(client_id)
+                if not exists:
+                    user_table.add_row(*row, key=row_key)
+                    continue
+                for column, value in zip(USER_TABLE_COLUMNS, row):
+                    if user_table.get_cell(row_key, column) != value:
+                        user_table.update_cell(row_key, column, value)
         except Exception as e:
             logging.error(f"Error updating user table: {e}")
 
@@ -345,20 +464,6 @@ class AdminApp(App):
         except Exception as e:
             logging.error(f"Error updating start button: {e}")
 
-    def setup_periodic_updates(self):
-        def periodic_update():
-            if not cleanup_done:
-                self.update_status_display()
-                self.update_user_table()
-                self.update_start_button()
-                timer = threading.Timer(2.0, periodic_update)
-                timer.daemon = True
-                timer.start()
-
-        timer = threading.Timer(2.0, periodic_update)
-        timer.daemon = True
-        timer.start()
-
     def on_button_pressed(self, event: Button.Pressed) -> None:
         if event.button.id == "add-bot-btn":
             bot_names = ["Angelyss", "Arachna", "Major", "Sarge", "Skelebot", "Merman", "Beret", "Kyonshi"]
@@ -378,16 +483,19 @@ class AdminApp(App):
                 self.connect_rcon_worker()
             else:
                 # Start OpenArena server
+                self.query_one("#start-server-btn", Button).disabled = True
                 self.run_server_worker()
-                self.update_start_button()
+
+        elif event.button.id == "analyze-btn":
+            self.run_analytics_worker()
 
         elif event.button.id == "kill-server-btn":
             if game_type == "dota2":
                 # Disconnect RCON
                 self.disconnect_rcon()
             else:
-                server.send_command("killserver")
-                logging.info("Kill server command sent")
+                # Without a shutdown request the watchdog would restart the killed server
+                server.request_stop()
 
     def disconnect_rcon(self):
         """Disconnect from RCON server."""
@@ -432,8 +540,11 @@ def main():
         maxBytes=5 * 1024 * 1024,
         backupCount=3
     )
-    file_handler.setFormatter(logging.Formatter("%(asctime)s - %(name)s - %(levelname)s - %(message)s"))
-    logging.getLogger().addHandler(file_handler)
+    configure_logging(
+        level="INFO",
+        handlers=[file_handler],
+        sample_rates=parse_sample_rates(settings.log_sample_rates),
+    )
 
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)